@@ -0,0 +1,186 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple, Optional
+
+import SaveFormat
+import Sgf
+from GameArchive import iter_files
+from GoEngine import GoEngine
+from Settings import Settings, EngineBackend
+
+COLUMNS = ["file", "game", "game_mode", "board_size", "num_players", "moves", "game_over"] + [
+    column for number in range(1, Settings.MAX_NUMBER_OF_PLAYERS + 1)
+    for column in (f"player{number}", f"score{number}", f"territory{number}")] + ["winner", "error"]
+
+
+class GameResult(NamedTuple):
+    """
+    The final scores of a game worked out by score_game.
+
+    file: The file the game was read from.
+    game: The index of the game in its file, as an SGF file can hold many.
+    game_mode: The GameMode of the game.
+    board_size: The number of rows/columns in the board.
+    move_count: The number of moves of the game.
+    game_over: True if the game was finished when it was saved.
+    players_names: The names of the players.
+    players_scores: The final score of every player.
+    territories: The number of points of territory of every player.
+    """
+
+    file: str
+    game: int
+    game_mode: str
+    board_size: int
+    move_count: int
+    game_over: bool
+    players_names: list[str]
+    players_scores: list[float]
+    territories: list[int]
+
+    @property
+    def winner(self) -> str:
+        # the first player with the best score wins, as in Go.finish_game
+        return max(zip(self.players_names, self.players_scores), key=lambda player: player[1])[0]
+
+    def to_row(self) -> dict:
+        row = {"file": self.file, "game": self.game, "game_mode": self.game_mode, "board_size": self.board_size,
+               "num_players": len(self.players_names), "moves": self.move_count, "game_over": int(self.game_over),
+               "winner": self.winner, "error": ""}
+
+        for number, (name, score, territory) in enumerate(
+                zip(self.players_names, self.players_scores, self.territories), 1):
+            row[f"player{number}"] = name
+            row[f"score{number}"] = f"{score:g}"
+            row[f"territory{number}"] = territory
+
+        return row
+
+
+def score_game(game: dict, file: str, index: int, backend: EngineBackend = None) -> GameResult:
+    """
+    Works out the final scores of a game the way Go.finish_game does, on the saved board, without any window.
+
+    The territories are counted on the saved board and added to the saved scores (komi and captured stones), unless the
+    game was finished when it was saved, as its scores already include them then.
+
+    :param game: The game dictionary, in the format of Go.to_dictionary.
+    :param file: The file the game was read from.
+    :param index: The index of the game in its file.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :return: The GameResult of the game.
+    """
+
+    num_players = len(game["players_names"])
+
+    engine = GoEngine.create(game["board_size"], num_players, backend=backend)
+    engine.load_state(game["board_array"])
+
+    territories = engine.get_controlled_territories()
+
+    if game["game_over"]:
+        players_scores = list(game["players_scores"])
+    else:
+        players_scores = engine.get_final_scores(game["players_scores"])
+
+    return GameResult(file, index, game["game_mode"].value, game["board_size"], len(game.get("moves", [])),
+                      game["game_over"], game["players_names"], players_scores,
+                      [len(territories[colour]) for colour in range(1, num_players + 1)])
+
+
+def iter_file_games(path: str) -> Iterator[dict]:
+    """
+    Reads the games of a saved game or SGF file, replaying the moves of the SGF games.
+
+    :param path: The path of the file.
+    :return: A generator of game dictionaries, in the format of Go.to_dictionary.
+    """
+
+    if path.lower().endswith(Sgf.EXTENSION):
+        for sgf_game in Sgf.read_games(path):
+            yield Sgf.to_dictionary(sgf_game, GoEngine.get_initial_scores(sgf_game.num_players))
+    else:
+        yield SaveFormat.load_game(path)
+
+
+def analyse_file(path: str, backend: Optional[EngineBackend] = None) -> list[dict]:
+    """
+    Scores every game of a file, in a worker process. A file that cannot be read, or a game that cannot be scored, gives
+    a row with the error instead.
+
+    :param path: The path of the file.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :return: The result table rows of the games of the file, in order.
+    """
+
+    rows = []
+    games = iter_file_games(path)
+    index = 0
+
+    while True:
+        try:
+            game = next(games)
+        except StopIteration:
+            break
+        except (OSError, ValueError, SaveFormat.SaveFormatError, Sgf.SgfError) as error:
+            # a malformed game stops the parser, so the rest of the file cannot be read
+            rows.append({"file": path, "game": index, "error": str(error) or type(error).__name__})
+            break
+
+        try:
+            rows.append(score_game(game, path, index, backend).to_row())
+        except Exception as error:
+            # a game the parser accepted can still hold a board the engine cannot load, which must not stop the other
+            # games, nor the other files of the worker
+            rows.append({"file": path, "game": index, "error": str(error) or type(error).__name__})
+
+        index += 1
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scores saved games and SGF files without the game window, and writes "
+                                                 "a CSV table with a row per game.")
+    parser.add_argument("paths", nargs="+", help="saved games, SGF files or directories to walk through")
+    parser.add_argument("--output", help="write the table to this CSV file instead of the standard output")
+    parser.add_argument("--processes", type=int, default=Settings.PLAYOUT_PROCESSES,
+                        help="number of worker processes, every core by default")
+    parser.add_argument("--backend", choices=[backend.name.lower() for backend in EngineBackend], default=None)
+    args = parser.parse_args()
+
+    backend = None if args.backend is None else EngineBackend[args.backend.upper()]
+    paths = list(iter_files(args.paths))
+    processes = args.processes or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    count = errors = 0
+
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+
+    try:
+        writer = csv.DictWriter(output, COLUMNS)
+        writer.writeheader()
+
+        # the files are handed out in chunks, so that many small saved games do not cost a round trip each
+        chunk_size = max(1, min(64, len(paths) // (processes * 4)))
+
+        with ProcessPoolExecutor(processes) as executor:
+            for rows in executor.map(analyse_file, paths, [backend] * len(paths), chunksize=chunk_size):
+                writer.writerows(rows)
+                count += len(rows)
+                errors += sum(1 for row in rows if row["error"])
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Scored {count - errors} games of {len(paths)} files ({errors} errors) in "
+          f"{time.perf_counter() - start:.2f}s with {processes} processes", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+from GoEngine import GoEngine, EMPTY
+from Playout import Playout
+from Settings import Settings, EngineBackend
+
+BOARD_SIZES = (7, 9, 13, 16)
+PLAYER_COUNTS = (2, 3, 4)
+
+# the number of positions of every game that the per position benchmarks are run on
+SAMPLED_POSITIONS = 8
+
+# the recorded games replayed by default, and the results of the engine benchmarks on them (array backend, without the
+# widgets) that a run is compared against; both are written again with --record and --output after a deliberate change
+RECORDED_GAMES = os.path.join(Settings.BASE_DIRECTORY, "benchmark_games.json")
+BASELINE = os.path.join(Settings.BASE_DIRECTORY, "benchmark_baseline.json")
+
+
+class GameRecord(NamedTuple):
+    """
+    The moves of a game, replayed to build the positions the benchmarks run on.
+
+    board_size: The number of rows/columns in the board.
+    num_players: The number of players in the game.
+    moves: The flat index of every move, or None for a pass, starting with the first player.
+    """
+
+    board_size: int
+    num_players: int
+    moves: list[Optional[int]]
+
+    def to_dictionary(self) -> dict:
+        return self._asdict()
+
+    @staticmethod
+    def from_dictionary(game: dict) -> "GameRecord":
+        return GameRecord(game["board_size"], game["num_players"], game["moves"])
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    The latency measured by one benchmark.
+
+    name: The name of the benchmark, including the board size and number of players.
+    calls: The number of calls timed in every repeat.
+    seconds: The time taken by the fastest repeat.
+    """
+
+    name: str
+    calls: int
+    seconds: float
+
+    @property
+    def microseconds_per_call(self) -> float:
+        return self.seconds / self.calls * 1e6 if self.calls else 0.0
+
+    def to_dictionary(self) -> dict:
+        result = self._asdict()
+        result["microseconds_per_call"] = self.microseconds_per_call
+        return result
+
+
+def record_game(board_size: int, num_players: int, seed: int) -> GameRecord:
+    """
+    Plays a random game to the end and records its moves, so that the same game is replayed on every run.
+
+    :param board_size: The number of rows/columns in the board.
+    :param num_players: The number of players in the game.
+    :param seed: The seed of the random playout.
+    :return: The GameRecord of the game.
+    """
+
+    engine = GoEngine(board_size, num_players)
+    playout = Playout(seed)
+
+    moves = []
+    colour = 1
+    passes = 0
+    max_moves = Playout.MAX_MOVES_FACTOR * board_size * board_size
+
+    while passes < num_players and len(moves) < max_moves:
+        point = playout.choose_move(engine, colour)
+        moves.append(point)
+
+        if point is None:
+            passes += 1
+        else:
+            engine.play(point, colour)
+            passes = 0
+
+        colour = engine.next_colour(colour)
+
+    return GameRecord(board_size, num_players, moves)
+
+
+def replay(game: GameRecord, backend: EngineBackend = None) -> list[tuple[GoEngine, int]]:
+    """
+    Replays a game and returns copies of evenly spaced positions of it, the last one being the final position.
+
+    :param game: The GameRecord to replay.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :return: The list of (engine, colour to move) tuples of the sampled positions.
+    """
+
+    engine = GoEngine.create(game.board_size, game.num_players, backend=backend)
+    step = max(len(game.moves) // SAMPLED_POSITIONS, 1)
+    positions = []
+    colour = 1
+
+    for number, point in enumerate(game.moves, 1):
+        if point is not None:
+            engine.play(point, colour)
+
+        colour = engine.next_colour(colour)
+
+        if number % step == 0 or number == len(game.moves):
+            positions.append((engine.copy(), colour))
+
+    return positions
+
+
+def measure(name: str, function: Callable[[], int], repeats: int) -> BenchmarkResult:
+    """
+    Times a benchmark function several times and keeps the fastest run, which is the least disturbed by the machine.
+
+    :param name: The name of the benchmark.
+    :param function: A function running the benchmark and returning the number of calls it made.
+    :param repeats: The number of times to run it.
+    :return: The BenchmarkResult of the fastest run.
+    """
+
+    best = None
+    calls = 0
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        calls = function()
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return BenchmarkResult(name, calls, best)
+
+
+# ENGINE BENCHMARKS ======================================
+
+def bench_is_move_valid(positions: list[tuple[GoEngine, int]]) -> int:
+    calls = 0
+
+    for engine, colour in positions:
+        for point in range(len(engine.board)):
+            engine.is_move_valid(point, colour)
+        calls += len(engine.board)
+
+    return calls
+
+
+def bench_is_ko(positions: list[tuple[GoEngine, int]]) -> int:
+    calls = 0
+
+    for engine, colour in positions:
+        for point, point_colour in enumerate(engine.board):
+            if point_colour == EMPTY and engine.is_move_valid(point, colour):
+                engine.is_ko(point, colour)
+                calls += 1
+
+    return calls
+
+
+def bench_play(game: GameRecord, backend: EngineBackend) -> int:
+    # placing the stones, which includes finding and removing the captured groups
+    engine = GoEngine.create(game.board_size, game.num_players, backend=backend)
+    colour = 1
+    calls = 0
+
+    for point in game.moves:
+        if point is not None:
+            engine.play(point, colour)
+            calls += 1
+
+        colour = engine.next_colour(colour)
+
+    return calls
+
+
+def bench_territories(positions: list[tuple[GoEngine, int]]) -> int:
+    for engine, _ in positions:
+        engine.get_controlled_territories()
+
+    return len(positions)
+
+
+def bench_load_state(engine: GoEngine, states: list[list[list[int]]]) -> int:
+    for state in states:
+        engine.load_state(state)
+
+    return len(states)
+
+
+def run_engine_benchmarks(game: GameRecord, backend: EngineBackend, repeats: int) -> list[BenchmarkResult]:
+    """
+    Runs the rules and scoring benchmarks of the engine on the positions of a game.
+
+    :param game: The GameRecord the positions come from.
+    :param backend: The EngineBackend to use.
+    :param repeats: The number of times every benchmark is run.
+    :return: The list of BenchmarkResults.
+    """
+
+    positions = replay(game, backend)
+    states = [engine.get_state() for engine, _ in positions]
+    prefix = f"{game.board_size}x{game.board_size}/{game.num_players}p"
+
+    return [
+        measure(f"{prefix}/is_move_valid", lambda: bench_is_move_valid(positions), repeats),
+        measure(f"{prefix}/is_ko", lambda: bench_is_ko(positions), repeats),
+        measure(f"{prefix}/play", lambda: bench_play(game, backend), repeats),
+        measure(f"{prefix}/territories", lambda: bench_territories(positions), repeats),
+        measure(f"{prefix}/load_state", lambda: bench_load_state(
+            GoEngine.create(game.board_size, game.num_players, backend=backend), states), repeats),
+    ]
+
+
+# WIDGET BENCHMARKS ======================================
+
+def run_widget_benchmarks(game: GameRecord, repeats: int) -> list[BenchmarkResult]:
+    """
+    Runs the benchmarks that go through the game window on the offscreen Qt platform: loading states into the Board,
+    which updates its pieces, and the validity and ko checks of Go.
+
+    :param game: The GameRecord the positions come from.
+    :param repeats: The number of times every benchmark is run.
+    :return: The list of BenchmarkResults.
+    """
+
+    from Go import Go
+
+    positions = replay(game)
+    states = [engine.get_state() for engine, _ in positions]
+    prefix = f"{game.board_size}x{game.board_size}/{game.num_players}p"
+
+    go = Go([f"Player {number + 1}" for number in range(game.num_players)], game.board_size)
+
+    def bench_board_load_state() -> int:
+        for state in states:
+            go.board.load_state(state)
+        go.board.load_state(states[0])
+        return len(states)
+
+    def bench_go_checks() -> int:
+        calls = 0
+        go.board.load_state(states[-1])
+        for row in range(game.board_size):
+            for column in range(game.board_size):
+                if go.board.is_move_valid(row, column, go.current_player):
+                    go.is_ko_situation(row, column)
+                calls += 1
+        return calls
+
+    try:
+        return [
+            measure(f"{prefix}/board_load_state", bench_board_load_state, repeats),
+            measure(f"{prefix}/go_move_checks", bench_go_checks, repeats),
+        ]
+    finally:
+        go.close()
+
+
+def start_offscreen_application():
+    """
+    Starts a QApplication on the offscreen platform, so that the widget benchmarks run without a display.
+
+    :return: The QApplication, or None if PyQt6 is not installed.
+    """
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+# BASELINE ===============================================
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares the per call latency of the results against a baseline.
+
+    :param results: The results, as written by --output.
+    :param baseline: The baseline results, in the same format.
+    :param tolerance: The allowed slowdown, as a fraction of the baseline latency.
+    :return: The list of messages describing every benchmark slower than allowed.
+    """
+
+    regressions = []
+    baseline_latencies = {result["name"]: result["microseconds_per_call"] for result in baseline["results"]}
+
+    for result in results["results"]:
+        expected = baseline_latencies.get(result["name"])
+
+        if expected is None or expected == 0:
+            continue
+
+        latency = result["microseconds_per_call"]
+        if latency > expected * (1 + tolerance):
+            regressions.append(f"{result['name']}: {latency:.2f}us per call, baseline {expected:.2f}us "
+                               f"(+{(latency / expected - 1) * 100:.0f}%)")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the per call latency of the rules and scoring hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BOARD_SIZES),
+                        help="board sizes of the recorded games replayed and of the random games generated")
+    parser.add_argument("--players", type=int, nargs="+", default=list(PLAYER_COUNTS),
+                        help="player counts of the recorded games replayed and of the random games generated")
+    parser.add_argument("--backend", choices=[backend.name.lower() for backend in EngineBackend], default="array")
+    parser.add_argument("--games", default=RECORDED_GAMES,
+                        help="JSON file of recorded games to replay, as written by --record, "
+                             "benchmark_games.json by default (an empty value replays none)")
+    parser.add_argument("--random-games", type=int, default=0,
+                        help="number of seeded random games generated for every size and player count, on top of the "
+                             "recorded games")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", help="write the games used to this JSON file, to replay them later with --games")
+    parser.add_argument("--repeats", type=int, default=5, help="number of runs of every benchmark, the best is kept")
+    parser.add_argument("--no-widgets", action="store_true", help="skip the benchmarks that need PyQt6")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="JSON results file to compare against, benchmark_baseline.json by default (an empty value "
+                             "compares against none)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    backend = EngineBackend[args.backend.upper()]
+    recorded_games = []
+
+    if args.games:
+        with open(args.games) as file:
+            recorded_games = [GameRecord.from_dictionary(game) for game in json.load(file)]
+
+    # the recorded games keep their number in the file whichever are replayed, so that their results are named as in
+    # the baseline, and the random games are numbered after them
+    games = [(game_number, game) for game_number, game in enumerate(recorded_games)
+             if game.board_size in args.sizes and game.num_players in args.players]
+
+    for board_size in args.sizes:
+        for num_players in args.players:
+            for number in range(args.random_games):
+                games.append((len(recorded_games) + len(games), record_game(board_size, num_players,
+                                                                            args.seed + number)))
+
+    if args.record:
+        with open(args.record, "w") as file:
+            json.dump([game.to_dictionary() for _, game in games], file)
+
+    application = None if args.no_widgets else start_offscreen_application()
+    results = []
+
+    for game_number, game in games:
+        game_results = run_engine_benchmarks(game, backend, args.repeats)
+
+        if application is not None:
+            game_results += run_widget_benchmarks(game, args.repeats)
+
+        for result in game_results:
+            result = result._replace(name=f"game{game_number}/{result.name}")
+            results.append(result.to_dictionary())
+            print(f"{result.name}: {result.microseconds_per_call:.2f}us per call ({result.calls} calls)",
+                  file=sys.stderr)
+
+    report = {"backend": args.backend, "python": sys.version.split()[0], "results": results}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        # the default baseline was measured on the array backend, which the other backends are not held to
+        if args.baseline == BASELINE and baseline["backend"] != args.backend:
+            print(f"Not compared: the baseline was measured on the {baseline['backend']} backend", file=sys.stderr)
+            return
+
+        regressions = compare(report, baseline, args.tolerance)
+
+        for regression in regressions:
+            print("Regression " + regression, file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+from GoEngine import GoEngine, Move, EMPTY
+from Settings import KoRule
+
+
+class BitBoardEngine(GoEngine):
+    """
+    A GoEngine that finds groups, liberties and territories with bitboards.
+
+    The stones of each player are stored as the bits of one arbitrary-precision int, laid out row by row with one
+    spare column at the end of every row. Shifting a bitboard by one bit or by one row moves every stone to an adjacent
+    point at once, and masking the result with edge_mask, which has the bits of every real point set, drops the bits
+    that crossed an edge into the spare column or out of the board. Groups and empty regions are flood filled with
+    these shifts instead of walking the points one by one.
+
+    The flat board list of GoEngine is still kept up to date, as it is what the position hashes and get_state use, and
+    the moves that touch an empty point or no enemy stone are settled from it without flooding anything.
+
+    Loading a whole position is faster than with GoEngine, as no chain is built, but checking and playing moves is
+    slower than with the chains GoEngine keeps up to date, so GoEngine remains the default backend.
+
+    Attributes:
+        width: The number of bits used by every row of a bitboard.
+        edge_mask: The bitboard with the bits of every point of the board set.
+        bits: A tuple with the bitboard of every single point, indexed by its flat index.
+        stones: A list with the bitboard of the stones of every colour (the EMPTY entry is unused).
+        occupied: The bitboard of every stone on the board, kept up to date as stones are placed and removed.
+    """
+
+    def __init__(self, board_size: int = 16, num_players: int = 2, ko_rule: KoRule = KoRule.SIMPLE):
+        """
+        Initializes an empty board of the given size.
+
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        :param ko_rule: The KoRule used to reject repeated positions.
+        """
+
+        self.width = board_size + 1
+
+        self.bits = tuple(1 << (point + point // board_size) for point in range(board_size * board_size))
+        self.edge_mask = sum(self.bits)
+
+        super().__init__(board_size, num_players, ko_rule)
+
+        self._build_chains()
+
+    def copy(self) -> "BitBoardEngine":
+        """
+        Returns an independent copy of the engine, with the same position and repetition history.
+
+        :return: A new BitBoardEngine.
+        """
+
+        engine = super().copy()
+        engine.stones = self.stones[:]
+        engine.occupied = self.occupied
+
+        return engine
+
+    # BITBOARDS ==========================================
+
+    def expand(self, bitboard: int) -> int:
+        """
+        Returns the points adjacent to any point of the given bitboard.
+
+        :param bitboard: A bitboard of points.
+        :return: The bitboard of the points adjacent to them (which can include points of the given bitboard).
+        """
+
+        width = self.width
+        return ((bitboard << 1) | (bitboard >> 1) | (bitboard << width) | (bitboard >> width)) & self.edge_mask
+
+    def flood(self, seed: int, mask: int) -> int:
+        """
+        Grows the seed bitboard over the connected points of the mask.
+
+        :param seed: The bitboard to start from, which must be part of the mask.
+        :param mask: The bitboard of the points that can be flooded.
+        :return: The bitboard of the points of the mask connected to the seed.
+        """
+
+        width = self.width
+        mask &= self.edge_mask
+
+        # the expansion is inlined, as it runs once per step of every flood
+        while True:
+            grown = (seed | (seed << 1) | (seed >> 1) | (seed << width) | (seed >> width)) & mask
+
+            if grown == seed:
+                return seed
+
+            seed = grown
+
+    def to_points(self, bitboard: int) -> list[int]:
+        """
+        Converts a bitboard into the list of flat indexes of its points.
+
+        :param bitboard: A bitboard of points.
+        :return: The list of flat indexes of the set bits.
+        """
+
+        width = self.width
+        points = []
+
+        while bitboard:
+            lowest = bitboard & -bitboard
+            index = lowest.bit_length() - 1
+            points.append(index - index // width)
+            bitboard ^= lowest
+
+        return points
+
+    def empty_points(self) -> int:
+        """
+        Returns the bitboard of every empty point of the board.
+
+        :return: The bitboard of the empty points.
+        """
+
+        return self.edge_mask & ~self.occupied
+
+    def _has_adjacent_enemy(self, point: int, colour: int) -> bool:
+        """
+        Checks if a stone of another colour is adjacent to the given point, as only then can a move there capture.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: True if an enemy stone is adjacent to the point.
+        """
+
+        board = self.board
+
+        for adjacent in self.neighbours[point]:
+            adjacent_colour = board[adjacent]
+            if adjacent_colour != EMPTY and adjacent_colour != colour:
+                return True
+
+        return False
+
+    def _captured_groups(self, point: int, colour: int, empty: int):
+        """
+        Yields the enemy groups adjacent to the given point that have no liberty left in the given empty bitboard.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :param empty: The bitboard of the empty points once the move is placed.
+        :return: A generator of (colour, bitboard) tuples of the captured groups.
+        """
+
+        adjacent = self.expand(self.bits[point])
+
+        for enemy_colour in range(1, self.num_players + 1):
+            if enemy_colour == colour:
+                continue
+
+            enemy_stones = self.stones[enemy_colour]
+            adjacent_enemies = adjacent & enemy_stones
+
+            while adjacent_enemies:
+                group = self.flood(adjacent_enemies & -adjacent_enemies, enemy_stones)
+                adjacent_enemies &= ~group
+
+                if not self.expand(group) & empty:
+                    yield enemy_colour, group
+
+    # CHAINS =============================================
+
+    def get_group(self, point: int) -> set[int]:
+        """
+        Returns the points of the group of stones that the stone at the given point belongs to.
+
+        :param point: The flat index of a stone.
+        :return: The set of points of the group.
+        """
+
+        colour = self.board[point]
+
+        if colour == EMPTY:
+            raise Exception("This point doesnt belong to any player")
+
+        return set(self.to_points(self.flood(self.bits[point], self.stones[colour])))
+
+    def get_liberties(self, point: int) -> set[int]:
+        """
+        Returns the liberties of the group of stones that the stone at the given point belongs to.
+
+        :param point: The flat index of a stone.
+        :return: The set of empty points adjacent to the group.
+        """
+
+        colour = self.board[point]
+
+        if colour == EMPTY:
+            raise Exception("This point doesnt belong to any player")
+
+        group = self.flood(self.bits[point], self.stones[colour])
+        return set(self.to_points(self.expand(group) & self.empty_points()))
+
+    def _build_chains(self):
+        """Rebuilds the bitboards of every colour from the flat board list."""
+
+        self.stones = [0] * (self.num_players + 1)
+
+        for point, colour in enumerate(self.board):
+            if colour != EMPTY:
+                self.stones[colour] |= self.bits[point]
+
+        self.occupied = 0
+        for bitboard in self.stones:
+            self.occupied |= bitboard
+
+    def _add_stone(self, point: int, colour: int):
+        """
+        Places a stone on the board.
+
+        :param point: The flat index of an empty intersection.
+        :param colour: The colour of the stone.
+        """
+
+        bit = self.bits[point]
+
+        self.board[point] = colour
+        self.hash ^= self.zobrist[point][colour]
+        self.stones[colour] |= bit
+        self.occupied |= bit
+
+    def _remove_stone(self, point: int):
+        """
+        Removes a single stone from the board.
+
+        :param point: The flat index of a stone.
+        """
+
+        colour = self.board[point]
+
+        bit = self.bits[point]
+
+        self.board[point] = EMPTY
+        self.hash ^= self.zobrist[point][colour]
+        self.stones[colour] &= ~bit
+        self.occupied &= ~bit
+
+    # RULES ==============================================
+
+    def is_move_valid(self, point: int, colour: int) -> bool:
+        """
+        Checks if placing a stone of the given colour on the given point is valid.
+
+        The move is valid if the point is empty and the group formed by the placed stone keeps a liberty, or the stone
+        takes the last liberty of an enemy group, capturing it.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: True if the move is valid, False otherwise.
+        """
+
+        board = self.board
+
+        # if the point is already set to a player the move is not valid
+        if board[point] != EMPTY:
+            return False
+
+        # an empty adjacent point is a liberty of the new stone, which is the case of most moves, so the groups are only
+        # flooded when the point is surrounded
+        for adjacent in self.neighbours[point]:
+            if board[adjacent] == EMPTY:
+                return True
+
+        bit = self.bits[point]
+        empty = self.empty_points() ^ bit
+
+        # the group formed by the new stone keeps a liberty
+        group = self.flood(bit, self.stones[colour] | bit)
+        if self.expand(group) & empty:
+            return True
+
+        # the new stone captures an enemy group
+        return next(self._captured_groups(point, colour, empty), None) is not None
+
+    def get_legal_moves_bitboard(self, colour: int) -> int:
+        """
+        Returns the bitboard of every point where the given colour can play, with occupancy, suicide, capture and ko
+        applied.
+
+        A move on an empty point is valid if the point touches another empty point, a liberty of a friendly group with
+        two or more liberties, or the last liberty of an enemy group; these three sets are built for the whole board
+        with masks, group by group, and only the resulting points are hashed to apply the ko rule.
+
+        :param colour: The colour of the player making the move.
+        :return: The bitboard of the legal moves.
+        """
+
+        empty = self.empty_points()
+        legal = empty & self.expand(empty)
+
+        for group_colour in range(1, self.num_players + 1):
+            remaining = stones = self.stones[group_colour]
+
+            while remaining:
+                group = self.flood(remaining & -remaining, stones)
+                remaining &= ~group
+
+                liberties = self.expand(group) & empty
+                liberty_count = liberties.bit_count()
+
+                if (group_colour == colour and liberty_count > 1) or (group_colour != colour and liberty_count == 1):
+                    legal |= liberties
+
+        if self.can_repeat():
+            for point in self.to_points(legal):
+                if self.is_ko(point, colour):
+                    legal &= ~self.bits[point]
+
+        return legal
+
+    def get_legal_moves(self, colour: int) -> list[bool]:
+        """
+        Returns a mask of every point where the given colour can play, with occupancy, suicide, capture and ko applied.
+
+        :param colour: The colour of the player making the move.
+        :return: A list with, for every flat index, True if the move is legal and False otherwise.
+        """
+
+        legal = [False] * len(self.board)
+
+        for point in self.to_points(self.get_legal_moves_bitboard(colour)):
+            legal[point] = True
+
+        return legal
+
+    def get_resulting_hash(self, point: int, colour: int) -> int:
+        """
+        Works out the hash of the position a valid move would produce, without playing it.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: The Zobrist hash of the resulting position.
+        """
+
+        zobrist = self.zobrist
+        new_hash = self.hash ^ zobrist[point][colour]
+
+        if not self._has_adjacent_enemy(point, colour):
+            return new_hash
+
+        for enemy_colour, group in self._captured_groups(point, colour, self.empty_points() & ~self.bits[point]):
+            for stone in self.to_points(group):
+                new_hash ^= zobrist[stone][enemy_colour]
+
+        return new_hash
+
+    def play(self, point: int, colour: int) -> Move:
+        """
+        Places a stone of the given colour on the given point and removes the enemy groups it captures.
+
+        The move is expected to have been checked with is_move_valid beforehand.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: The Move that was played, including the points of the captured stones.
+        """
+
+        self._add_stone(point, colour)
+
+        captured = []
+
+        # the groups are found before any is removed, as removing one gives liberties to the others
+        if self._has_adjacent_enemy(point, colour):
+            for enemy_colour, group in list(self._captured_groups(point, colour, self.empty_points())):
+                for stone in self.to_points(group):
+                    self._remove_stone(stone)
+                    captured.append((stone, enemy_colour))
+
+        move = Move(point, colour, tuple(captured))
+        self.history.append(move)
+        self._record_position(self.next_colour(colour))
+
+        return move
+
+    # SCORING ============================================
+
+    def get_controlled_territories(self) -> dict[int, set[tuple[int, int]]]:
+        """
+        Finds the territories controlled by each player.
+
+        Every empty region is flood filled at once, and it is the territory of a player if that player's stones are
+        the only ones bordering it.
+
+        :return: A dictionary mapping each colour to the set of (row, column) tuples of the empty spaces it controls.
+        """
+
+        territories = {colour: set() for colour in range(1, self.num_players + 1)}
+
+        remaining = empty = self.empty_points()
+
+        while remaining:
+            region = self.flood(remaining & -remaining, empty)
+            remaining &= ~region
+
+            border = self.expand(region) & ~region
+            owners = [colour for colour in territories if border & self.stones[colour]]
+
+            if len(owners) == 1:
+                territories[owners[0]].update(self.coordinates(point) for point in self.to_points(region))
+
+        return territories
@@ -1,11 +1,12 @@
-import copy
-
-from PyQt6.QtWidgets import QFrame, QGridLayout
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint
+from PyQt6.QtWidgets import QFrame
+from PyQt6.QtCore import Qt, QPoint, QRect
 from PyQt6.QtGui import QPainter, QPen, QPixmap
 # from PyQt6.QtTest import QTest
+from GoEngine import GoEngine, Move
 from Piece import Piece
+from Resources import Resources
 from Settings import Settings
+from SpriteCache import SpriteCache
 
 
 class Board(QFrame):
@@ -14,10 +15,9 @@ class Board(QFrame):
         """
         The constructor of the Board class.
 
-        This method initializes the Board object with the given go parent widget and board_size parameter. It also sets up the
-        board by creating the board_array and pieces_array data structures, creating a pieces_layout for the board and
-        populating it with Piece objects. Finally, it connects each Piece object to its adjacent pieces and calls the
-        init_board method.
+        This method initializes the Board object with the given go parent widget and board_size parameter. It also sets
+        up the board by creating the GoEngine that holds the state and rules of the game and the Piece objects of every
+        intersection. The pieces are not widgets: the board paints them itself and maps the mouse clicks to them.
 
         :param go: The parent object of the board.
         :param board_size: The number of rows/columns in the board.
@@ -30,27 +30,20 @@ class Board(QFrame):
 
         self.is_started = False  # game is not currently started
 
-        # Create a 2d int[7][7] array to store the current state of the game
-        self.board_array = [[0 for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.pieces_array = []
-
-        # Create a layout for the board that will contain the Pieces objects
-        self.pieces_layout = QGridLayout(self)
-        self.pieces_layout.setSpacing(0)
-
-        self.background = QPixmap(Settings.board_background)
+        # Create the rules engine that stores the current state of the game
+        self.engine = GoEngine.create(self.board_size, go.num_players)
+        self.legal_moves = [True] * (self.board_size * self.board_size)
+        self.pieces_array = [[Piece(self, row, column) for column in range(self.board_size)]
+                             for row in range(self.board_size)]
 
-        # Populate the layout with pieces
-        for row in range(self.board_size):
-            piece_row = []
-            for column in range(self.board_size):
-                piece = Piece(self, row, column)
-                piece_row.append(piece)
-                self.pieces_layout.addWidget(piece, row, column)
+        # the player whose turn it is, whose ghost stone is drawn over the hovered intersection
+        self.current_player = 0
+        self.hovered_piece = None
+        self.setMouseTracking(True)
 
-            self.pieces_array.append(piece_row)
-
-        [[piece.connect_to_adjacent() for piece in piece_row] for piece_row in self.pieces_array]
+        # the original background, and the layer with the scaled background and the grid cached for the current size
+        self.background = Resources.get_pixmap(Settings.board_background)
+        self.background_layer = None
 
     def print_board_array(self):
         """prints the board_array to the terminal in an attractive way"""
@@ -66,10 +59,19 @@ class Board(QFrame):
 
         return int(self.contentsRect().width() / (self.board_size + 1))
 
+    @property
+    def board_array(self) -> list[list[int]]:
+        """
+        The current state of the board as a 2D array of integers, built from the GoEngine.
+        """
+
+        return self.engine.get_state()
+
     def reset(self):
         """Clears pieces from the board"""
 
-        [[self.reset_piece(piece) for piece in piece_row] for piece_row in self.pieces_array]
+        self.place_pieces((point, 0) for point, colour in enumerate(self.engine.board) if colour != 0)
+        self.engine.reset()
 
     def get_current_state(self) -> list[list[int]]:
         """
@@ -78,27 +80,30 @@ class Board(QFrame):
         :return: 2D array of integers representing the current state of the board
         """
 
-        return copy.deepcopy(self.board_array)
+        return self.engine.get_state()
 
     def set_player_turn(self, player_number):
         """
         Changes the style of the board to reflect the current player's turn.
+
+        The legal moves of the player are computed for the whole board at once, and only the legal points are outlined
+        with the player's ghost stone when hovered.
+
         :param player_number: The index of the current player in the list of players.
         """
 
-        self.setStyleSheet(f"""
-                QPushButton#free:hover{{
-                                        border: 2px solid {Settings.PIECE_COLORS[player_number + 1]}; 
-                                    }}     
-                """)
+        self.legal_moves = self.engine.get_legal_moves(player_number + 1)
+        self.current_player = player_number
+
+        if self.hovered_piece is not None:
+            self.update(self.piece_rect(self.hovered_piece))
 
     def is_move_valid(self, row, column, player):
         """
         Checks if a move is valid in the game of Go.
 
-        This method places a temporary test piece on the board at the given coordinates and checks if it is a valid move
-        according to the rules of Go. The move is considered valid if it does not result in self-capture of the group,
-        if it captures an enemy group, or if it is adjacent to an empty space.
+        The rules are checked by the board's GoEngine. The move is considered valid if the intersection is free and it
+        does not result in self-capture of the group, or if it captures an enemy group.
 
         :param row: The x coordinate of the move.
         :param column: The y coordinate of the move.
@@ -106,91 +111,174 @@ class Board(QFrame):
         :return: True if the move is valid, False otherwise.
         """
 
-        test_piece = self.pieces_array[row][column]
+        return self.engine.is_move_valid(self.engine.point(row, column), player + 1)
 
-        # if the test_piece is already set to a player the move is not valid
-        if test_piece.player != 0:
-            return False
+    def is_ko(self, row, column, player):
+        """
+        Checks if a valid move would repeat a previous board state forbidden by the ko rule in Settings.KO_RULE.
 
-        # Check if any of the adjacent pieces are empty, if they are the move is immediately valid
-        adjacent_piece: Piece
-        for adjacent_piece in test_piece.adjacency_list:
-            if adjacent_piece.player == 0:
-                return True
+        :param row: The x coordinate of the move.
+        :param column: The y coordinate of the move.
+        :param player: The player making the move.
+        :return: True if the move is forbidden by the ko rule, False otherwise.
+        """
 
-        # Check if the move will result in self capture of the group, if it does not its valid
-        test_piece.player = (player + 1)  # Easiest way of doing this is by setting the test_piece temporarily
+        return self.engine.is_ko(self.engine.point(row, column), player + 1)
 
-        group_liberty = sum([piece.get_liberties() for piece in test_piece.get_group()])
-        if group_liberty > 0:
-            return True
+    def play_move(self, piece: Piece, player: int) -> Move:
+        """
+        Plays a move on the board at the given piece.
 
-        # Check if move is made it will result in capture of enemy group (if it does the move is valid by go rules)
-        adjacent_enemy_groups = test_piece.get_adjacent_enemy_groups()
+        This method places the stone in the GoEngine, which also removes any enemy groups captured by it, and updates
+        the Piece objects to reflect the new state.
 
-        for enemy_group in adjacent_enemy_groups:
-            enemy_group_liberty = sum([piece.get_liberties() for piece in enemy_group])
+        :param piece: The Piece object representing the location of the move.
+        :param player: The player making the move.
+        :return: The Move played, containing the points of the captured pieces.
+        """
+
+        instrumentation = self.go.instrumentation
 
-            if enemy_group_liberty == 0:
-                return True
+        # the engine places the stone and removes the captured groups
+        with instrumentation.phase("placement"):
+            move = self.engine.play(self.engine.point(piece.row, piece.column), player + 1)
 
-        # If its none of those cases the move is invalid
-        test_piece.player = 0  # we reset the piece player to 0 after testing
-        return False
+        # place the piece and clear the captured ones
+        with instrumentation.phase("pieces"):
+            self.place_pieces([(move.point, move.colour)] + [(point, 0) for point, _ in move.captured])
 
-    def capture_surrounding_pieces(self, piece) -> int:
+        return move
+
+    def redo_move(self, move: Move) -> Move:
         """
-        Captures enemy pieces surrounding the given piece.
+        Plays again a move that was taken back with undo_move.
 
-        This method captures all enemy pieces that are surrounded by the given piece, by resetting their player value to 0.
-        The method returns the number of pieces captured.
+        :param move: The Move that was taken back.
+        :return: The Move played again, containing the points of the captured pieces.
+        """
 
-        :param piece: The piece from which to capture enemy pieces.
-        :return: The number of pieces captured.
+        move = self.engine.play(move.point, move.colour)
+
+        self.place_pieces([(move.point, move.colour)] + [(point, 0) for point, _ in move.captured])
+
+        return move
+
+    def undo_move(self) -> Move:
         """
+        Takes back the last move played on the board, restoring the pieces it captured.
 
-        pieces_captured = 0
+        :return: The Move that was taken back.
+        """
 
-        adjacent_enemy_groups = piece.get_adjacent_enemy_groups()
+        move = self.engine.undo()
 
-        enemy_group: set[Piece]
-        for enemy_group in adjacent_enemy_groups:
-            enemy_group_liberty = sum([piece.get_liberties() for piece in enemy_group])
+        self.place_pieces([(move.point, 0)] + list(move.captured))
 
-            if enemy_group_liberty == 0:
-                pieces_captured += len(enemy_group)
-                [self.reset_piece(piece) for piece in enemy_group]
+        return move
 
-        return pieces_captured
+    def get_piece(self, point: int) -> Piece:
+        """
+        Returns the Piece object at the given flat index of the engine's board.
 
-    def place_piece(self, piece: Piece, player: int):
+        :param point: The flat index of the intersection.
+        :return: The Piece object at that intersection.
         """
-        Places a piece on the board at the given coordinates.
 
-        This method updates the board_array and the Piece object to reflect the new move.
+        row, column = self.engine.coordinates(point)
+        return self.pieces_array[row][column]
 
-        :param piece: The Piece object representing the location of the move.
-        :param player: The player making the move.
+    def place_pieces(self, changes):
+        """
+        Places the given pieces on the board as one batch, repainting the union of their squares once.
+
+        :param changes: An iterable of (point, player) tuples, the point being the flat index of the intersection and
+        the player 0 to clear it.
+        """
+
+        dirty = QRect()
+
+        for point, player in changes:
+            piece = self.get_piece(point)
+            piece.player = player
+            dirty = dirty.united(self.piece_rect(piece))
+
+        if not dirty.isNull():
+            self.update(dirty)
+
+    def piece_rect(self, piece: Piece) -> QRect:
+        """
+        Calculates the square of the widget that the given piece is painted in, centred on its intersection.
+
+        :param piece: The Piece object.
+        :return: The QRect of the piece.
+        """
+
+        square_width = self.square_size()
+
+        return QRect(square_width * piece.column + square_width // 2, square_width * piece.row + square_width // 2,
+                     square_width, square_width)
+
+    def piece_at(self, position: QPoint):
+        """
+        Finds the piece whose intersection is closest to the given position of the widget.
+
+        :param position: The position in the widget's coordinates.
+        :return: The Piece object, or None if the position is off the board.
         """
 
-        # change reference in board_array
-        self.board_array[piece.row][piece.column] = player + 1
+        square_width = self.square_size()
+
+        if square_width == 0:
+            return None
+
+        row = round(position.y() / square_width) - 1
+        column = round(position.x() / square_width) - 1
+
+        if 0 <= row < self.board_size and 0 <= column < self.board_size:
+            return self.pieces_array[row][column]
+
+        return None
 
-        # place the test_piece
-        piece.place_piece(player + 1)
+    def draw_pieces(self, painter: QPainter, area: QRect):
+        """
+        Draws the pieces placed on the board, and the ghost stone of the current player over the hovered intersection if
+        it is a legal move.
 
-    def reset_piece(self, piece: Piece):
+        :param painter: A QPainter object used to draw on the widget.
+        :param area: The part of the widget that needs to be repainted, the pieces outside of it are skipped.
         """
-        Resets the given `Piece` object to an empty space.
 
-        This method changes the reference in `self.board_array` to 0 and calls the `place_piece` method of the `Piece`
-        object with an argument of 0, effectively resetting the `Piece` object to an empty space.
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        square_width = self.square_size()
+
+        for piece_row in self.pieces_array:
+            for piece in piece_row:
+                if piece.player == 0:
+                    continue
 
-        :param piece: The `Piece` object to be reset.
+                rect = self.piece_rect(piece)
+                if rect.intersects(area):
+                    painter.drawPixmap(rect.topLeft(), SpriteCache.get_sprite(piece.player, square_width))
+
+        if self.is_ghost_visible():
+            painter.setOpacity(Settings.GHOST_STONE_OPACITY)
+            painter.drawPixmap(self.piece_rect(self.hovered_piece).topLeft(),
+                               SpriteCache.get_sprite(self.current_player + 1, square_width))
+            painter.setOpacity(1)
+
+    def is_ghost_visible(self) -> bool:
+        """
+        Checks if the ghost stone of the current player should be drawn over the hovered intersection: the intersection
+        must be a legal move and the current player must not be played by the computer.
+
+        :return: True if the ghost stone is visible, False otherwise.
         """
 
-        self.board_array[piece.row][piece.column] = 0
-        piece.place_piece(0)
+        piece = self.hovered_piece
+
+        return (piece is not None and piece.player == 0 and self.legal_moves[self.engine.point(piece.row, piece.column)]
+                and not self.go.is_computer_turn())
 
     def draw_board_squares(self, painter: QPainter):
         """
@@ -222,133 +310,73 @@ class Board(QFrame):
         Loads the given state into the board.
 
         This method updates the board to reflect the given state. If a piece is already in the correct position, it is
-        not modified. Otherwise, the piece is placed as necessary. The current player of the game is also updated based
-        on the given player state.
+        not modified. Otherwise, the piece is placed as necessary, and the changed pieces are repainted as one batch.
 
         :param board_state: A 2D list representing the state to be loaded into the board.
         """
 
-        for row, board_row in enumerate(board_state):
-            for column, value in enumerate(board_row):
+        board_array = self.engine.get_state()
 
-                if self.board_array[row][column] == value:
-                    continue
+        self.place_pieces((self.engine.point(row, column), value)
+                          for row, board_row in enumerate(board_state)
+                          for column, value in enumerate(board_row)
+                          if board_array[row][column] != value)
+
+        self.engine.load_state(board_state)
+
+    def load_game(self, board_state: list[list[int]], moves: list[Move]) -> bool:
+        """
+        Loads a game into the board so that its moves can be taken back, as GoEngine.load_game does, repainting only the
+        pieces that changed.
+
+        :param board_state: A 2D list representing the state after the moves.
+        :param moves: The Moves played, in order.
+        :return: True if the moves can be taken back, False if the state was loaded without them.
+        """
 
-                self.pieces_array[row][column].place_piece(value)
+        board_array = self.engine.get_state()
 
-        self.board_array = board_state
+        self.place_pieces((self.engine.point(row, column), value)
+                          for row, board_row in enumerate(board_state)
+                          for column, value in enumerate(board_row)
+                          if board_array[row][column] != value)
+
+        return self.engine.load_game(board_state, moves)
 
     def get_controlled_territories(self):
         """
-        Finds the owner and territories of an empty region on the board.
-
-        This method recursively explores an empty region on the board and finds the player that controls it and the coordinates
-        of the region.
-
-        :param x: The x coordinate of the starting point of the region.
-        :param y: The y coordinate of the starting point of the region.
-        :return: A tuple containing the player that controls the region and a set of tuples representing the coordinates of
-        the region.
-        """
-
-        territories = {player_no + 1: set()
-                       for player_no in range(self.go.num_players)}
-
-        # for each space in board
-        for x in range(self.board_size):
-            for y in range(self.board_size):
-                # if area is empty return area with player that controls it
-                if self.board_array[x][y] == 0 and (x, y) not in set().union(*territories.values()):
-                    owner, terr = self.territory(x, y)
-                    if owner and terr:
-                        territories[owner] = territories[owner].union(terr)
-
-        return territories
-
-    def territory(self, x, y):
-        """
-        Find the owner of a given space in the board.
-
-        :param x: The x coordinate of the space.
-        :param y: The y coordinate of the space.
-        :return: A tuple containing the owner and the territory of the space. If the space is not controlled by any player,
-        the owner will be 0. The territory is a set of coordinates representing the spaces in the territory.
-        """
-
-        def valid_space(x2, y2):
-            return 0 <= x2 < self.board_size and 0 <= y2 < self.board_size
-
-        def grow_territory(x1, y1):
-            """if space is not already in set: add space to set and control adjacent spaces"""
-            nonlocal territory
-            # if territory already has the space return
-            if (x1, y1) in territory:
-                return
-            # add space to set
-            territory.add((x1, y1))
-            # for every adjacent space
-            for n in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                x2 = x1 + n[0]
-                y2 = y1 + n[1]
-                # control if space is valid and empty
-                if valid_space(x2, y2) and self.board_array[x2][y2] == 0:
-                    grow_territory(x2, y2)
-
-        # if space isn't empty return
-        if self.board_array[x][y] != 0:
-            return 0, set()
-
-        # check the y-axis upwards
-        for y1 in range(y - 1, -1, -1):
-            # if space is not empty break
-            if self.board_array[x][y1] != 0:
-                owner = self.board_array[x][y1]
-                break
-        # if loop did not encounter a break
-        else:
-            # check y-axis downwards
-            for y1 in range(y + 1, self.board_size):
-                if self.board_array[x][y1] != 0:
-                    owner = self.board_array[x][y1]
-                    break
-            # if loop did not encounter a break
-            else:
-                # check x-axis to right side
-                for x1 in range(x + 1, self.board_size):
-                    owner = self.board_array[x1][y]
-                    break
-                    # if loop did not encounter a break
-                else:
-                    for x1 in range(x - 1, -1, -1):
-                        owner = self.board_array[x1][y]
-                        break
-                        # if loop did not encounter a break
-                    else:
-                        owner = 0
-
-        territory = set()
-        grow_territory(x, y)
-        try:
-            for space in territory:
-                # for every adjacent space in territory
-                for n in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    xt = space[0] + n[0]
-                    yt = space[1] + n[1]
-                    # if adjacent space has enemy piece
-                    if valid_space(xt, yt) and self.board_array[xt][yt] not in [owner, 0]:  # Bounded by enemy
-                        owner = 0
-                        raise StopIteration
-        except StopIteration:
-            pass
-
-        return owner, territory
+        Finds the territories controlled by each player, using the board's GoEngine.
+
+        :return: A dictionary mapping each player number (starting at 1) to the set of (row, column) tuples of the empty
+        spaces that player controls.
+        """
+
+        return self.engine.get_controlled_territories()
 
     def update_background_image(self):
         """Updates the background image of the board."""
 
-        self.background = QPixmap(Settings.board_background)
+        self.background = Resources.get_pixmap(Settings.board_background)
+        self.background_layer = None
         self.update()
 
+    def get_background_layer(self) -> QPixmap:
+        """
+        Returns the background scaled to the size of the board with the grid drawn over it, rendering it again only if
+        the size of the board changed since it was cached.
+
+        :return: The QPixmap of the background layer.
+        """
+
+        if self.background_layer is None or self.background_layer.size() != self.size():
+            self.background_layer = self.background.scaled(self.width(), self.height())
+
+            painter = QPainter(self.background_layer)
+            self.draw_board_squares(painter)
+            painter.end()
+
+        return self.background_layer
+
     # EVENTS ===========================================
 
     def resizeEvent(self, event):
@@ -357,20 +385,50 @@ class Board(QFrame):
         # board size by height.
         self.setFixedWidth(self.height())
 
-        # Update the margin of the layout so that the pieces are always at the intersection of the board squares
-        space = int(self.square_size() * 0.5)
-        end_space = int(self.width() - space - self.board_size * self.square_size())
+        self.background_layer = None
+
+    def mousePressEvent(self, event):
+        """Forwards a left click to the piece of the intersection under the mouse."""
+
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+
+        piece = self.piece_at(event.position().toPoint())
+
+        if piece is not None:
+            piece.click_piece()
+
+    def mouseMoveEvent(self, event):
+        """Moves the ghost stone to the intersection under the mouse, repainting only the old and new intersections."""
+
+        piece = self.piece_at(event.position().toPoint())
+
+        if piece is self.hovered_piece:
+            return
+
+        if self.hovered_piece is not None:
+            self.update(self.piece_rect(self.hovered_piece))
+
+        self.hovered_piece = piece
+
+        if piece is not None:
+            self.update(self.piece_rect(piece))
+
+    def leaveEvent(self, event):
+        """Clears the ghost stone when the mouse leaves the board."""
 
-        self.pieces_layout.setContentsMargins(space, space, end_space, end_space)
+        if self.hovered_piece is not None:
+            self.update(self.piece_rect(self.hovered_piece))
+            self.hovered_piece = None
 
     def paintEvent(self, event):
         """paints the board and the pieces of the game"""
 
         painter = QPainter(self)
 
-        # Draws the board background
-        self.background = self.background.scaled(self.width(), self.height())
-        painter.drawPixmap(QPoint(), self.background)
+        # Draws the part of the board background and squares that needs to be repainted
+        area = event.rect()
+        painter.drawPixmap(area, self.get_background_layer(), area)
 
-        # Draws the board squares
-        self.draw_board_squares(painter)
+        # Draws the pieces
+        self.draw_pieces(painter, event.rect())
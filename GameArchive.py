@@ -0,0 +1,448 @@
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import time
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import SaveFormat
+import Sgf
+from GoEngine import GoEngine
+from Settings import Settings, GameMode
+
+# the games added in one transaction when a collection is imported
+COMMIT_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL UNIQUE,
+    source TEXT,
+    added_at REAL NOT NULL,
+    game_mode TEXT NOT NULL,
+    board_size INTEGER NOT NULL,
+    num_players INTEGER NOT NULL,
+    move_count INTEGER NOT NULL,
+    game_over INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    colour INTEGER NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    score REAL NOT NULL,
+    PRIMARY KEY (game_id, colour)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS players_name ON players (name);
+
+CREATE TABLE IF NOT EXISTS positions (
+    board_size INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+    move_number INTEGER NOT NULL,
+    PRIMARY KEY (board_size, hash, game_id, move_number)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS positions_game ON positions (game_id);
+"""
+
+
+class ArchivedGame(NamedTuple):
+    """
+    The summary of a game of the archive, read without reading its moves.
+
+    id: The id of the game in the archive, to read it with GameArchive.get_game.
+    source: The file the game was saved to or imported from.
+    game_mode: The GameMode of the game.
+    board_size: The number of rows/columns in the board.
+    players_names: The names of the players.
+    move_count: The number of moves in the game.
+    game_over: True if the game was finished.
+    """
+
+    id: int
+    source: Optional[str]
+    game_mode: GameMode
+    board_size: int
+    players_names: list[str]
+    move_count: int
+    game_over: bool
+
+
+class PositionMatch(NamedTuple):
+    """
+    A game of the archive reaching a position.
+
+    game: The ArchivedGame.
+    move_number: The number of moves played when the position was reached, 0 being the board before the first move.
+    """
+
+    game: ArchivedGame
+    move_number: int
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64 bit, the Zobrist hashes are unsigned
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def position_hash(board_array: list[list[int]]) -> int:
+    """
+    Works out the Zobrist hash of a position, the same as the hash GoEngine keeps for it.
+
+    :param board_array: A 2D list with the player number (0 for empty) of every intersection.
+    :return: The hash of the position.
+    """
+
+    zobrist = GoEngine.get_zobrist_table(len(board_array))
+    position = 0
+
+    for point, colour in enumerate(value for board_row in board_array for value in board_row):
+        position ^= zobrist[point][colour]
+
+    return position
+
+
+def iter_positions(game: dict) -> Iterator[tuple[int, int]]:
+    """
+    Replays a game from the board its moves were played from and hashes every position it reached.
+
+    The first board is found by taking the moves back from the saved board, so that games loaded or imported from a
+    board set up without its moves are replayed too. If the moves do not replay, only the saved board is hashed.
+
+    :param game: The game dictionary, as built by Go.to_dictionary.
+    :return: A generator of (move number, position hash) tuples, the move number 0 being the first board.
+    """
+
+    engine = GoEngine.create(game["board_size"], len(game["players_names"]))
+
+    if engine.load_game(game["board_array"], game.get("moves", [])):
+        yield from enumerate(engine.position_history)
+    else:
+        yield len(game.get("moves", [])), engine.hash
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Finds the saved games and SGF files among the given paths, walking through directories.
+
+    :param paths: The paths of files and directories.
+    :return: A generator of the paths of the files, in order.
+    """
+
+    extensions = (SaveFormat.EXTENSION, Sgf.EXTENSION)
+
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            for file_name in sorted(files):
+                if file_name.lower().endswith(extensions):
+                    yield os.path.join(root, file_name)
+
+
+class GameArchive:
+    """
+    An SQLite database of every saved or imported game, indexed by player name and by the hash of every position the
+    games reached, so that looking up the games of a player or the games that reached a position is an index lookup
+    instead of a scan of the saved files.
+
+    Every game is stored in the SaveFormat binary format, along with its players and the Zobrist hash of every position
+    of its moves (see iter_positions). A game that is already in the archive, byte for byte, is not added again.
+
+    Attributes:
+        path: The path of the database file.
+        connection: The sqlite3 connection to the database.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Opens the archive, creating it if it does not exist.
+
+        :param path: The path of the database file, relative to the game's directory or absolute,
+            Settings.GAME_ARCHIVE_PATH if not given.
+        """
+
+        self.path = os.path.join(Settings.BASE_DIRECTORY, path or Settings.GAME_ARCHIVE_PATH)
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "GameArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # ADDING =============================================
+
+    def _insert_game(self, game: dict, source: Optional[str]) -> int:
+        """
+        Adds a game without committing it.
+
+        :param game: The game dictionary, as built by Go.to_dictionary.
+        :param source: The file the game was saved to or imported from.
+        :return: The id of the game in the archive.
+        """
+
+        buffer = io.BytesIO()
+        SaveFormat.write_game(buffer, game)
+        data = buffer.getvalue()
+        digest = hashlib.sha1(data).digest()
+
+        row = self.connection.execute("SELECT id FROM games WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            return row[0]
+
+        cursor = self.connection.execute(
+            "INSERT INTO games (digest, source, added_at, game_mode, board_size, num_players, move_count, game_over,"
+            " data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (digest, source, time.time(), game["game_mode"].name, game["board_size"], len(game["players_names"]),
+             len(game.get("moves", [])), game["game_over"], data))
+        game_id = cursor.lastrowid
+
+        self.connection.executemany(
+            "INSERT INTO players (game_id, colour, name, score) VALUES (?, ?, ?, ?)",
+            [(game_id, colour, name, score)
+             for colour, (name, score) in enumerate(zip(game["players_names"], game["players_scores"]), 1)])
+
+        board_size = game["board_size"]
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO positions (board_size, hash, game_id, move_number) VALUES (?, ?, ?, ?)",
+            [(board_size, _to_signed(position), game_id, move_number)
+             for move_number, position in iter_positions(game)])
+
+        return game_id
+
+    def add_game(self, game: dict, source: str = None) -> int:
+        """
+        Adds a game to the archive.
+
+        :param game: The game dictionary, as built by Go.to_dictionary.
+        :param source: The file the game was saved to or imported from.
+        :return: The id of the game in the archive.
+        """
+
+        with self.connection:
+            return self._insert_game(game, source)
+
+    def add_games(self, games: Iterable[dict], source: str = None) -> int:
+        """
+        Adds many games, committing them COMMIT_EVERY games at a time.
+
+        :param games: The game dictionaries, as built by Go.to_dictionary.
+        :param source: The file the games were imported from.
+        :return: The number of games read.
+        """
+
+        count = 0
+
+        try:
+            for game in games:
+                self._insert_game(game, source)
+                count += 1
+
+                if count % COMMIT_EVERY == 0:
+                    self.connection.commit()
+        finally:
+            self.connection.commit()
+
+        return count
+
+    def add_file(self, path: str) -> tuple[int, int]:
+        """
+        Adds the game of a saved game file or the games of an SGF file. The games of an SGF file that cannot be replayed
+        are skipped.
+
+        :param path: The path of the file.
+        :return: The number of games read, including the games already in the archive, and the number of games skipped.
+        """
+
+        if path.lower().endswith(Sgf.EXTENSION):
+            skipped = 0
+
+            def iter_sgf_games():
+                nonlocal skipped
+
+                for sgf_game in Sgf.read_games(path):
+                    try:
+                        yield Sgf.to_dictionary(sgf_game, GoEngine.get_initial_scores(sgf_game.num_players))
+                    except (Sgf.SgfError, ValueError):
+                        skipped += 1
+
+            return self.add_games(iter_sgf_games(), path), skipped
+
+        self.add_game(SaveFormat.load_game(path), path)
+
+        return 1, 0
+
+    # QUERIES ============================================
+
+    def _get_games(self, game_ids: list[int]) -> dict[int, ArchivedGame]:
+        games = {}
+
+        # the ids are looked up in batches, as SQLite limits the number of parameters of a statement
+        for start in range(0, len(game_ids), 500):
+            batch = game_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+
+            names = {}
+            for game_id, name in self.connection.execute(
+                    f"SELECT game_id, name FROM players WHERE game_id IN ({placeholders}) ORDER BY game_id, colour",
+                    batch):
+                names.setdefault(game_id, []).append(name)
+
+            for game_id, source, game_mode, board_size, move_count, game_over in self.connection.execute(
+                    f"SELECT id, source, game_mode, board_size, move_count, game_over FROM games"
+                    f" WHERE id IN ({placeholders})", batch):
+                games[game_id] = ArchivedGame(game_id, source, GameMode[game_mode], board_size,
+                                              names.get(game_id, []), move_count, bool(game_over))
+
+        return games
+
+    def find_position(self, board_array: list[list[int]], limit: int = None) -> list[PositionMatch]:
+        """
+        Finds the games that reached a position.
+
+        :param board_array: A 2D list with the player number (0 for empty) of every intersection, such as the state
+            returned by Board.get_current_state.
+        :param limit: The maximum number of matches returned, every match if None.
+        :return: The PositionMatch of every time a game reached the position, ordered by game.
+        """
+
+        return self.find_position_hash(len(board_array), position_hash(board_array), limit)
+
+    def find_position_hash(self, board_size: int, position: int, limit: int = None) -> list[PositionMatch]:
+        """
+        Finds the games that reached a position, given by its Zobrist hash, such as GoEngine.hash.
+
+        :param board_size: The number of rows/columns in the board.
+        :param position: The hash of the position.
+        :param limit: The maximum number of matches returned, every match if None.
+        :return: The PositionMatch of every time a game reached the position, ordered by game.
+        """
+
+        rows = self.connection.execute(
+            "SELECT game_id, move_number FROM positions WHERE board_size = ? AND hash = ?"
+            " ORDER BY game_id, move_number LIMIT ?",
+            (board_size, _to_signed(position), -1 if limit is None else limit)).fetchall()
+
+        games = self._get_games(sorted({game_id for game_id, _ in rows}))
+
+        return [PositionMatch(games[game_id], move_number) for game_id, move_number in rows]
+
+    def find_player(self, name: str) -> list[ArchivedGame]:
+        """
+        Finds the games of a player.
+
+        :param name: The name of the player, compared without case.
+        :return: The ArchivedGame of every game the player played, in the order they were added.
+        """
+
+        game_ids = [game_id for (game_id,) in self.connection.execute(
+            "SELECT DISTINCT game_id FROM players WHERE name = ? ORDER BY game_id", (name,))]
+
+        games = self._get_games(game_ids)
+
+        return [games[game_id] for game_id in game_ids]
+
+    def get_game(self, game_id: int) -> dict:
+        """
+        Reads a game of the archive.
+
+        :param game_id: The id of the game in the archive.
+        :return: The game dictionary, in the format of Go.to_dictionary.
+        """
+
+        row = self.connection.execute("SELECT data FROM games WHERE id = ?", (game_id,)).fetchone()
+
+        if row is None:
+            raise KeyError(game_id)
+
+        return SaveFormat.read_game(io.BytesIO(row[0]))
+
+    def count_games(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adds games to the game archive and searches it.")
+    parser.add_argument("--archive", help="path of the archive database, Settings.GAME_ARCHIVE_PATH by default")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="add saved games and SGF files, walking through directories")
+    add_parser.add_argument("paths", nargs="+")
+
+    player_parser = commands.add_parser("player", help="list the games of a player")
+    player_parser.add_argument("name")
+
+    position_parser = commands.add_parser("position", help="list the games that reached a position of a game")
+    position_parser.add_argument("path", help="saved game or SGF file holding the position")
+    position_parser.add_argument("--move", type=int, help="number of moves played in the position, the last by default")
+    position_parser.add_argument("--limit", type=int)
+
+    args = parser.parse_args()
+
+    with GameArchive(args.archive) as archive:
+        start = time.perf_counter()
+
+        if args.command == "add":
+            added = skipped = 0
+
+            for path in iter_files(args.paths):
+                try:
+                    file_added, file_skipped = archive.add_file(path)
+                except (OSError, SaveFormat.SaveFormatError, Sgf.SgfError, UnicodeDecodeError) as error:
+                    print(f"{path}: {error}", file=sys.stderr)
+                    continue
+
+                added += file_added
+                skipped += file_skipped
+
+            print(f"Read {added} games ({skipped} skipped) in {time.perf_counter() - start:.2f}s, "
+                  f"{archive.count_games()} games archived", file=sys.stderr)
+
+        elif args.command == "player":
+            for game in archive.find_player(args.name):
+                print(f"{game.id}\t{game.game_mode.value}\t{game.board_size}x{game.board_size}\t{game.move_count} moves"
+                      f"\t{' / '.join(game.players_names)}\t{game.source or ''}")
+
+            print(f"Searched in {(time.perf_counter() - start) * 1000:.1f}ms", file=sys.stderr)
+
+        else:
+            if args.path.lower().endswith(Sgf.EXTENSION):
+                sgf_game = next(Sgf.read_games(args.path))
+                game = Sgf.to_dictionary(sgf_game, GoEngine.get_initial_scores(sgf_game.num_players))
+            else:
+                game = SaveFormat.load_game(args.path)
+
+            positions = dict(iter_positions(game))
+            move_number = max(positions) if args.move is None else args.move
+
+            if move_number not in positions:
+                parser.error(f"the game has no position after {move_number} moves")
+
+            start = time.perf_counter()
+
+            for match in archive.find_position_hash(game["board_size"], positions[move_number], args.limit):
+                print(f"{match.game.id}\tmove {match.move_number}\t{' / '.join(match.game.players_names)}"
+                      f"\t{match.game.source or ''}")
+
+            print(f"Searched in {(time.perf_counter() - start) * 1000:.1f}ms", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+from Go import Go, SpeedGo
+from Settings import Settings, GameMode
+
+
+class GameWindowPool:
+    """
+    Keeps game windows built ahead of time or left by finished games, so that starting a game reuses one instead of
+    building the window, board and score board again.
+
+    Windows are kept per game mode, board size and number of players, as those are fixed when a window is built, and
+    only the Settings.GAME_WINDOW_POOL_SIZE most recently stored windows are kept. Qt widgets can only be built on the
+    main thread, so warm_up is meant to be called when the event loop is idle, such as from a zero-delay timer while the
+    welcome screen is open.
+
+    Attributes:
+        windows: A dictionary mapping every (game mode, board size, number of players) key to its idle window, in the
+            order they were stored.
+    """
+
+    def __init__(self):
+        self.windows: dict[tuple[GameMode, int, int], Go] = {}
+
+    @staticmethod
+    def get_window_class(game_mode: GameMode) -> type[Go]:
+        return SpeedGo if game_mode == GameMode.SPEED else Go
+
+    def build(self, game_mode: GameMode, board_size: int, num_players: int) -> Go:
+        """
+        Builds a new idle window for the given kind of game.
+
+        :param game_mode: The GameMode of the game.
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        :return: The Go window, suspended until its game is started.
+        """
+
+        window = self.get_window_class(game_mode)([f"Player {number + 1}" for number in range(num_players)], board_size)
+        window.suspend()
+
+        return window
+
+    def warm_up(self, game_mode: GameMode, board_size: int, num_players: int):
+        """
+        Builds a window for the given kind of game if the pool has none.
+
+        :param game_mode: The GameMode of the game.
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        """
+
+        if (game_mode, board_size, num_players) not in self.windows:
+            self.store(self.build(game_mode, board_size, num_players))
+
+    def acquire(self, game_mode: GameMode, board_size: int, num_players: int) -> Go:
+        """
+        Takes a window for the given kind of game out of the pool, building one if there is none. The caller starts its
+        game with Go.start_new_game or Go.load_game_from_dictionary.
+
+        :param game_mode: The GameMode of the game.
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        :return: The Go window.
+        """
+
+        window = self.windows.pop((game_mode, board_size, num_players), None)
+
+        return window if window is not None else self.build(game_mode, board_size, num_players)
+
+    def store(self, window: Go):
+        """
+        Puts a window that is no longer shown back in the pool, replacing any window of the same kind and dropping the
+        oldest windows if the pool is full.
+
+        :param window: The Go window, which must be closed.
+        """
+
+        key = (window.GAME_MODE, window.board.board_size, window.num_players)
+
+        old_window = self.windows.pop(key, None)
+        if old_window is not None and old_window is not window:
+            old_window.deleteLater()
+
+        self.windows[key] = window
+
+        while len(self.windows) > Settings.GAME_WINDOW_POOL_SIZE:
+            oldest_key = next(iter(self.windows))
+            self.windows.pop(oldest_key).deleteLater()
@@ -1,11 +1,23 @@
-import pickle
+import os
+import sqlite3
+from typing import Optional
 
-from PyQt6.QtCore import QBasicTimer
-from PyQt6.QtGui import QIcon, QCursor
+from PyQt6.QtCore import QBasicTimer, QTimer, Qt
+from PyQt6.QtGui import QCursor, QPainter
 from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QMessageBox, QToolTip, QFileDialog
+import SaveFormat
+import Sgf
 from Board import Board
+from GameArchive import GameArchive
+from GoEngine import GoEngine
+from Instrumentation import Instrumentation
+from Journal import Journal, NullJournal
 from MenuBar import GameMenuBar
+from MonteCarloTreeSearch import MonteCarloTreeSearch
+from PlayoutPool import PlayoutPool
+from Resources import Resources
 from ScoreBoard import ScoreBoard
+from SearchThread import SearchThread
 from Settings import Settings, GameMode
 
 
@@ -25,24 +37,32 @@ class Go(QMainWindow):
         pass_turn_counter: An integer representing the number of consecutive turns that have been passed.
         board: An instance of the `Board` class representing the game board.
         score_board: An instance of the `ScoreBoard` class representing the score board UI element.
-        undo_stack: A list of board states representing the board states that can be undone.
-        redo_stack: A list of board states representing the board states that can be redone.
+        undo_stack: A list of the moves that can be undone, each storing only the placed and captured pieces.
+        redo_stack: A list of the moves that can be redone, each storing only the placed and captured pieces.
+        computer_players: A set with the indexes of the players whose moves are chosen by the computer.
+        computer: The `MonteCarloTreeSearch` choosing the computer players' moves, created on their first turn.
+        search_thread: The `SearchThread` searching the current computer player's move, None if no search is running.
+        instrumentation: The `Instrumentation` timing the phases of make_move, which records nothing unless
+            Settings.INSTRUMENTATION is set.
+        journal: The `Journal` every change to the game is appended to while the game is played, a `NullJournal` while
+            the window is idle or if Settings.JOURNAL is off.
 
     """
 
     GAME_MODE: GameMode = GameMode.NORMAL
 
-    def __init__(self, player_names: list[str], board_size: int):
+    def __init__(self, player_names: list[str], board_size: int, computer_players: list[int] = None):
         """
         Initializes the game by setting up the players, the board, the score board, and the menu bar.
 
         :param player_names: A list of strings representing the names of the players.
         :param board_size: An integer representing the size of the board.
+        :param computer_players: A list with the indexes of the players played by the computer.
         """
 
         super().__init__()
 
-        self.setWindowIcon(QIcon("./icons/pokeball.png"))
+        self.setWindowIcon(Resources.get_icon(Settings.WINDOW_ICON))
 
         # Set background color of WelcomeScreen
         self.setObjectName("Go")
@@ -55,6 +75,13 @@ class Go(QMainWindow):
         self.current_player = 0
         self.pass_turn_counter = 0
 
+        self.computer_players = set(computer_players or [])
+        self.computer = None
+        self.search_thread = None
+
+        self.instrumentation = Instrumentation.create()
+        self.journal = NullJournal()
+
         self.board = Board(self, board_size)
 
         self.score_board = ScoreBoard(self, player_names)
@@ -63,7 +90,8 @@ class Go(QMainWindow):
         self.undo_stack = []
         self.redo_stack = []
 
-        self.setMenuBar(GameMenuBar(self).init_menu())
+        # the menu bar is built when the window is first shown
+        self.menu_bar = None
 
         self.init_ui()
 
@@ -73,19 +101,11 @@ class Go(QMainWindow):
         """
         Initiates the UI elements for the game.
 
-        This method sets up the layout of the game, including the board and score board, and sets the window style and
-        size.
+        This method sets up the layout of the game, including the board and score board, and sets the window size. The
+        window background is painted by paintEvent.
 
         """
 
-        self.setStyleSheet("""
-                            Go#Go{
-                                background-image: url(./icons/go_background1.jpg);
-                                background-size: cover;
-                                background-position: bottom right;
-                                    }
-                            """)
-
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
 
@@ -111,7 +131,7 @@ class Go(QMainWindow):
         :return: A list of floats representing the initial scores for each player.
 
         """
-        return [round((i != 0) * 7.5 / (2 ** (self.num_players - i - 1)), 1) for i in range(self.num_players)]
+        return GoEngine.get_initial_scores(self.num_players)
 
     def set_player_turn(self, player: int):
         """
@@ -127,6 +147,8 @@ class Go(QMainWindow):
         self.score_board.set_turn_player(player)
         self.board.set_player_turn(player)
 
+        self.schedule_computer_move()
+
     def next_turn(self):
         """
         Move to the next player's turn.
@@ -139,6 +161,149 @@ class Go(QMainWindow):
         self.score_board.next_turn()
         self.board.set_player_turn(self.current_player)
 
+        self.schedule_computer_move()
+
+    def is_computer_turn(self) -> bool:
+        """
+        Checks if the current player is played by the computer.
+
+        :return: True if the computer chooses the current player's moves, False otherwise.
+        """
+
+        return self.current_player in self.computer_players
+
+    def schedule_computer_move(self):
+        """
+        Lets the computer play the current player's move once control returns to the event loop, if the current player
+        is played by the computer, so that the board is repainted before the search starts.
+        """
+
+        if self.game_over or not self.is_computer_turn():
+            return
+
+        player = self.current_player
+        QTimer.singleShot(0, lambda: self.play_computer_move(player))
+
+    def get_computer_time_limit(self) -> float:
+        """
+        Returns the number of seconds the computer can spend choosing a move.
+
+        :return: The time limit of the search.
+        """
+
+        return Settings.COMPUTER_TIME_LIMIT
+
+    def start_new_game(self, player_names: list[str], computer_players: list[int] = None):
+        """
+        Starts a new game in this window, so that a window can be reused by the next game instead of building a new one.
+
+        :param player_names: The names of the players, as many as the window was built for.
+        :param computer_players: A list with the indexes of the players played by the computer.
+        """
+
+        self.players_names = player_names
+        self.computer_players = set(computer_players or [])
+        self.score_board.set_players_names(player_names)
+
+        self.reset()
+
+    def suspend(self):
+        """Stops the background activity of the game (the computer players and the clocks) while the window is idle."""
+
+        self.close_computer()
+        self.stop_journal()
+
+    def start_journal(self):
+        """Starts the journal again from the current state of the game, which is then recovered if it is interrupted."""
+
+        self.journal = Journal.create()
+        self.journal.start(self.to_dictionary(), self)
+
+    def stop_journal(self):
+        """Stops the journal of the game, deleting it, as there is nothing to recover once the game is over or left."""
+
+        self.journal.stop(self)
+        self.journal = NullJournal()
+
+    def close_computer(self):
+        """
+        Stops the computer players' search, along with its worker processes. A search that is still running is
+        abandoned to its thread, which closes it once it finishes.
+        """
+
+        if self.computer is not None:
+            if self.search_thread is not None and self.search_thread.search is self.computer:
+                self.search_thread.abandon()
+            else:
+                self.computer.close()
+
+            self.computer = None
+
+    def play_computer_move(self, player: int):
+        """
+        Starts the search of the given player's move with Monte Carlo Tree Search on a SearchThread, so that the window
+        stays responsive (and the clocks keep running) while the computer thinks. The move is played by
+        play_searched_move once it is found.
+
+        Nothing is done if the turn has moved on since the move was scheduled, and the move is searched again once the
+        running search ends if one is running.
+
+        :param player: The index of the player the move was scheduled for.
+        """
+
+        if self.game_over or player != self.current_player or not self.is_computer_turn():
+            return
+
+        if self.search_thread is not None:
+            return
+
+        if self.computer is None:
+            self.computer = MonteCarloTreeSearch(komi=self.get_initial_scores())
+
+            # spread the search over the cores of the machine
+            if (Settings.PLAYOUT_PROCESSES or os.cpu_count() or 1) > 1:
+                self.computer.pool = PlayoutPool()
+
+        self.computer.time_limit = self.get_computer_time_limit()
+
+        self.search_thread = SearchThread(self.computer, self.board.engine, player + 1, self.pass_turn_counter)
+        self.search_thread.move_found.connect(self.play_searched_move)
+        self.search_thread.start()
+
+        self.board.setCursor(Qt.CursorShape.WaitCursor)
+
+    def play_searched_move(self, search_thread: SearchThread, point: Optional[int]):
+        """
+        Plays the move found by a SearchThread, passing if it found no useful move. The move is dropped if the game
+        moved on since the search started, and the current player's move is searched again if it is still the computer's
+        turn.
+
+        :param search_thread: The SearchThread that found the move.
+        :param point: The flat index of the chosen move, or None to pass.
+        """
+
+        if search_thread is not self.search_thread:
+            return
+
+        self.search_thread = None
+        self.board.unsetCursor()
+
+        is_current = (not search_thread.is_abandoned and not self.game_over and self.is_computer_turn()
+                      and search_thread.colour == self.current_player + 1
+                      and search_thread.passes == self.pass_turn_counter
+                      and search_thread.position_hash == self.board.engine.hash)
+
+        if not is_current:
+            # the game moved on while the computer was searching, a window put back in the pool waits for its next game
+            if self.isVisible():
+                self.schedule_computer_move()
+            return
+
+        if point is None:
+            self.pass_turn()
+        else:
+            self.make_move(self.board.get_piece(point))
+
     def pass_turn(self):
         """
         Moves to the next turn if the game is not over.
@@ -151,6 +316,7 @@ class Go(QMainWindow):
             return
 
         self.pass_turn_counter += 1
+        self.journal.record_pass(self.current_player)
 
         if self.pass_turn_counter == self.num_players:
             self.finish_game()
@@ -162,9 +328,9 @@ class Go(QMainWindow):
         """
         Makes a move on the board by placing the given piece for the current turns' player.
 
-        This method first checks if the move is valid. If the move is valid, it places the piece on the board, removes
-        any enemy groups that have been captured, and updates the current player. If the move is not valid, it notifies
-        the user.
+        This method first checks if the move is valid. If the move is valid, it plays it on the board's rules engine,
+        which removes any enemy groups that have been captured, and updates the current player. If the move is not
+        valid, it notifies the user. Every phase is timed by the game's instrumentation when it is enabled.
 
         :param piece: The piece to be placed on the board.
         """
@@ -172,129 +338,148 @@ class Go(QMainWindow):
         if self.game_over:
             return
 
-        board_before_move = self.board.get_current_state()
+        instrumentation = self.instrumentation
 
         # Check if the move is valid
-        if not self.board.is_move_valid(piece.row, piece.column, self.current_player):
+        with instrumentation.phase("validation"):
+            is_valid = self.board.is_move_valid(piece.row, piece.column, self.current_player)
+
+        if not is_valid:
+            instrumentation.count("invalid_moves")
             QToolTip.showText(QCursor.pos(), "Invalid Move: Self capture is not allowed")
             return
 
-        self.board.place_piece(piece, self.current_player)
-
-        pieces_captured = self.board.capture_surrounding_pieces(piece)
-
         # Check for Ko situation
-        if self.is_ko_situation(piece.row, piece.column):
-            # If it's a Ko situation we inform the user and reset the board to its state before the move
+        with instrumentation.phase("ko"):
+            is_ko = self.is_ko_situation(piece.row, piece.column)
+
+        if is_ko:
+            # If it's a Ko situation we inform the user and leave the board as it was
+            instrumentation.count("ko_rejections")
             QToolTip.showText(QCursor.pos(), "Invalid Move: Ko Rule")
-            self.board.load_state(board_before_move)
             return
 
-        # Add the board state at the beginning of the turn to the undo stack
-        self.undo_stack.append((board_before_move, self.current_player, pieces_captured))
+        move = self.board.play_move(piece, self.current_player)
+        pieces_captured = len(move.captured)
+
+        if instrumentation.enabled:
+            instrumentation.count("pieces_captured", pieces_captured)
+            instrumentation.observe("captured_per_move", pieces_captured)
+            instrumentation.observe("group_size", len(self.board.engine.get_group(move.point)))
 
-        # Empties the redo_stack if there was anything on there
-        if self.redo_stack:
-            self.redo_stack[:] = []
+        # Add the move to the undo stack
+        with instrumentation.phase("history"):
+            self.undo_stack.append(move)
+            self.journal.record_move(move)
+
+            # Empties the redo_stack if there was anything on there
+            if self.redo_stack:
+                self.redo_stack[:] = []
 
         # Updates the score board
-        self.players_scores[self.current_player] += pieces_captured
-        self.score_board.update_player_capture(self.current_player, self.players_scores[self.current_player])
+        with instrumentation.phase("score_board"):
+            self.players_scores[self.current_player] += pieces_captured
+            self.score_board.update_player_capture(self.current_player, self.players_scores[self.current_player])
 
         # Resets the pass turn counter
         self.pass_turn_counter = 0
 
-        self.next_turn()
+        # the next turn works out the legal moves of the next player
+        with instrumentation.phase("next_turn"):
+            self.next_turn()
+
+        instrumentation.end_move()
 
     def is_ko_situation(self, move_row, move_column):
         """
-        Checks if the current move is a Ko situation.
-        A ko situation occurs when a player makes a move that causes the board to return to immediate a previous state.
+        Checks if the current player's move at the given position is a Ko situation.
+        A ko situation occurs when a player makes a move that causes the board to return to a previous state. Which
+        previous states are forbidden depends on the ko rule in Settings.KO_RULE, and the check compares position hashes
+        kept by the rules engine, so it does not copy or compare whole boards.
 
         :param move_row: The row of the current move.
         :param move_column: The column of the current move.
         :return: True if the current move is a ko situation, False otherwise.
         """
 
-        # Check if there has been a previous state, if not then it's not a ko situation
-        if not self.undo_stack:
-            return False
-
-        # We get the new proposed board state
-        new_board_state = self.board.get_current_state()
-
-        number_of_turns = len(self.undo_stack)
-        # if this is true that means that this is the first turn of the current player, therefore Ko is impossible
-        if number_of_turns < self.num_players:
-            return False
-
-        # Now get the board state at the end of the current player last turn
-        previous_board_state = self.undo_stack[number_of_turns - self.num_players + 1][0]
-
-        # If at the player move is not retaking a square he lost since the previous turn we return false
-        if new_board_state[move_row][move_column] != previous_board_state[move_row][move_column]:
-            return False
-
-        # Now if the move doesn't result in a repeat of previous game state we return false
-        if new_board_state != previous_board_state:
-            return False
-
-        # Now if it repeats a previous board state we return true
-        return True
+        return self.board.is_ko(move_row, move_column, self.current_player)
 
     def undo_move(self):
         """
         Undoes the last move made in the game.
 
-        This method retrieves the last state of the board and current player from the undo stack and loads it into the
-        game.
-        If the undo stack is empty, this method does nothing. The state that is undone is also added to the redo stack
+        This method takes the last move from the undo stack back on the board, which removes the placed piece and
+        restores the pieces it captured, and gives the turn back to the player who made it.
+        If the undo stack is empty, this method does nothing. The move that is undone is also added to the redo stack
         for potential future use.
         """
 
         if not self.undo_stack:
             return
 
-        board_state, player, pieces_captured = self.undo_stack.pop()
+        self.undo_last_move()
 
-        self.redo_stack.append((self.board.get_current_state(), self.current_player, pieces_captured))
+        # the computer players' moves are taken back too, so that the turn goes back to a human player
+        while self.is_computer_turn() and self.undo_stack and len(self.computer_players) < self.num_players:
+            self.undo_last_move()
 
-        self.board.load_state(board_state)
+    def undo_last_move(self):
+        """
+        Takes the move at the top of the undo stack back and moves it to the redo stack.
+        """
+
+        move = self.undo_stack.pop()
+        self.board.undo_move()
 
-        self.set_player_turn(player)
+        self.redo_stack.append(move)
+        self.journal.record_undo()
 
-        self.players_scores[self.current_player] -= pieces_captured
+        self.set_player_turn(move.colour - 1)
+
+        self.players_scores[self.current_player] -= len(move.captured)
         self.score_board.update_player_capture(self.current_player, self.players_scores[self.current_player])
 
     def redo_move(self):
         """
         Redoes the previous move that was undone.
 
-        This method retrieves the state of the board and current player from the top of the redo stack and applies it to
-        the game.
-        The current state of the board and player are then added to the undo stack to allow for future undos.
+        This method takes the move from the top of the redo stack and plays it again on the board, giving the turn to
+        the player after the one who made it.
+        The move is then added to the undo stack to allow for future undos.
         """
         if not self.redo_stack:
             return
 
-        board_state, player, pieces_captured = self.redo_stack.pop()
+        self.redo_last_move()
+
+        # the computer players' moves are played again too, rather than searched anew
+        while self.is_computer_turn() and self.redo_stack:
+            self.redo_last_move()
 
-        self.undo_stack.append((self.board.get_current_state(), self.current_player, pieces_captured))
+    def redo_last_move(self):
+        """
+        Plays the move at the top of the redo stack again and moves it to the undo stack.
+        """
 
-        self.board.load_state(board_state)
+        move = self.board.redo_move(self.redo_stack.pop())
 
-        self.players_scores[self.current_player] += pieces_captured
-        self.score_board.update_player_capture(self.current_player, self.players_scores[self.current_player])
+        self.undo_stack.append(move)
+        self.journal.record_redo()
+
+        player = move.colour - 1
+
+        self.players_scores[player] += len(move.captured)
+        self.score_board.update_player_capture(player, self.players_scores[player])
 
-        self.set_player_turn(player)
+        self.set_player_turn((player + 1) % self.num_players)
 
     def finish_game(self):
         self.game_over = True
+        self.stop_journal()
 
-        controlled_territories = self.board.get_controlled_territories()
+        self.players_scores[:] = self.board.engine.get_final_scores(self.players_scores)
 
         for player_number in range(self.num_players):
-            self.players_scores[player_number] += len(controlled_territories[player_number + 1])
             self.score_board.update_player_capture(player_number, self.players_scores[player_number])
 
         self.score_board.display_winner(self.players_scores)
@@ -317,7 +502,8 @@ class Go(QMainWindow):
 
         :return: A dictionary representation of the current game state, including
             the game mode, game over status, player names and scores, current
-            player, pass turn counter, board size, and board array.
+            player, pass turn counter, board size, board array, and the moves
+            played that can be undone.
         """
 
         return {
@@ -329,24 +515,69 @@ class Go(QMainWindow):
             "pass_turn_counter": self.pass_turn_counter,
             "board_size": self.board.board_size,
             "board_array": self.board.board_array,
+            "computer_players": sorted(self.computer_players),
+            "moves": list(self.undo_stack),
         }
 
     def save_game(self):
         """
-        Save the current game state to a pickle file.
+        Save the current game state to a file.
 
         This method opens a file save dialog to allow the user to select the
-        location and filename for the pickle file. It then converts the current
-        game state to a dictionary using the `to_dictionary` method and saves
-        the dictionary to the pickle file using the `pickle` module.
+        location and filename for the save file. It then converts the current
+        game state to a dictionary using the `to_dictionary` method and writes
+        it in the binary format of the `SaveFormat` module.
         """
 
-        filename, _ = QFileDialog.getSaveFileName(self, "Save File", "", "Pickle File (*.pkl)")
+        filename, _ = QFileDialog.getSaveFileName(self, "Save File", "", f"Go Save (*{SaveFormat.EXTENSION})")
+
+        if not filename:
+            return
 
         game = self.to_dictionary()
 
-        with open(filename, "wb", ) as file:
-            pickle.dump(game, file)
+        SaveFormat.save_game(filename, game)
+        self.archive_game(game, filename)
+
+    def archive_game(self, game: dict, source: str):
+        """
+        Adds a game to the game archive, if Settings.GAME_ARCHIVE is enabled, warning the user if it cannot be added.
+
+        :param game: The dictionary of the game, as built by to_dictionary.
+        :param source: The file the game was saved to or imported from.
+        """
+
+        if not Settings.GAME_ARCHIVE:
+            return
+
+        try:
+            with GameArchive() as archive:
+                archive.add_game(game, source)
+        except sqlite3.Error as error:
+            QMessageBox.warning(self, "Game Archive", f"The game could not be added to the archive: {error}")
+
+    def export_sgf(self):
+        """
+        Exports the moves and passes of the game to an SGF file, starting from the board the moves were played from if
+        the game was loaded from a board without its moves.
+        """
+
+        filename, _ = QFileDialog.getSaveFileName(self, "Export SGF", "", f"SGF File (*{Sgf.EXTENSION})")
+
+        if not filename:
+            return
+
+        # the board before the first move is found by taking back every move on a copy of the engine
+        start = self.board.engine.copy()
+        for _ in self.undo_stack:
+            start.undo()
+
+        setup = start.get_state()
+        is_empty = not any(any(board_row) for board_row in setup)
+
+        with open(filename, "w", encoding="utf-8") as file:
+            Sgf.write_game(file, self.board.board_size, self.players_names, self.undo_stack,
+                           None if is_empty else setup, self.get_initial_scores()[1], self.pass_turn_counter)
 
     def reset_game(self):
 
@@ -369,6 +600,8 @@ class Go(QMainWindow):
         self.undo_stack = []
         self.redo_stack = []
 
+        self.close_computer()
+
         self.board.reset()
 
         self.score_board.reset()
@@ -376,31 +609,88 @@ class Go(QMainWindow):
         self.set_score_board(self.players_scores)
         self.set_player_turn(0)
 
+        self.start_journal()
+
+    def restore_board(self, game_object: dict):
+        """
+        Restores the board of a saved game. If the saved moves lead to the saved board, from the board they were played
+        from (which holds the setup stones of an imported game), they are restored so that they can be undone, otherwise
+        the saved board is loaded as it is.
+
+        :param game_object: The dictionary of the game, as built by to_dictionary.
+        """
+
+        moves = game_object.get("moves", [])
+
+        # the moves that were undone, kept by a game recovered from its journal
+        self.redo_stack = list(game_object.get("redo_moves", []))
+
+        if self.board.load_game(game_object["board_array"], moves):
+            self.undo_stack = list(self.board.engine.history)
+
     def set_score_board(self, score):
         for player_number, captured_pieces in enumerate(score):
             self.score_board.update_player_capture(player_number, captured_pieces)
 
     @staticmethod
-    def load_game_from_dictionary(game_object: dict):
+    def load_game_from_dictionary(game_object: dict, go: "Go" = None):
+        """
+        Restores a saved game.
+
+        :param game_object: The dictionary of the game, as built by to_dictionary.
+        :param go: An idle window of the same kind of game to restore the game into, a new window is built if None.
+        :return: The Go window of the game.
+        """
+
+        if go is None:
+            go = Go(game_object["players_names"], game_object["board_size"], game_object.get("computer_players"))
+        else:
+            go.start_new_game(game_object["players_names"], game_object.get("computer_players"))
 
-        go = Go(game_object["players_names"], game_object["board_size"])
-        go.board.load_state(game_object["board_array"])
-        go.set_score_board(game_object["players_scores"])
+        go.restore_board(game_object)
+        go.players_scores = list(game_object["players_scores"])
+        go.set_score_board(go.players_scores)
         go.set_player_turn(game_object["current_player"])
         go.score_board.set_turn_player(go.current_player)
         go.pass_turn_counter = game_object["pass_turn_counter"]
 
+        go.start_journal()
+
         if game_object["game_over"]:
             go.finish_game()
 
         return go
 
+    # EVENTS ================================================
+
+    def showEvent(self, event):
+        """Builds the menu bar the first time the window is shown."""
+
+        if self.menu_bar is None:
+            self.menu_bar = GameMenuBar(self).init_menu()
+            self.setMenuBar(self.menu_bar)
+
+        super().showEvent(event)
+
+    def paintEvent(self, event):
+        """Paints the window background, scaled to cover the window."""
+
+        painter = QPainter(self)
+        painter.drawPixmap(event.rect(), Resources.get_cover(Settings.GAME_BACKGROUND, self.width(), self.height()),
+                           event.rect())
+
+    def closeEvent(self, event):
+        """Suspends the game when the window is closed, stopping the computer players' worker processes."""
+
+        self.suspend()
+        super().closeEvent(event)
+
 
 class SpeedGo(Go):
     GAME_MODE: GameMode = GameMode.SPEED
 
-    def __init__(self, players_names, board_size, remaining_time=None):
-        super().__init__(players_names, board_size)
+    def __init__(self, players_names, board_size, remaining_time=None, computer_players=None):
+        super().__init__(players_names, board_size, computer_players)
 
         self.timer = QBasicTimer()
 
@@ -424,11 +714,43 @@ class SpeedGo(Go):
         self.timer.stop()
         super().finish_game()
 
-    def reset(self):
-        super().reset()
+    def start_new_game(self, player_names: list[str], computer_players: list[int] = None,
+                       remaining_time: list[int] = None):
+        """
+        Starts a new game in this window, with the players' clocks reset or set to the given times.
+
+        :param player_names: The names of the players, as many as the window was built for.
+        :param computer_players: A list with the indexes of the players played by the computer.
+        :param remaining_time: The seconds left on every player's clock, Settings.TIMER_START if None.
+        """
+
+        super().start_new_game(player_names, computer_players)
+
+        if remaining_time is not None:
+            self.remaining_time[:] = remaining_time
+
+            for player_number, time in enumerate(self.remaining_time):
+                self.score_board.update_player_time(player_number, time)
+
+    def suspend(self):
+        super().suspend()
+        self.timer.stop()
+
+    def get_computer_time_limit(self) -> float:
+        """
+        Returns the number of seconds the computer can spend choosing a move, keeping a second of the player's clock.
 
+        :return: The time limit of the search.
+        """
+
+        return max(min(Settings.COMPUTER_TIME_LIMIT, self.remaining_time[self.current_player] - 1), 0.5)
+
+    def reset(self):
+        # the clocks are reset first, so that the journal is started with them
         self.remaining_time[:] = [Settings.TIMER_START] * self.num_players
 
+        super().reset()
+
         for player_number, time in enumerate(self.remaining_time):
             self.score_board.update_player_time(player_number, time)
 
@@ -441,15 +763,24 @@ class SpeedGo(Go):
         return game
 
     @staticmethod
-    def load_game_from_dictionary(game_object: dict):
+    def load_game_from_dictionary(game_object: dict, speed_go: "SpeedGo" = None):
+
+        if speed_go is None:
+            speed_go = SpeedGo(game_object["players_names"], game_object["board_size"], game_object["remaining_time"],
+                               game_object.get("computer_players"))
+        else:
+            speed_go.start_new_game(game_object["players_names"], game_object.get("computer_players"),
+                                    game_object["remaining_time"])
 
-        speed_go = SpeedGo(game_object["players_names"], game_object["board_size"], game_object["remaining_time"])
-        speed_go.board.load_state(game_object["board_array"])
-        speed_go.set_score_board(game_object["players_scores"])
+        speed_go.restore_board(game_object)
+        speed_go.players_scores = list(game_object["players_scores"])
+        speed_go.set_score_board(speed_go.players_scores)
         speed_go.set_player_turn(game_object["current_player"])
         speed_go.score_board.set_turn_player(speed_go.current_player)
         speed_go.pass_turn_counter = game_object["pass_turn_counter"]
 
+        speed_go.start_journal()
+
         if game_object["game_over"]:
             speed_go.finish_game()
 
@@ -467,6 +798,7 @@ class SpeedGo(Go):
             # update counter and timer label on scoreboard
             self.remaining_time[self.current_player] -= 1
             self.score_board.update_player_time(self.current_player, self.remaining_time[self.current_player])
+            self.journal.record_clock(self.current_player, self.remaining_time[self.current_player])
 
             if self.remaining_time[self.current_player] == 0:
                 self.pass_turn()
@@ -0,0 +1,855 @@
+import copy
+import random
+import struct
+from array import array
+from typing import NamedTuple
+
+from Settings import Settings, KoRule, EngineBackend
+
+EMPTY = 0
+NO_CHAIN = -1
+
+
+class Move(NamedTuple):
+    """
+    A move played on a GoEngine.
+
+    point: The flat index of the intersection the stone was placed on.
+    colour: The colour (1 based player number) of the stone that was placed.
+    captured: The (point, colour) pairs of the enemy stones that were removed by the move.
+    """
+
+    point: int
+    colour: int
+    captured: tuple[tuple[int, int], ...]
+
+
+class GoEngine:
+    """
+    A Qt-free implementation of the rules of Go.
+
+    The board is stored as a flat list of board_size * board_size integers, where each point is addressed by
+    row * board_size + column and holds 0 for an empty intersection or the 1 based number of the player that owns the
+    stone placed there. The adjacent points of every intersection are computed once per board size and shared by every
+    engine of that size.
+
+    Chains of connected stones are kept up to date as stones are placed and removed: every stone points to the id of
+    its chain, and every chain keeps the list of its stones and the set of its liberties. Placing a stone merges it
+    with its friendly neighbours, always relabelling the smaller chain into the larger one, so the legality and capture
+    checks only look at the chains adjacent to the move instead of flooding whole groups.
+
+    Every position is identified by a Zobrist hash, the xor of a random key per (point, colour) for every stone on the
+    board, which is updated as stones are placed and removed. The hashes of the positions reached are counted so that
+    repetitions are found in constant time, according to the engine's ko_rule:
+        SIMPLE: a move may not recreate the position of one full round of turns ago.
+        POSITIONAL_SUPERKO: a move may not recreate any previous position.
+        SITUATIONAL_SUPERKO: a move may not recreate any previous position with the same player to move next.
+
+    Attributes:
+        board_size: The number of rows/columns in the board.
+        num_players: The number of players in the game.
+        board: The flat list of integers holding the current state of the board.
+        neighbours: A tuple with, for every point, the tuple of its adjacent points.
+        chain_of: The flat list holding, for every point, the id of the chain its stone belongs to (NO_CHAIN if empty).
+        chain_stones: A dictionary mapping every chain id to the list of points of its stones.
+        chain_liberties: A dictionary mapping every chain id to the set of its liberties.
+        ko_rule: The KoRule used to reject repeated positions.
+        hash: The Zobrist hash of the current position.
+        history: The list of moves played on the engine, used to undo them.
+        position_history: The hashes of the positions reached, starting with the position before the first move.
+    """
+
+    # board size, number of players, ko rule and the number of position and situation hashes that follow the board
+    _BYTES_HEADER = struct.Struct("<BBBII")
+
+    _neighbours_cache: dict[int, tuple[tuple[int, ...], ...]] = {}
+    _zobrist_cache: dict[int, tuple[tuple[int, ...], ...]] = {}
+
+    # keys xored into a position hash to tell apart the player to move next, for situational superko
+    _turn_keys = tuple(random.Random(-1).getrandbits(64) for _ in range(Settings.MAX_NUMBER_OF_PLAYERS + 1))
+
+    def __init__(self, board_size: int = 16, num_players: int = 2, ko_rule: KoRule = KoRule.SIMPLE):
+        """
+        Initializes an empty board of the given size.
+
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        :param ko_rule: The KoRule used to reject repeated positions.
+        """
+
+        self.board_size = board_size
+        self.num_players = num_players
+        self.ko_rule = ko_rule
+        self.zobrist = self.get_zobrist_table(board_size)
+
+        self.board = [EMPTY] * (board_size * board_size)
+        self.neighbours = self.get_neighbours_table(board_size)
+
+        self.chain_of = [NO_CHAIN] * (board_size * board_size)
+        self.chain_stones: dict[int, list[int]] = {}
+        self.chain_liberties: dict[int, set[int]] = {}
+
+        self._start_history(1)
+
+    @staticmethod
+    def create(board_size: int, num_players: int, ko_rule: KoRule = None, backend: EngineBackend = None) -> "GoEngine":
+        """
+        Creates an engine of the given backend, which defaults to the one chosen in Settings.ENGINE_BACKEND.
+
+        :param board_size: The number of rows/columns in the board.
+        :param num_players: The number of players in the game.
+        :param ko_rule: The KoRule used to reject repeated positions, Settings.KO_RULE if not given.
+        :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+        :return: A new engine with an empty board.
+        """
+
+        ko_rule = Settings.KO_RULE if ko_rule is None else ko_rule
+        backend = Settings.ENGINE_BACKEND if backend is None else backend
+
+        if backend == EngineBackend.BITBOARD:
+            from BitBoardEngine import BitBoardEngine
+            return BitBoardEngine(board_size, num_players, ko_rule)
+
+        return GoEngine(board_size, num_players, ko_rule)
+
+    @staticmethod
+    def get_initial_scores(num_players: int) -> list[float]:
+        """
+        Gets the scores the players start a game with, the komi given to every player after the first.
+
+        :param num_players: The number of players in the game.
+        :return: A list of floats with the initial score of every player.
+        """
+
+        return [round((i != 0) * 7.5 / (2 ** (num_players - i - 1)), 1) for i in range(num_players)]
+
+    @classmethod
+    def get_neighbours_table(cls, board_size: int) -> tuple[tuple[int, ...], ...]:
+        """
+        Returns the table of adjacent points for a board of the given size, building it on first use.
+
+        :param board_size: The number of rows/columns in the board.
+        :return: A tuple with, for every point, the tuple of its adjacent points.
+        """
+
+        table = cls._neighbours_cache.get(board_size)
+
+        if table is None:
+            table = []
+
+            for row in range(board_size):
+                for column in range(board_size):
+                    adjacent = []
+
+                    for (row0, column0) in ((row + 1, column), (row, column + 1), (row - 1, column), (row, column - 1)):
+                        if 0 <= row0 < board_size and 0 <= column0 < board_size:
+                            adjacent.append(row0 * board_size + column0)
+
+                    table.append(tuple(adjacent))
+
+            table = cls._neighbours_cache[board_size] = tuple(table)
+
+        return table
+
+    @classmethod
+    def get_zobrist_table(cls, board_size: int) -> tuple[tuple[int, ...], ...]:
+        """
+        Returns the table of Zobrist keys for a board of the given size, building it on first use.
+
+        The keys are drawn from a generator seeded with the board size, so the hash of a position is the same in every
+        process.
+
+        :param board_size: The number of rows/columns in the board.
+        :return: A tuple with, for every point, the tuple of keys of each colour (the key of EMPTY being 0).
+        """
+
+        table = cls._zobrist_cache.get(board_size)
+
+        if table is None:
+            generator = random.Random(board_size)
+
+            table = cls._zobrist_cache[board_size] = tuple(
+                (0,) + tuple(generator.getrandbits(64) for _ in range(Settings.MAX_NUMBER_OF_PLAYERS))
+                for _ in range(board_size * board_size))
+
+        return table
+
+    # COORDINATES ========================================
+
+    def point(self, row: int, column: int) -> int:
+        """
+        Converts a row and column into the flat index of that intersection.
+
+        :param row: The row of the intersection.
+        :param column: The column of the intersection.
+        :return: The flat index of the intersection.
+        """
+
+        return row * self.board_size + column
+
+    def coordinates(self, point: int) -> tuple[int, int]:
+        """
+        Converts the flat index of an intersection into its row and column.
+
+        :param point: The flat index of the intersection.
+        :return: A tuple containing the row and the column of the intersection.
+        """
+
+        return divmod(point, self.board_size)
+
+    # STATE ==============================================
+
+    def get_state(self) -> list[list[int]]:
+        """
+        Returns the current state of the board as a 2D array of integers.
+
+        :return: 2D array of integers representing the current state of the board
+        """
+
+        size = self.board_size
+        return [self.board[row * size:(row + 1) * size] for row in range(size)]
+
+    def load_state(self, board_state: list[list[int]], colour_to_move: int = 1):
+        """
+        Loads the given 2D state into the board and clears the move history.
+
+        :param board_state: A 2D list representing the state to be loaded into the board.
+        :param colour_to_move: The colour of the player who plays next from the loaded state.
+        """
+
+        self.board = [value for board_row in board_state for value in board_row]
+
+        self._build_chains()
+        self._start_history(colour_to_move)
+
+    def load_game(self, board_state: list[list[int]], moves: list[Move]) -> bool:
+        """
+        Loads a game so that its moves can be taken back: the board the moves were played from is found by taking them
+        back from the given state, and the moves are played again from it. If they do not give the given state again,
+        the state is loaded without its moves.
+
+        :param board_state: A 2D list representing the state after the moves.
+        :param moves: The Moves played, in order.
+        :return: True if the moves were played again, False if the state was loaded without them.
+        """
+
+        size = self.board_size
+        board = [value for board_row in board_state for value in board_row]
+
+        for move in reversed(moves):
+            board[move.point] = EMPTY
+            for point, colour in move.captured:
+                board[point] = colour
+
+        self.load_state([board[row * size:(row + 1) * size] for row in range(size)], moves[0].colour if moves else 1)
+
+        for move in moves:
+            if not self.is_move_valid(move.point, move.colour):
+                break
+            self.play(move.point, move.colour)
+        else:
+            if self.get_state() == board_state:
+                return True
+
+        self.load_state(board_state)
+
+        return False
+
+    def reset(self):
+        """Clears every stone and the move history from the board."""
+
+        self.board = [EMPTY] * (self.board_size * self.board_size)
+
+        self._build_chains()
+        self._start_history(1)
+
+    def _start_history(self, colour_to_move: int):
+        """
+        Clears the move history and records the current position as the first one of the game.
+
+        :param colour_to_move: The colour of the player who plays next.
+        """
+
+        zobrist = self.zobrist
+        self.hash = 0
+        for point, colour in enumerate(self.board):
+            self.hash ^= zobrist[point][colour]
+
+        self.history: list[Move] = []
+        self.position_history = [self.hash]
+        self.position_counts = {self.hash: 1}
+        self.situation_counts = {self.hash ^ self._turn_keys[colour_to_move]: 1}
+
+    def copy(self) -> "GoEngine":
+        """
+        Returns an independent copy of the engine, with the same position, chains and repetition history.
+
+        :return: A new engine of the same class.
+        """
+
+        engine = copy.copy(self)
+
+        engine.board = self.board[:]
+        engine.chain_of = self.chain_of[:]
+        engine.chain_stones = {chain: stones[:] for chain, stones in self.chain_stones.items()}
+        engine.chain_liberties = {chain: set(liberties) for chain, liberties in self.chain_liberties.items()}
+
+        engine.history = self.history[:]
+        engine.position_history = self.position_history[:]
+        engine.position_counts = dict(self.position_counts)
+        engine.situation_counts = dict(self.situation_counts)
+
+        return engine
+
+    def to_bytes(self) -> bytes:
+        """
+        Packs the position into a compact byte string: a header, one byte per point and the 64 bit hashes of the
+        positions and situations reached, which is what the ko rules need to go on from the position.
+
+        The move history is not included, so an engine restored with from_bytes cannot undo the moves played before.
+
+        :return: The packed position.
+        """
+
+        header = self._BYTES_HEADER.pack(self.board_size, self.num_players, list(KoRule).index(self.ko_rule),
+                                         len(self.position_history), len(self.situation_counts))
+
+        return (header + bytes(self.board) + array("Q", self.position_history).tobytes()
+                + array("Q", self.situation_counts).tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, backend: EngineBackend = None) -> "GoEngine":
+        """
+        Creates an engine from a position packed with to_bytes.
+
+        :param data: The packed position.
+        :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+        :return: A new engine holding the position.
+        """
+
+        board_size, num_players, ko_rule, positions, situations = cls._BYTES_HEADER.unpack_from(data)
+        engine = cls.create(board_size, num_players, list(KoRule)[ko_rule], backend)
+
+        offset = cls._BYTES_HEADER.size
+        points = board_size * board_size
+
+        engine.board = list(data[offset:offset + points])
+        engine._build_chains()
+        engine._start_history(1)
+
+        offset += points
+        position_history = array("Q")
+        position_history.frombytes(data[offset:offset + positions * 8])
+
+        offset += positions * 8
+        situation_hashes = array("Q")
+        situation_hashes.frombytes(data[offset:offset + situations * 8])
+
+        engine.position_history = position_history.tolist()
+        engine.position_counts = {}
+        for position in engine.position_history:
+            engine.position_counts[position] = engine.position_counts.get(position, 0) + 1
+        engine.situation_counts = dict.fromkeys(situation_hashes.tolist(), 1)
+
+        return engine
+
+    def next_colour(self, colour: int) -> int:
+        """
+        Returns the colour of the player who plays after the given one.
+
+        :param colour: The colour of a player.
+        :return: The colour of the next player.
+        """
+
+        return colour % self.num_players + 1
+
+    # CHAINS =============================================
+
+    def get_group(self, point: int) -> set[int]:
+        """
+        Returns the points of the group of stones that the stone at the given point belongs to.
+
+        :param point: The flat index of a stone.
+        :return: The set of points of the group.
+        """
+
+        chain = self.chain_of[point]
+
+        if chain == NO_CHAIN:
+            raise Exception("This point doesnt belong to any player")
+
+        return set(self.chain_stones[chain])
+
+    def get_liberties(self, point: int) -> set[int]:
+        """
+        Returns the liberties of the group of stones that the stone at the given point belongs to.
+
+        :param point: The flat index of a stone.
+        :return: The set of empty points adjacent to the group.
+        """
+
+        chain = self.chain_of[point]
+
+        if chain == NO_CHAIN:
+            raise Exception("This point doesnt belong to any player")
+
+        return set(self.chain_liberties[chain])
+
+    def _build_chains(self):
+        """Rebuilds every chain from the stones currently on the board."""
+
+        self.chain_of = [NO_CHAIN] * len(self.board)
+        self.chain_stones = {}
+        self.chain_liberties = {}
+
+        for point, colour in enumerate(self.board):
+            if colour != EMPTY and self.chain_of[point] == NO_CHAIN:
+                self._build_chain(point)
+
+    def _build_chain(self, start: int):
+        """
+        Floods the group of stones containing the given point and records it as a new chain with its liberties.
+
+        :param start: The flat index of a stone whose chain is not recorded.
+        """
+
+        board = self.board
+        neighbours = self.neighbours
+        chain_of = self.chain_of
+        colour = board[start]
+
+        stones = [start]
+        liberties = set()
+        chain_of[start] = start
+
+        for point in stones:
+            for adjacent in neighbours[point]:
+                if board[adjacent] == EMPTY:
+                    liberties.add(adjacent)
+                elif board[adjacent] == colour and chain_of[adjacent] != start:
+                    chain_of[adjacent] = start
+                    stones.append(adjacent)
+
+        self.chain_stones[start] = stones
+        self.chain_liberties[start] = liberties
+
+    def _add_stone(self, point: int, colour: int):
+        """
+        Places a stone on the board, taking its point from the liberties of the adjacent chains and merging it with the
+        adjacent chains of the same colour.
+
+        :param point: The flat index of an empty intersection.
+        :param colour: The colour of the stone.
+        """
+
+        board = self.board
+        chain_of = self.chain_of
+        chain_liberties = self.chain_liberties
+
+        board[point] = colour
+        self.hash ^= self.zobrist[point][colour]
+        chain_of[point] = point
+        self.chain_stones[point] = [point]
+        chain_liberties[point] = {adjacent for adjacent in self.neighbours[point] if board[adjacent] == EMPTY}
+
+        for adjacent in self.neighbours[point]:
+            adjacent_chain = chain_of[adjacent]
+
+            if adjacent_chain == NO_CHAIN:
+                continue
+
+            chain_liberties[adjacent_chain].discard(point)
+
+            if board[adjacent] == colour and adjacent_chain != chain_of[point]:
+                self._merge_chains(chain_of[point], adjacent_chain)
+
+    def _merge_chains(self, first: int, second: int):
+        """
+        Merges two chains of the same colour, relabelling the stones of the smaller one.
+
+        :param first: The id of a chain.
+        :param second: The id of another chain of the same colour.
+        """
+
+        chain_stones = self.chain_stones
+
+        if len(chain_stones[first]) < len(chain_stones[second]):
+            first, second = second, first
+
+        chain_of = self.chain_of
+        for stone in chain_stones[second]:
+            chain_of[stone] = first
+
+        chain_stones[first].extend(chain_stones.pop(second))
+        self.chain_liberties[first] |= self.chain_liberties.pop(second)
+
+    def _remove_chain(self, chain: int) -> list[int]:
+        """
+        Removes every stone of the given chain from the board, giving their points back as liberties to the adjacent
+        chains.
+
+        :param chain: The id of the chain to remove.
+        :return: The list of points of the removed stones.
+        """
+
+        board = self.board
+        chain_of = self.chain_of
+        neighbours = self.neighbours
+        chain_liberties = self.chain_liberties
+
+        stones = self.chain_stones.pop(chain)
+        del chain_liberties[chain]
+
+        zobrist = self.zobrist
+        for stone in stones:
+            self.hash ^= zobrist[stone][board[stone]]
+            board[stone] = EMPTY
+            chain_of[stone] = NO_CHAIN
+
+        for stone in stones:
+            for adjacent in neighbours[stone]:
+                if chain_of[adjacent] != NO_CHAIN:
+                    chain_liberties[chain_of[adjacent]].add(stone)
+
+        return stones
+
+    def _remove_stone(self, point: int):
+        """
+        Removes a single stone from the board, splitting its chain into the groups left behind.
+
+        :param point: The flat index of a stone.
+        """
+
+        board = self.board
+        chain_of = self.chain_of
+
+        chain = chain_of[point]
+        stones = self.chain_stones.pop(chain)
+        del self.chain_liberties[chain]
+
+        for stone in stones:
+            chain_of[stone] = NO_CHAIN
+
+        self.hash ^= self.zobrist[point][board[point]]
+        board[point] = EMPTY
+
+        # the emptied point becomes a liberty of the remaining adjacent chains
+        for adjacent in self.neighbours[point]:
+            if chain_of[adjacent] != NO_CHAIN:
+                self.chain_liberties[chain_of[adjacent]].add(point)
+
+        for stone in stones:
+            if chain_of[stone] == NO_CHAIN and stone != point:
+                self._build_chain(stone)
+
+    # RULES ==============================================
+
+    def is_move_valid(self, point: int, colour: int) -> bool:
+        """
+        Checks if placing a stone of the given colour on the given point is valid.
+
+        The move is valid if the point is empty and the placed stone is either adjacent to an empty point, connected to
+        a friendly chain that keeps another liberty, or takes the last liberty of an enemy chain, capturing it.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: True if the move is valid, False otherwise.
+        """
+
+        board = self.board
+
+        # if the point is already set to a player the move is not valid
+        if board[point] != EMPTY:
+            return False
+
+        chain_of = self.chain_of
+        chain_liberties = self.chain_liberties
+
+        for adjacent in self.neighbours[point]:
+            adjacent_colour = board[adjacent]
+
+            # an empty adjacent point is a liberty of the new stone
+            if adjacent_colour == EMPTY:
+                return True
+
+            liberties = len(chain_liberties[chain_of[adjacent]])
+
+            # a friendly chain with another liberty keeps the new stone alive
+            if adjacent_colour == colour and liberties > 1:
+                return True
+
+            # an enemy chain whose last liberty is this point gets captured
+            if adjacent_colour != colour and liberties == 1:
+                return True
+
+        return False
+
+    def is_ko(self, point: int, colour: int) -> bool:
+        """
+        Checks if placing a stone of the given colour on the given point repeats a position forbidden by the ko rule.
+
+        The move is expected to be valid.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: True if the move is forbidden by the ko rule, False otherwise.
+        """
+
+        return self.is_repetition(self.get_resulting_hash(point, colour), colour)
+
+    def get_resulting_hash(self, point: int, colour: int) -> int:
+        """
+        Works out the hash of the position a valid move would produce, without playing it.
+
+        The hash is worked out from the current one, the placed stone and the stones of the enemy chains whose last
+        liberty is the point.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: The Zobrist hash of the resulting position.
+        """
+
+        board = self.board
+        zobrist = self.zobrist
+        chain_of = self.chain_of
+
+        new_hash = self.hash ^ zobrist[point][colour]
+        captured_chains = set()
+
+        for adjacent in self.neighbours[point]:
+            adjacent_colour = board[adjacent]
+
+            if adjacent_colour == EMPTY or adjacent_colour == colour:
+                continue
+
+            chain = chain_of[adjacent]
+            if chain not in captured_chains and len(self.chain_liberties[chain]) == 1:
+                captured_chains.add(chain)
+
+                for stone in self.chain_stones[chain]:
+                    new_hash ^= zobrist[stone][adjacent_colour]
+
+        return new_hash
+
+    def is_repetition(self, new_hash: int, colour: int) -> bool:
+        """
+        Checks if a move by the given colour reaching the position with the given hash is forbidden by the ko rule.
+
+        :param new_hash: The Zobrist hash of the position reached by the move.
+        :param colour: The colour of the player making the move.
+        :return: True if the position is a forbidden repetition, False otherwise.
+        """
+
+        if self.ko_rule == KoRule.POSITIONAL_SUPERKO:
+            return new_hash in self.position_counts
+
+        if self.ko_rule == KoRule.SITUATIONAL_SUPERKO:
+            return new_hash ^ self._turn_keys[self.next_colour(colour)] in self.situation_counts
+
+        # with simple ko only the position at the end of the player's previous turn is forbidden
+        if len(self.position_history) <= self.num_players:
+            return False
+
+        return new_hash == self.position_history[-self.num_players]
+
+    def is_move_legal(self, point: int, colour: int) -> bool:
+        """
+        Checks if a move is both valid and allowed by the ko rule.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: True if the move can be played, False otherwise.
+        """
+
+        return self.is_move_valid(point, colour) and not self.is_ko(point, colour)
+
+    def get_legal_moves(self, colour: int) -> list[bool]:
+        """
+        Returns a mask of every point where the given colour can play, with occupancy, suicide, capture and ko applied.
+
+        The board is scanned once, reading the liberty count of each adjacent chain from a table built once for the
+        whole scan, and only the points that pass those checks are hashed to apply the ko rule.
+
+        :param colour: The colour of the player making the move.
+        :return: A list with, for every flat index, True if the move is legal and False otherwise.
+        """
+
+        board = self.board
+        neighbours = self.neighbours
+        chain_of = self.chain_of
+        liberty_counts = {chain: len(liberties) for chain, liberties in self.chain_liberties.items()}
+
+        legal = [False] * len(board)
+
+        for point, point_colour in enumerate(board):
+            if point_colour != EMPTY:
+                continue
+
+            for adjacent in neighbours[point]:
+                adjacent_colour = board[adjacent]
+
+                if adjacent_colour == EMPTY:
+                    legal[point] = True
+                    break
+
+                # a friendly chain with another liberty, or an enemy chain in atari, makes the move valid
+                if (adjacent_colour == colour) == (liberty_counts[chain_of[adjacent]] > 1):
+                    legal[point] = True
+                    break
+
+        if self.can_repeat():
+            for point, is_legal in enumerate(legal):
+                if is_legal and self.is_ko(point, colour):
+                    legal[point] = False
+
+        return legal
+
+    def can_repeat(self) -> bool:
+        """
+        Checks if any move could currently be forbidden by the ko rule, so that legal move scans can skip hashing.
+
+        :return: False if no repetition is possible yet, True otherwise.
+        """
+
+        # with simple ko nothing can be repeated before every player has moved
+        return self.ko_rule != KoRule.SIMPLE or len(self.position_history) > self.num_players
+
+    def play(self, point: int, colour: int) -> Move:
+        """
+        Places a stone of the given colour on the given point and removes the enemy groups it captures.
+
+        The move is expected to have been checked with is_move_valid beforehand.
+
+        :param point: The flat index of the move.
+        :param colour: The colour of the player making the move.
+        :return: The Move that was played, including the points of the captured stones.
+        """
+
+        self._add_stone(point, colour)
+
+        board = self.board
+        chain_of = self.chain_of
+        captured_chains = {}
+
+        # every enemy chain left without liberties is captured at once, as removing one gives liberties to the others
+        for adjacent in self.neighbours[point]:
+            adjacent_colour = board[adjacent]
+
+            if adjacent_colour == EMPTY or adjacent_colour == colour:
+                continue
+
+            if not self.chain_liberties[chain_of[adjacent]]:
+                captured_chains[chain_of[adjacent]] = adjacent_colour
+
+        captured = []
+        for chain, chain_colour in captured_chains.items():
+            captured.extend((stone, chain_colour) for stone in self._remove_chain(chain))
+
+        move = Move(point, colour, tuple(captured))
+        self.history.append(move)
+        self._record_position(self.next_colour(colour))
+
+        return move
+
+    def _record_position(self, colour_to_move: int):
+        """
+        Adds the current position to the position history and the repetition counts.
+
+        :param colour_to_move: The colour of the player who plays next.
+        """
+
+        situation = self.hash ^ self._turn_keys[colour_to_move]
+
+        self.position_history.append(self.hash)
+        self.position_counts[self.hash] = self.position_counts.get(self.hash, 0) + 1
+        self.situation_counts[situation] = self.situation_counts.get(situation, 0) + 1
+
+    def _forget_position(self, colour_to_move: int):
+        """
+        Removes the current position from the position history and the repetition counts.
+
+        :param colour_to_move: The colour of the player who was to play next from the position.
+        """
+
+        situation = self.hash ^ self._turn_keys[colour_to_move]
+
+        self.position_history.pop()
+
+        for counts, key in ((self.position_counts, self.hash), (self.situation_counts, situation)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+
+    def undo(self) -> Move:
+        """
+        Takes back the last move played, restoring the stones it captured.
+
+        Taking the stone back can split its chain, so the rest of the chain is flooded again into new chains.
+
+        :return: The Move that was taken back.
+        """
+
+        move = self.history.pop()
+        self._forget_position(self.next_colour(move.colour))
+
+        self._remove_stone(move.point)
+
+        for captured_point, captured_colour in move.captured:
+            self._add_stone(captured_point, captured_colour)
+
+        return move
+
+    # SCORING ============================================
+
+    def get_controlled_territories(self) -> dict[int, set[tuple[int, int]]]:
+        """
+        Finds the territories controlled by each player.
+
+        The empty points are labelled region by region in a single pass: each empty point is visited once, and the
+        colours of the stones bordering its region are collected on the way. A region is the territory of a player if
+        that player's stones are the only ones bordering it.
+
+        :return: A dictionary mapping each colour to the set of (row, column) tuples of the empty spaces it controls.
+        """
+
+        territories = {colour: set() for colour in range(1, self.num_players + 1)}
+
+        board = self.board
+        neighbours = self.neighbours
+        visited = [False] * len(board)
+
+        for start, colour in enumerate(board):
+            if colour != EMPTY or visited[start]:
+                continue
+
+            visited[start] = True
+            region = [start]
+            bordering_colours = set()
+
+            for point in region:
+                for adjacent in neighbours[point]:
+                    adjacent_colour = board[adjacent]
+
+                    if adjacent_colour != EMPTY:
+                        bordering_colours.add(adjacent_colour)
+                    elif not visited[adjacent]:
+                        visited[adjacent] = True
+                        region.append(adjacent)
+
+            if len(bordering_colours) == 1:
+                territories[bordering_colours.pop()].update(divmod(point, self.board_size) for point in region)
+
+        return territories
+
+    def get_final_scores(self, players_scores: list[float]) -> list[float]:
+        """
+        Works out the scores the players finish the game with, adding the territory every player controls on the current
+        board to their score.
+
+        :param players_scores: The scores of the players before counting the territories (komi and captured stones).
+        :return: A list of floats with the final score of every player.
+        """
+
+        territories = self.get_controlled_territories()
+
+        return [score + len(territories[colour]) for colour, score in enumerate(players_scores, 1)]
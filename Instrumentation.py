@@ -0,0 +1,214 @@
+import json
+import sys
+import time
+from typing import Optional, TextIO
+
+from Settings import Settings
+
+
+class PhaseTimer:
+    """
+    The time spent in one phase of a move.
+
+    Attributes:
+        calls: The number of times the phase ran.
+        total_ns: The total time spent in the phase, in nanoseconds.
+        max_ns: The time of the slowest run of the phase, in nanoseconds.
+    """
+
+    __slots__ = ("calls", "total_ns", "max_ns", "_start")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter_ns() - self._start
+
+        self.calls += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+
+    def to_dictionary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0.0,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class Instrumentation:
+    """
+    Counters and high resolution timers for the phases of the moves played in a game.
+
+    Phases are timed by running them inside `with instrumentation.phase(name):`, events are counted with count, and
+    sizes (such as the size of the groups flooded) are recorded with observe. The figures can be read at any time with
+    snapshot, and are also dumped as a JSON line every dump_every moves if it is set.
+
+    Attributes:
+        enabled: True, as opposed to NullInstrumentation, so that costly figures are only worked out when recorded.
+        dump_every: The number of moves between two dumps, 0 to never dump automatically.
+        dump_file: The file the dumps are written to.
+        moves: The number of moves ended with end_move.
+        timers: A dictionary mapping every phase name to its PhaseTimer.
+        counters: A dictionary mapping every counter name to its value.
+        observations: A dictionary mapping every observed name to a [count, total, max] list.
+    """
+
+    enabled = True
+
+    # the dump file, opened once and shared by the instrumentation of every game window
+    _shared_dump_file: Optional[TextIO] = None
+
+    def __init__(self, dump_every: int = 0, dump_file: Optional[TextIO] = None):
+        """
+        Initializes empty counters and timers.
+
+        :param dump_every: The number of moves between two dumps, 0 to never dump automatically.
+        :param dump_file: The file the dumps are written to, the standard error if not given.
+        """
+
+        self.dump_every = dump_every
+        self.dump_file = dump_file
+
+        self.reset()
+
+    @staticmethod
+    def create() -> "Instrumentation":
+        """
+        Creates the instrumentation configured in Settings: an Instrumentation if Settings.INSTRUMENTATION is set,
+        otherwise a NullInstrumentation that records nothing. Every instrumentation dumps to the same file, opened on
+        first use.
+
+        :return: The new instrumentation.
+        """
+
+        if not Settings.INSTRUMENTATION:
+            return NullInstrumentation()
+
+        if Settings.INSTRUMENTATION_DUMP_FILE and Instrumentation._shared_dump_file is None:
+            Instrumentation._shared_dump_file = open(Settings.INSTRUMENTATION_DUMP_FILE, "a")
+
+        return Instrumentation(Settings.INSTRUMENTATION_DUMP_EVERY, Instrumentation._shared_dump_file)
+
+    def reset(self):
+        """Clears every counter and timer."""
+
+        self.moves = 0
+        self.timers: dict[str, PhaseTimer] = {}
+        self.counters: dict[str, int] = {}
+        self.observations: dict[str, list] = {}
+
+    def phase(self, name: str) -> PhaseTimer:
+        """
+        Returns the timer of the given phase, to be used as a context manager around the code of the phase.
+
+        :param name: The name of the phase.
+        :return: The PhaseTimer of the phase.
+        """
+
+        timer = self.timers.get(name)
+
+        if timer is None:
+            timer = self.timers[name] = PhaseTimer()
+
+        return timer
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Adds the given amount to a counter.
+
+        :param name: The name of the counter.
+        :param amount: The amount to add.
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float):
+        """
+        Records one value of a measure, keeping its count, total and maximum.
+
+        :param name: The name of the measure.
+        :param value: The value observed.
+        """
+
+        observation = self.observations.get(name)
+
+        if observation is None:
+            self.observations[name] = [1, value, value]
+            return
+
+        observation[0] += 1
+        observation[1] += value
+        if value > observation[2]:
+            observation[2] = value
+
+    def end_move(self):
+        """Counts a move played, dumping the figures if dump_every moves were played since the last dump."""
+
+        self.moves += 1
+
+        if self.dump_every and self.moves % self.dump_every == 0:
+            self.dump()
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current figures.
+
+        :return: A dictionary with the number of moves, and the timers, counters and observations by name.
+        """
+
+        return {
+            "moves": self.moves,
+            "timers": {name: timer.to_dictionary() for name, timer in self.timers.items()},
+            "counters": dict(self.counters),
+            "observations": {name: {"count": count, "mean": total / count, "max": maximum}
+                             for name, (count, total, maximum) in self.observations.items()},
+        }
+
+    def dump(self):
+        """Writes the current figures to the dump file as a JSON line."""
+
+        file = self.dump_file or sys.stderr
+        file.write(json.dumps(self.snapshot()) + "\n")
+        file.flush()
+
+
+class NullPhase:
+    """A context manager that does nothing, used in place of the phase timers when the instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+class NullInstrumentation(Instrumentation):
+    """An Instrumentation that records nothing, so that the instrumented code costs next to nothing when it is off."""
+
+    enabled = False
+
+    _null_phase = NullPhase()
+
+    def phase(self, name: str) -> NullPhase:
+        return self._null_phase
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def observe(self, name: str, value: float):
+        pass
+
+    def end_move(self):
+        pass
@@ -0,0 +1,403 @@
+import io
+import os
+import struct
+import threading
+from typing import Optional
+
+import SaveFormat
+from GoEngine import GoEngine, Move
+from Settings import Settings
+
+MAGIC = b"PYGJ"
+VERSION = 1
+
+# the journal starts with the game as it was when the journal was started, in the SaveFormat binary format, followed
+# by a fixed size record for every change made to the game since
+_SNAPSHOT = struct.Struct("<4sBI")
+_RECORD = struct.Struct("<BBH")
+
+MOVE = 1
+PASS = 2
+UNDO = 3
+REDO = 4
+CLOCK = 5
+
+
+def get_path(path: str = None) -> str:
+    return os.path.join(Settings.BASE_DIRECTORY, path or Settings.JOURNAL_PATH)
+
+
+class Journal:
+    """
+    An append-only journal of the game being played, so that it can be recovered if the game is not closed properly.
+
+    The journal is started with a snapshot of the game (when a game is started, loaded or reset), and every move, pass,
+    undo and redo is then appended to it as a 4 bytes record. Appending a record only packs it into a buffer: the
+    buffer is written to the file and synced to the disk by a background thread, at most every
+    Settings.JOURNAL_SYNC_INTERVAL seconds, so that no move waits for the disk. Stopping the journal (when the game is
+    over or its window is closed) deletes the file, so a journal left on the disk at startup belongs to an interrupted
+    game, which recover replays.
+
+    There is a single journal file, shared by every game window through Journal.create, and the window that started the
+    journal last owns it: a window that is closed after another one started its game does not delete the new journal.
+
+    Attributes:
+        path: The path of the journal file.
+        sync_interval: The seconds the background thread waits for more records before writing them.
+        owner: The game window that started the journal, None if it is stopped.
+        records: The number of records appended since the journal was started.
+    """
+
+    _shared: Optional["Journal"] = None
+
+    def __init__(self, path: str = None, sync_interval: float = None):
+        """
+        Initializes a stopped journal and starts its background thread.
+
+        :param path: The path of the journal file, relative to the game's directory or absolute,
+            Settings.JOURNAL_PATH if not given.
+        :param sync_interval: The seconds the background thread waits for more records before writing them,
+            Settings.JOURNAL_SYNC_INTERVAL if not given.
+        """
+
+        self.path = get_path(path)
+        self.sync_interval = Settings.JOURNAL_SYNC_INTERVAL if sync_interval is None else sync_interval
+
+        self.owner = None
+        self.records = 0
+
+        # the state shared with the background thread, guarded by the condition
+        self._condition = threading.Condition()
+        self._pending = bytearray()
+        self._truncate = False
+        self._discard = False
+        self._appended = 0
+        self._synced = 0
+        self._flushing = False
+
+        self._file = None
+
+        self._thread = threading.Thread(target=self._run, name="Journal", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def create() -> "Journal":
+        """
+        Returns the journal configured in Settings: the shared Journal if Settings.JOURNAL is set, otherwise a
+        NullJournal that writes nothing.
+
+        :return: The journal.
+        """
+
+        if not Settings.JOURNAL:
+            return NullJournal()
+
+        if Journal._shared is None:
+            Journal._shared = Journal()
+
+        return Journal._shared
+
+    # WRITING ================================================
+
+    def start(self, game: dict, owner):
+        """
+        Starts the journal again from a snapshot of a game, dropping the records of the previous game.
+
+        :param game: The game dictionary, as built by Go.to_dictionary.
+        :param owner: The game window the journal is started for.
+        """
+
+        snapshot = io.BytesIO()
+        SaveFormat.write_game(snapshot, game)
+        data = snapshot.getvalue()
+
+        with self._condition:
+            self.owner = owner
+            self.records = 0
+
+            self._pending[:] = _SNAPSHOT.pack(MAGIC, VERSION, len(data)) + data
+            self._truncate = True
+            self._appended += 1
+            self._condition.notify()
+
+    def stop(self, owner):
+        """
+        Stops the journal and deletes its file, if it was started by the given window.
+
+        :param owner: The game window stopping the journal.
+        """
+
+        with self._condition:
+            if owner is not self.owner:
+                return
+
+            self.owner = None
+
+            self._pending.clear()
+            self._truncate = False
+            self._discard = True
+            self._appended += 1
+            self._condition.notify()
+
+    def _append(self, kind: int, colour: int, value: int):
+        with self._condition:
+            if self.owner is None:
+                return
+
+            # the background thread is only woken by the first record of a batch, the next ones are gathered while it
+            # waits for them
+            if not self._pending:
+                self._condition.notify()
+
+            self._pending += _RECORD.pack(kind, colour, value)
+            self.records += 1
+            self._appended += 1
+
+    def record_move(self, move: Move):
+        self._append(MOVE, move.colour, move.point)
+
+    def record_pass(self, player: int):
+        self._append(PASS, player + 1, 0)
+
+    def record_undo(self):
+        self._append(UNDO, 0, 0)
+
+    def record_redo(self):
+        self._append(REDO, 0, 0)
+
+    def record_clock(self, player: int, remaining_time: int):
+        self._append(CLOCK, player + 1, remaining_time)
+
+    def flush(self):
+        """Waits until everything appended so far is written and synced to the disk."""
+
+        with self._condition:
+            target = self._appended
+            self._flushing = True
+            self._condition.notify()
+
+            self._condition.wait_for(lambda: self._synced >= target)
+
+    def _run(self):
+        """Writes the appended records in batches, syncing the file once per batch, until the program exits."""
+
+        condition = self._condition
+
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._appended > self._synced)
+
+                # more records are waited for, so that many records are synced at once, unless the file is to be
+                # replaced or a flush is waited for
+                if not (self._flushing or self._truncate or self._discard):
+                    condition.wait(self.sync_interval)
+
+                data = bytes(self._pending)
+                self._pending.clear()
+                truncate, discard = self._truncate, self._discard
+                self._truncate = self._discard = False
+                self._flushing = False
+                appended = self._appended
+
+            try:
+                self._write(data, truncate, discard)
+            except OSError:
+                # the journal is only a safety net, a full or read-only disk must not stop the game
+                self._close_file()
+
+            with condition:
+                self._synced = appended
+                condition.notify_all()
+
+    def _write(self, data: bytes, truncate: bool, discard: bool):
+        if discard:
+            self._close_file()
+
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        if truncate:
+            self._close_file()
+            self._file = open(self.path, "wb")
+
+        if data and self._file is not None:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class NullJournal(Journal):
+    """A Journal that writes nothing, used when Settings.JOURNAL is off and by the windows that are not playing."""
+
+    def __init__(self):
+        self.owner = None
+        self.records = 0
+
+    def start(self, game: dict, owner):
+        pass
+
+    def stop(self, owner):
+        pass
+
+    def _append(self, kind: int, colour: int, value: int):
+        pass
+
+    def flush(self):
+        pass
+
+
+# RECOVERY ===============================================
+
+def read_journal(path: str = None) -> Optional[tuple[dict, list[tuple[int, int, int]]]]:
+    """
+    Reads the snapshot and the records of a journal. A record cut short by a crash is ignored.
+
+    :param path: The path of the journal file, Settings.JOURNAL_PATH if not given.
+    :return: The game dictionary of the snapshot and the list of (kind, colour, value) records, or None if there is
+    no journal.
+    """
+
+    path = get_path(path)
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < _SNAPSHOT.size:
+        raise SaveFormat.SaveFormatError("The journal ends unexpectedly")
+
+    magic, version, length = _SNAPSHOT.unpack_from(data)
+
+    if magic != MAGIC or version != VERSION:
+        raise SaveFormat.SaveFormatError("The file is not a journal")
+
+    start = _SNAPSHOT.size + length
+    game = SaveFormat.read_game(io.BytesIO(data[_SNAPSHOT.size:start]))
+
+    records = list(_RECORD.iter_unpack(data[start:len(data) - (len(data) - start) % _RECORD.size]))
+
+    return game, records
+
+
+def replay(game: dict, records: list[tuple[int, int, int]]) -> dict:
+    """
+    Replays the records of a journal over its snapshot, the way Go plays, undoes and redoes the moves, stopping at the
+    first record that cannot be replayed.
+
+    :param game: The game dictionary of the snapshot.
+    :param records: The (kind, colour, value) records.
+    :return: The game dictionary of the game as it was when the last record was written, with its redo stack in
+    "redo_moves".
+    """
+
+    num_players = len(game["players_names"])
+
+    engine = GoEngine.create(game["board_size"], num_players)
+    undo_stack = list(engine.history) if engine.load_game(game["board_array"], game.get("moves", [])) else []
+    redo_stack = []
+
+    players_scores = list(game["players_scores"])
+    current_player = game["current_player"]
+    pass_turn_counter = game["pass_turn_counter"]
+    game_over = game["game_over"]
+    remaining_time = list(game["remaining_time"]) if "remaining_time" in game else None
+
+    for kind, colour, value in records:
+        if kind == MOVE:
+            if not engine.is_move_valid(value, colour):
+                break
+
+            move = engine.play(value, colour)
+            undo_stack.append(move)
+            redo_stack.clear()
+
+            players_scores[colour - 1] += len(move.captured)
+            pass_turn_counter = 0
+            current_player = colour % num_players
+
+        elif kind == PASS:
+            pass_turn_counter += 1
+
+            # the game was finished by this pass, which load_game_from_dictionary finishes again
+            if pass_turn_counter == num_players:
+                game_over = True
+                break
+
+            current_player = colour % num_players
+
+        elif kind == UNDO:
+            if not undo_stack:
+                break
+
+            move = undo_stack.pop()
+            engine.undo()
+            redo_stack.append(move)
+
+            current_player = move.colour - 1
+            players_scores[current_player] -= len(move.captured)
+
+        elif kind == REDO:
+            if not redo_stack:
+                break
+
+            move = engine.play(redo_stack[-1].point, redo_stack.pop().colour)
+            undo_stack.append(move)
+
+            players_scores[move.colour - 1] += len(move.captured)
+            current_player = move.colour % num_players
+
+        elif kind == CLOCK and remaining_time is not None:
+            remaining_time[colour - 1] = value
+
+    recovered = dict(game, board_array=engine.get_state(), moves=undo_stack, redo_moves=redo_stack,
+                     players_scores=players_scores, current_player=current_player,
+                     pass_turn_counter=pass_turn_counter, game_over=game_over)
+
+    if remaining_time is not None:
+        recovered["remaining_time"] = remaining_time
+
+    return recovered
+
+
+def recover(path: str = None) -> Optional[dict]:
+    """
+    Recovers the game of a journal left by a game that was not closed properly.
+
+    :param path: The path of the journal file, Settings.JOURNAL_PATH if not given.
+    :return: The game dictionary of the recovered game, in the format of Go.to_dictionary, or None if there is no
+    journal.
+    """
+
+    journal = read_journal(path)
+
+    if journal is None:
+        return None
+
+    return replay(*journal)
+
+
+def shutdown():
+    """Waits until the shared journal has written everything, before the program exits."""
+
+    if Journal._shared is not None:
+        Journal._shared.flush()
+
+
+def discard(path: str = None):
+    """
+    Deletes a journal that was left on the disk.
+
+    :param path: The path of the journal file, Settings.JOURNAL_PATH if not given.
+    """
+
+    path = get_path(path)
+
+    if os.path.exists(path):
+        os.remove(path)
@@ -1,10 +1,21 @@
+import time
+
+# taken before anything else is imported, so that the startup time includes loading Qt and the game's modules
+STARTED_AT = time.perf_counter()
+
+import argparse
 import os
-import pickle
 
+from PyQt6.QtCore import QObject, QEvent, QTimer
 from PyQt6.QtWidgets import QApplication, QMessageBox, QFileDialog
 import sys
 
+import Journal
+import SaveFormat
+import Sgf
+from GameWindowPool import GameWindowPool
 from Go import Go, SpeedGo
+from GoEngine import GoEngine
 from MenuBar import MenuBar
 from Settings import Settings, GameMode
 from WelcomeWindow import WelcomeScreen
@@ -18,10 +29,15 @@ class Main:
         WelcomeScreen.Main = self
         self.player_names = []
 
+        # the game windows are built ahead of time while the welcome screen is open, and reused by the next games
+        self.window_pool = GameWindowPool()
+
         self.current_window = WelcomeScreen()
         self.connect_ws()
         self.current_window.show()
 
+        self.recover_game()
+
     def show_game_screen(self):
         players_name = []
 
@@ -33,16 +49,37 @@ class Main:
 
             players_name.append(player_name)
 
+        computer_players = [player_number
+                            for player_number, checkbox in enumerate(self.current_window.computer_checkboxes)
+                            if checkbox.isChecked()]
+
+        game_mode, board_size, num_players = self.get_selected_game()
+
+        go = self.window_pool.acquire(game_mode, board_size, num_players)
+        go.start_new_game(players_name, computer_players)
+
+        self.change_current_window(go)
+
+    def get_selected_game(self) -> tuple[GameMode, int, int]:
+        """
+        Returns the kind of game selected on the welcome screen.
+
+        :return: A tuple with the game mode, the board size and the number of players.
+        """
+
         board_size = int(self.current_window.board_size_cbox.currentText())
         game_mode = Settings.GAME_MODES[self.current_window.game_mode_selection.checkedId()]
 
-        if game_mode == GameMode.SPEED:
-            print("speed")
-            go = SpeedGo(players_name, board_size)
-        else:
-            go = Go(players_name, board_size)
+        return game_mode, board_size, len(self.current_window.name_input_fields)
 
-        self.change_current_window(go)
+    def schedule_warm_up(self):
+        """Builds the game window of the selected kind of game once the welcome screen is idle."""
+
+        QTimer.singleShot(Settings.GAME_WINDOW_WARM_UP_DELAY, self.warm_up_game_window)
+
+    def warm_up_game_window(self):
+        if isinstance(self.current_window, WelcomeScreen):
+            self.window_pool.warm_up(*self.get_selected_game())
 
     def show_welcome_screen(self):
 
@@ -63,36 +100,100 @@ class Main:
         self.connect_ws()
 
     def change_current_window(self, new_window):
-        self.current_window.hide()
-        self.current_window.close()
+        old_window = self.current_window
+
+        old_window.hide()
+        old_window.close()
         self.current_window = new_window
         self.current_window.show()
 
+        # the game window is kept to be reused by a later game
+        if isinstance(old_window, Go) and old_window is not new_window:
+            self.window_pool.store(old_window)
+
     def load_game(self):
-        file_name, _ = QFileDialog.getOpenFileName(self.current_window, "Open File", "", "Pickle File (*.pkl)")
+        file_name, _ = QFileDialog.getOpenFileName(self.current_window, "Open File", "",
+                                                   f"Go Save (*{SaveFormat.EXTENSION})")
 
         if not os.path.exists(file_name):
             return None
 
-        with open(file_name, "rb") as f:
-            # Load the object from the file
-            game_object = pickle.load(f)
+        try:
+            game_object = SaveFormat.load_game(file_name)
+        except (SaveFormat.SaveFormatError, UnicodeDecodeError) as error:
+            QMessageBox.warning(self.current_window, "Load Game", f"The game could not be loaded: {error}")
+            return None
+
+        self.open_game(game_object)
+
+    def open_game(self, game_object: dict):
+        """
+        Restores a game in a window of the pool and shows it.
+
+        :param game_object: The dictionary of the game, as built by Go.to_dictionary.
+        """
 
         game_mode = game_object["game_mode"]
 
         if not game_mode:
             return
 
+        window = self.window_pool.acquire(game_mode, game_object["board_size"], len(game_object["players_names"]))
+
         if game_mode == GameMode.SPEED:
-            new_game = SpeedGo.load_game_from_dictionary(game_object)
+            new_game = SpeedGo.load_game_from_dictionary(game_object, window)
         else:
-            new_game = Go.load_game_from_dictionary(game_object)
+            new_game = Go.load_game_from_dictionary(game_object, window)
 
         if new_game is None:
             return
 
         self.change_current_window(new_game)
 
+    def recover_game(self):
+        """Resumes the game left in the journal by a game that was interrupted, such as by a crash."""
+
+        if not Settings.JOURNAL:
+            return
+
+        try:
+            game_object = Journal.recover()
+        except (SaveFormat.SaveFormatError, UnicodeDecodeError, OSError) as error:
+            QMessageBox.warning(self.current_window, "Recover Game", f"The interrupted game could not be recovered: "
+                                                                     f"{error}")
+            Journal.discard()
+            return
+
+        if game_object is not None:
+            self.open_game(game_object)
+
+    def import_sgf(self):
+        """Opens the first game of an SGF file, replaying its moves so that they can be undone."""
+
+        file_name, _ = QFileDialog.getOpenFileName(self.current_window, "Import SGF", "",
+                                                   f"SGF File (*{Sgf.EXTENSION})")
+
+        if not os.path.exists(file_name):
+            return None
+
+        try:
+            with open(file_name, encoding="utf-8-sig", errors="replace") as file:
+                game = next(Sgf.iter_games(file), None)
+
+            if game is None:
+                raise Sgf.SgfError("The file holds no game")
+
+            # the game is checked before a window is taken from the pool, so that a rejected game does not hold one
+            game_object = Sgf.to_dictionary(game, GoEngine.get_initial_scores(game.num_players))
+        except (Sgf.SgfError, ValueError, TypeError) as error:
+            QMessageBox.warning(self.current_window, "Import SGF", f"The game could not be imported: {error}")
+            return None
+
+        window = self.window_pool.acquire(GameMode.NORMAL, game_object["board_size"], len(game_object["players_names"]))
+
+        self.change_current_window(Go.load_game_from_dictionary(game_object, window))
+        window.archive_game(game_object, file_name)
+
     def change_board_background(self):
         file_name, _ = QFileDialog.getOpenFileName(self.current_window, "Open File", "", "Image File (*.jpg)")
 
@@ -140,16 +241,64 @@ class Main:
         if result == QMessageBox.StandardButton.No:
             return
 
+        # the game is left on purpose, so its journal is deleted before exiting
+        if isinstance(self.current_window, Go):
+            self.current_window.suspend()
+
+        Journal.shutdown()
+
         exit(0)
 
     def connect_ws(self):
         self.current_window.button.clicked.connect(self.show_game_screen)
 
+        self.current_window.board_size_cbox.currentTextChanged.connect(self.schedule_warm_up)
+        self.current_window.player_spinbox.valueChanged.connect(self.schedule_warm_up)
+        self.current_window.game_mode_selection.idClicked.connect(self.schedule_warm_up)
+        self.schedule_warm_up()
+
+
+class StartupTimer(QObject):
+    """Reports the time from the start of the program to the first frame painted by a window, then quits."""
+
+    def __init__(self, window):
+        super().__init__()
+
+        self.window = window
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            self.window.removeEventFilter(self)
+
+            # the report waits for the end of the paint event
+            QTimer.singleShot(0, self.report)
+
+        return False
+
+    def report(self):
+        print(f"Time to first frame: {(time.perf_counter() - STARTED_AT) * 1000:.0f} ms")
+        QApplication.quit()
+
 
 def main():
-    app = QApplication([])
+    parser = argparse.ArgumentParser(description="A game of Go for 2 to 4 players.")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time taken to paint the first frame and exit")
+    args, qt_arguments = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_arguments)
     _main = Main()
-    sys.exit(app.exec())
+
+    if args.startup_time:
+        _startup_timer = StartupTimer(_main.current_window)
+
+    exit_code = app.exec()
+
+    # the journal of a game whose window was closed is deleted by the journal's thread, which is waited for
+    Journal.shutdown()
+
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
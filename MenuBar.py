@@ -1,6 +1,8 @@
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import QMenuBar
 
+from Resources import Resources
+
 
 class MenuBar(QMenuBar):
 
@@ -12,24 +14,29 @@ class MenuBar(QMenuBar):
         # GAME MENU
 
         # New Game Action
-        self.new_game_action = QAction(QIcon("./icons/save.png"), "New Game", main_window)
+        self.new_game_action = QAction(Resources.get_icon("icons/save.png"), "New Game", main_window)
         self.new_game_action.setShortcut("Ctrl+N")
         self.new_game_action.triggered.connect(self.Main.show_welcome_screen)
 
         # Load Game Action
-        self.load_game_action = QAction(QIcon("./icons/save.png"), "Load Game", main_window)
+        self.load_game_action = QAction(Resources.get_icon("icons/save.png"), "Load Game", main_window)
         self.load_game_action.setShortcut("Ctrl+O")
         self.load_game_action.triggered.connect(self.Main.load_game)
 
+        # Import SGF Action
+        self.import_sgf_action = QAction(Resources.get_icon("icons/save.png"), "Import SGF", main_window)
+        self.import_sgf_action.triggered.connect(self.Main.import_sgf)
+
         # Exit action
-        self.exit_action = QAction(QIcon("./icons/exit.png"), "Exit", main_window)
+        self.exit_action = QAction(Resources.get_icon("icons/exit.png"), "Exit", main_window)
         self.exit_action.setShortcut("Alt+X")
         self.exit_action.triggered.connect(self.Main.exit)
 
         # WINDOW MENU
 
         # Change Board Background
-        self.change_background_action = QAction(QIcon("./icons/exit.png"), "Change Board Background", main_window)
+        self.change_background_action = QAction(Resources.get_icon("icons/exit.png"), "Change Board Background",
+                                                main_window)
         self.change_background_action.triggered.connect(self.Main.change_board_background)
 
         # HELP MENU
@@ -54,6 +61,7 @@ class MenuBar(QMenuBar):
         # Add actions to menus
         game_menu.addAction(self.new_game_action)
         game_menu.addAction(self.load_game_action)
+        game_menu.addAction(self.import_sgf_action)
         game_menu.addAction(self.exit_action)
 
         window_menu.addAction(self.change_background_action)
@@ -72,24 +80,28 @@ class GameMenuBar(MenuBar):
         # GAME MENU
 
         # Reset Game Action
-        self.reset_game_action = QAction(QIcon("./icons/save.png"), "Reset Game", game_window)
+        self.reset_game_action = QAction(Resources.get_icon("icons/save.png"), "Reset Game", game_window)
         self.reset_game_action.setShortcut("Ctrl+R")
         self.reset_game_action.triggered.connect(game_window.reset_game)
 
         # Save Game Action
-        self.save_game_action = QAction(QIcon("./icons/save.png"), "Save Game", game_window)
+        self.save_game_action = QAction(Resources.get_icon("icons/save.png"), "Save Game", game_window)
         self.save_game_action.setShortcut("Ctrl+S")
         self.save_game_action.triggered.connect(game_window.save_game)
 
+        # Export SGF Action
+        self.export_sgf_action = QAction(Resources.get_icon("icons/save.png"), "Export SGF", game_window)
+        self.export_sgf_action.triggered.connect(game_window.export_sgf)
+
         # ACTIONS MENU
 
         # Undo Action
-        self.undo_action = QAction(QIcon("./icons/save.png"), "Undo Move", game_window)
+        self.undo_action = QAction(Resources.get_icon("icons/save.png"), "Undo Move", game_window)
         self.undo_action.setShortcut("Ctrl+Z")
         self.undo_action.triggered.connect(game_window.undo_move)
 
         # Redo Action
-        self.redo_action = QAction(QIcon("./icons/save.png"), "Redo Move", game_window)
+        self.redo_action = QAction(Resources.get_icon("icons/save.png"), "Redo Move", game_window)
         self.redo_action.setShortcut("Ctrl+Y")
         self.redo_action.triggered.connect(game_window.redo_move)
 
@@ -105,6 +117,8 @@ class GameMenuBar(MenuBar):
         game_menu.addAction(self.new_game_action)
         game_menu.addAction(self.save_game_action)
         game_menu.addAction(self.load_game_action)
+        game_menu.addAction(self.import_sgf_action)
+        game_menu.addAction(self.export_sgf_action)
         game_menu.addAction(self.exit_action)
 
         actions_menu.addAction(self.undo_action)
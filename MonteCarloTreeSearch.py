@@ -0,0 +1,236 @@
+import math
+import random
+import time
+from typing import Optional
+
+from GoEngine import GoEngine, EMPTY
+from Playout import Playout
+from Settings import Settings
+
+
+class SearchNode:
+    """
+    A node of the search tree, standing for the position reached after a move.
+
+    Attributes:
+        move: The flat index of the move that led to this node, or None for a pass (and for the root).
+        colour: The colour of the player who made that move.
+        colour_to_move: The colour of the player to move from this node.
+        position_hash: The Zobrist hash of the position of this node.
+        passes: The number of passes in a row that led to this node.
+        parent: The parent node, None for the root.
+        children: The nodes of the moves already expanded from this node.
+        untried_moves: The moves from this node that have not been expanded yet.
+        visits: The number of playouts that went through this node.
+        wins: The number of those playouts won by the player who made the move.
+    """
+
+    __slots__ = ("move", "colour", "colour_to_move", "position_hash", "passes", "parent", "children",
+                 "untried_moves", "visits", "wins")
+
+    def __init__(self, move: Optional[int], colour: int, colour_to_move: int, position_hash: int, passes: int,
+                 parent: Optional["SearchNode"], untried_moves: list[Optional[int]]):
+        self.move = move
+        self.colour = colour
+        self.colour_to_move = colour_to_move
+        self.position_hash = position_hash
+        self.passes = passes
+        self.parent = parent
+        self.children: list[SearchNode] = []
+        self.untried_moves = untried_moves
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> "SearchNode":
+        """
+        Picks the child with the highest upper confidence bound (UCT).
+
+        :param exploration: The weight given to the less visited children.
+        :return: The selected child node.
+        """
+
+        log_visits = math.log(self.visits)
+
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+class MonteCarloTreeSearch:
+    """
+    A computer player that chooses its moves with Monte Carlo Tree Search, using UCT to select the moves to explore.
+
+    Every iteration walks down the tree picking the child with the best upper confidence bound, expands one untried
+    move, finishes the game with a random Playout and credits the win to every node on the way back up, from the point
+    of view of the player who made each move, which works for any number of players. The search stops after the given
+    number of playouts or when the time limit runs out, and plays the most visited move.
+
+    The tree is kept between moves: when asked to search a position reached from the previous root by the moves played
+    since, the matching node becomes the new root and keeps its statistics.
+
+    If a PlayoutPool is given in pool, the searches are run on its worker processes instead, each keeping its own tree.
+
+    Attributes:
+        playouts: The maximum number of playouts per move.
+        time_limit: The maximum number of seconds spent per move.
+        exploration: The UCT exploration constant.
+        komi: The points given to each player before the game, indexed from 0, used to score the playouts.
+        root: The root node of the tree kept between moves.
+        pool: The PlayoutPool the searches are spread over, None to search in this process.
+    """
+
+    def __init__(self, playouts: int = Settings.COMPUTER_PLAYOUTS, time_limit: float = Settings.COMPUTER_TIME_LIMIT,
+                 exploration: float = Settings.COMPUTER_EXPLORATION, komi: Optional[list[float]] = None,
+                 seed: Optional[int] = None):
+        """
+        Initializes the search.
+
+        :param playouts: The maximum number of playouts per move.
+        :param time_limit: The maximum number of seconds spent per move.
+        :param exploration: The UCT exploration constant.
+        :param komi: The points given to each player before the game, indexed from 0.
+        :param seed: The seed of the random number generators, so that the same games can be reproduced.
+        """
+
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.komi = komi
+
+        self.random = random.Random(seed)
+        self.playout = Playout(seed)
+
+        self.root: Optional[SearchNode] = None
+        self.pool = None
+
+    def close(self):
+        """Stops the worker processes of the pool, if the search uses one."""
+
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def get_candidate_moves(self, engine: GoEngine, colour: int) -> list[Optional[int]]:
+        """
+        Returns the moves worth searching for the given colour: every legal move that does not fill one of its own
+        eyes, or a pass if there is none.
+
+        :param engine: The engine holding the position.
+        :param colour: The colour of the player to move.
+        :return: The list of flat indexes of the moves, or [None] to pass.
+        """
+
+        moves = [point for point, is_legal in enumerate(engine.get_legal_moves(colour))
+                 if is_legal and not Playout.is_eye(engine, point, colour)]
+
+        self.random.shuffle(moves)
+
+        return moves or [None]
+
+    def search(self, engine: GoEngine, colour: int, passes: int = 0) -> Optional[int]:
+        """
+        Searches the best move for the given colour from the engine's position.
+
+        :param engine: The engine holding the position, which is not modified.
+        :param colour: The colour of the player to move.
+        :param passes: The number of passes in a row that led to the position.
+        :return: The flat index of the chosen move, or None to pass.
+        """
+
+        if self.pool is not None:
+            return self.pool.search(engine, colour, passes, self, self.random.getrandbits(31))
+
+        root = self._find_root(engine, colour, passes)
+
+        deadline = time.perf_counter() + self.time_limit
+        iterations = 0
+
+        # at least one iteration is run so that the root always has a move to choose
+        while iterations == 0 or (iterations < self.playouts and time.perf_counter() < deadline):
+            self._iterate(root, engine.copy())
+            iterations += 1
+
+        best = max(root.children, key=lambda child: child.visits)
+        return best.move
+
+    def _find_root(self, engine: GoEngine, colour: int, passes: int) -> SearchNode:
+        """
+        Finds the node of the current position in the tree kept from the previous search, or starts a new tree.
+
+        Only the nodes up to one full round of turns below the previous root are looked at.
+
+        :param engine: The engine holding the position.
+        :param colour: The colour of the player to move.
+        :param passes: The number of passes in a row that led to the position.
+        :return: The root node of the search.
+        """
+
+        nodes = [self.root] if self.root is not None else []
+
+        for _ in range(engine.num_players + 1):
+            for node in nodes:
+                if node.position_hash == engine.hash and node.colour_to_move == colour:
+                    node.parent = None
+                    self.root = node
+                    return node
+
+            nodes = [child for node in nodes for child in node.children]
+
+        self.root = SearchNode(None, EMPTY, colour, engine.hash, passes, None,
+                               self.get_candidate_moves(engine, colour))
+        return self.root
+
+    def _iterate(self, root: SearchNode, engine: GoEngine):
+        """
+        Runs one selection, expansion, playout and backpropagation step of the search.
+
+        :param root: The root node of the search.
+        :param engine: A copy of the root position, which is played on.
+        """
+
+        node = root
+
+        # selection
+        while not node.untried_moves and node.children:
+            node = node.select_child(self.exploration)
+            self._play(engine, node.move, node.colour)
+
+        # expansion
+        if node.untried_moves and node.passes < engine.num_players:
+            move = node.untried_moves.pop()
+            colour = node.colour_to_move
+            self._play(engine, move, colour)
+
+            colour_to_move = engine.next_colour(colour)
+            child = SearchNode(move, colour, colour_to_move, engine.hash, node.passes + 1 if move is None else 0, node,
+                               self.get_candidate_moves(engine, colour_to_move))
+            node.children.append(child)
+            node = child
+
+        # simulation
+        if node.passes < engine.num_players:
+            result = self.playout.play(engine, node.colour_to_move, self.komi)
+            scores = result.scores
+        else:
+            scores = Playout.score(engine, self.komi)
+
+        winner = max(range(len(scores)), key=scores.__getitem__) + 1
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.colour == winner:
+                node.wins += 1
+            node = node.parent
+
+    @staticmethod
+    def _play(engine: GoEngine, move: Optional[int], colour: int):
+        """
+        Plays a move of the tree on the engine, doing nothing for a pass.
+
+        :param engine: The engine to play on.
+        :param move: The flat index of the move, or None for a pass.
+        :param colour: The colour of the player making the move.
+        """
+
+        if move is not None:
+            engine.play(move, colour)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import random
+import time
+from typing import NamedTuple, Optional
+
+from GoEngine import GoEngine, EMPTY
+from Settings import Settings, EngineBackend
+
+
+class PlayoutResult(NamedTuple):
+    """
+    The outcome of a single random playout.
+
+    scores: The area score (stones plus territory, plus komi if given) of every player, indexed from 0.
+    moves: The number of stones played during the playout.
+    """
+
+    scores: list[float]
+    moves: int
+
+    @property
+    def winner(self) -> int:
+        """The index of the player with the highest score."""
+
+        return max(range(len(self.scores)), key=self.scores.__getitem__)
+
+
+class PlayoutStats(NamedTuple):
+    """
+    The throughput measured by running playouts for a while.
+
+    board_size: The number of rows/columns in the board.
+    num_players: The number of players in the game.
+    playouts: The number of playouts completed.
+    moves: The total number of stones played over every playout.
+    seconds: The time taken by the playouts.
+    """
+
+    board_size: int
+    num_players: int
+    playouts: int
+    moves: int
+    seconds: float
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.seconds if self.seconds else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.seconds if self.seconds else 0.0
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the stats to a dictionary, including the per second rates.
+
+        :return: A dictionary representation of the stats.
+        """
+
+        stats = self._asdict()
+        stats["playouts_per_second"] = self.playouts_per_second
+        stats["moves_per_second"] = self.moves_per_second
+        return stats
+
+
+class Playout:
+    """
+    Plays random games to the end on a GoEngine.
+
+    Every turn a random valid move is chosen among the empty points, skipping the moves forbidden by the ko rule and the
+    moves that would fill one of the player's own eyes, so that groups with eyes stay alive and the board fills up. A
+    player with no such move passes, and the playout ends when every player passes in a row or after MAX_MOVES_FACTOR
+    times the number of points moves.
+
+    Attributes:
+        random: The random number generator used to pick the moves.
+    """
+
+    MAX_MOVES_FACTOR = 3
+
+    _diagonals_cache: dict[int, tuple[tuple[int, ...], ...]] = {}
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initializes the playout player.
+
+        :param seed: The seed of the random number generator, so that the same playouts can be reproduced.
+        """
+
+        self.random = random.Random(seed)
+
+    @classmethod
+    def get_diagonals_table(cls, board_size: int) -> tuple[tuple[int, ...], ...]:
+        """
+        Returns the table of diagonal points for a board of the given size, building it on first use.
+
+        :param board_size: The number of rows/columns in the board.
+        :return: A tuple with, for every point, the tuple of its diagonal points.
+        """
+
+        table = cls._diagonals_cache.get(board_size)
+
+        if table is None:
+            table = []
+
+            for row in range(board_size):
+                for column in range(board_size):
+                    table.append(tuple(row0 * board_size + column0
+                                       for row0, column0 in ((row + 1, column + 1), (row + 1, column - 1),
+                                                             (row - 1, column + 1), (row - 1, column - 1))
+                                       if 0 <= row0 < board_size and 0 <= column0 < board_size))
+
+            table = cls._diagonals_cache[board_size] = tuple(table)
+
+        return table
+
+    @classmethod
+    def is_eye(cls, engine: GoEngine, point: int, colour: int) -> bool:
+        """
+        Checks if the given empty point is an eye of the given colour.
+
+        The point is an eye if all its adjacent points are stones of that colour and no more than one of its diagonal
+        points (none on the edge of the board) belongs to another player, which would make it a false eye.
+
+        :param engine: The engine holding the position.
+        :param point: The flat index of an empty point.
+        :param colour: The colour of the player.
+        :return: True if the point is an eye of the player, False otherwise.
+        """
+
+        board = engine.board
+
+        for adjacent in engine.neighbours[point]:
+            if board[adjacent] != colour:
+                return False
+
+        diagonals = cls.get_diagonals_table(engine.board_size)[point]
+        enemy_diagonals = sum(1 for diagonal in diagonals if board[diagonal] not in (EMPTY, colour))
+
+        return enemy_diagonals < (2 if len(diagonals) == 4 else 1)
+
+    def choose_move(self, engine: GoEngine, colour: int) -> Optional[int]:
+        """
+        Picks a random legal move for the given colour that does not fill one of its own eyes.
+
+        The empty points are drawn at random without replacement until one of them passes the checks.
+
+        :param engine: The engine holding the position.
+        :param colour: The colour of the player making the move.
+        :return: The flat index of the chosen move, or None if the player should pass.
+        """
+
+        candidates = [point for point, point_colour in enumerate(engine.board) if point_colour == EMPTY]
+        randrange = self.random.randrange
+
+        while candidates:
+            index = randrange(len(candidates))
+            point = candidates[index]
+            candidates[index] = candidates[-1]
+            candidates.pop()
+
+            if (engine.is_move_valid(point, colour) and not self.is_eye(engine, point, colour)
+                    and not engine.is_ko(point, colour)):
+                return point
+
+        return None
+
+    def play(self, engine: GoEngine, colour: int, komi: Optional[list[float]] = None) -> PlayoutResult:
+        """
+        Plays a random game to the end on the given engine, which is modified in place.
+
+        :param engine: The engine holding the position to play from.
+        :param colour: The colour of the player to move first.
+        :param komi: The points given to each player before the game, indexed from 0.
+        :return: The PlayoutResult with the final scores.
+        """
+
+        max_moves = self.MAX_MOVES_FACTOR * len(engine.board)
+        passes = 0
+        moves = 0
+
+        while passes < engine.num_players and moves < max_moves:
+            point = self.choose_move(engine, colour)
+
+            if point is None:
+                passes += 1
+            else:
+                engine.play(point, colour)
+                passes = 0
+                moves += 1
+
+            colour = engine.next_colour(colour)
+
+        return PlayoutResult(self.score(engine, komi), moves)
+
+    @staticmethod
+    def score(engine: GoEngine, komi: Optional[list[float]] = None) -> list[float]:
+        """
+        Counts the area score of every player: the stones on the board plus the territory controlled.
+
+        :param engine: The engine holding the position.
+        :param komi: The points given to each player before the game, indexed from 0.
+        :return: The list of scores, indexed from 0.
+        """
+
+        scores = list(komi) if komi else [0.0] * engine.num_players
+
+        for colour in engine.board:
+            if colour != EMPTY:
+                scores[colour - 1] += 1
+
+        for colour, territory in engine.get_controlled_territories().items():
+            scores[colour - 1] += len(territory)
+
+        return scores
+
+
+def benchmark(board_size: int, num_players: int, seconds: float = 5.0, backend: EngineBackend = None,
+              seed: Optional[int] = None) -> PlayoutStats:
+    """
+    Runs playouts from an empty board for the given time and measures their throughput.
+
+    :param board_size: The number of rows/columns in the board.
+    :param num_players: The number of players in the game.
+    :param seconds: How long to keep starting new playouts for.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :param seed: The seed of the random number generator.
+    :return: The PlayoutStats measured.
+    """
+
+    root = GoEngine.create(board_size, num_players, backend=backend)
+    playout = Playout(seed)
+
+    playouts = moves = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while elapsed < seconds:
+        moves += playout.play(root.copy(), 1).moves
+        playouts += 1
+        elapsed = time.perf_counter() - start
+
+    return PlayoutStats(board_size, num_players, playouts, moves, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures how many random playouts per second the rules run.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[int(size) for size in Settings.BOARD_SIZES])
+    parser.add_argument("--players", type=int, nargs="+",
+                        default=list(range(Settings.MIN_NUMBER_OF_PLAYERS, Settings.MAX_NUMBER_OF_PLAYERS + 1)))
+    parser.add_argument("--seconds", type=float, default=5.0, help="time spent on every size and player count")
+    parser.add_argument("--backend", choices=[backend.name.lower() for backend in EngineBackend],
+                        default=Settings.ENGINE_BACKEND.name.lower())
+    parser.add_argument("--processes", type=int, default=1,
+                        help="number of worker processes running playouts, 0 for every core")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    backend = EngineBackend[args.backend.upper()]
+    results = []
+
+    for board_size in args.sizes:
+        for num_players in args.players:
+            if args.processes == 1:
+                stats = benchmark(board_size, num_players, args.seconds, backend, args.seed)
+            else:
+                from PlayoutPool import benchmark as pool_benchmark
+                stats = pool_benchmark(board_size, num_players, args.seconds, args.processes or None, backend,
+                                       args.seed or 0)
+            results.append(stats.to_dictionary())
+
+            if not args.json:
+                print(f"{board_size}x{board_size}, {num_players} players: {stats.playouts} playouts in "
+                      f"{stats.seconds:.2f}s ({stats.playouts_per_second:.1f} playouts/sec, "
+                      f"{stats.moves_per_second:.0f} moves/sec)")
+
+    if args.json:
+        print(json.dumps({"backend": args.backend, "processes": args.processes, "results": results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+from GoEngine import GoEngine
+from MonteCarloTreeSearch import MonteCarloTreeSearch
+from Playout import Playout, PlayoutStats
+from Settings import Settings, EngineBackend
+
+
+# the search kept by each worker process, so that its tree is reused between the moves it is asked about
+_worker_search: Optional[MonteCarloTreeSearch] = None
+
+
+def _load_root(memory_name: str, size: int, backend: EngineBackend) -> GoEngine:
+    """
+    Rebuilds the root position from the shared memory block written by the pool.
+
+    :param memory_name: The name of the shared memory block.
+    :param size: The number of bytes of the packed position.
+    :param backend: The EngineBackend to use.
+    :return: A new engine holding the root position.
+    """
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        return GoEngine.from_bytes(bytes(memory.buf[:size]), backend)
+    finally:
+        memory.close()
+
+
+def _run_playouts(memory_name: str, size: int, backend: EngineBackend, colour: int, seconds: float,
+                  seed: int) -> tuple[int, int]:
+    """
+    Runs playouts from the root position until the time is up, in a worker process.
+
+    :return: A tuple with the number of playouts and the number of moves played.
+    """
+
+    root = _load_root(memory_name, size, backend)
+    playout = Playout(seed)
+
+    playouts = moves = 0
+    deadline = time.perf_counter() + seconds
+
+    while playouts == 0 or time.perf_counter() < deadline:
+        moves += playout.play(root.copy(), colour).moves
+        playouts += 1
+
+    return playouts, moves
+
+
+def _run_search(memory_name: str, size: int, backend: EngineBackend, colour: int, passes: int, playouts: int,
+                time_limit: float, exploration: float, komi: Optional[list[float]],
+                seed: int) -> dict[Optional[int], tuple[int, float]]:
+    """
+    Runs a search from the root position in a worker process.
+
+    :return: A dictionary mapping every move of the root to its (visits, wins) statistics.
+    """
+
+    global _worker_search
+
+    if _worker_search is None:
+        _worker_search = MonteCarloTreeSearch(seed=seed)
+
+    _worker_search.playouts = playouts
+    _worker_search.time_limit = time_limit
+    _worker_search.exploration = exploration
+    _worker_search.komi = komi
+
+    _worker_search.search(_load_root(memory_name, size, backend), colour, passes)
+
+    return {child.move: (child.visits, child.wins) for child in _worker_search.root.children}
+
+
+class PlayoutPool:
+    """
+    Spreads playouts over several processes, to get around the global interpreter lock.
+
+    The root position is packed with GoEngine.to_bytes into a shared memory block that every worker reads, instead of
+    pickling the engine into every task. Searches are parallelised at the root: every worker grows its own tree from the
+    root position, and the visits of the root moves are added up to choose the move.
+
+    Attributes:
+        processes: The number of worker processes.
+        backend: The EngineBackend used by the workers.
+    """
+
+    def __init__(self, processes: Optional[int] = Settings.PLAYOUT_PROCESSES, backend: EngineBackend = None):
+        """
+        Starts the worker processes.
+
+        :param processes: The number of worker processes, every core of the machine if None.
+        :param backend: The EngineBackend used by the workers, Settings.ENGINE_BACKEND if not given.
+        """
+
+        self.processes = processes or os.cpu_count() or 1
+        self.backend = Settings.ENGINE_BACKEND if backend is None else backend
+
+        # the workers are spawned rather than forked, so that they never inherit the state of a running Qt application
+        self._pool = multiprocessing.get_context("spawn").Pool(self.processes)
+
+    def close(self):
+        """Stops the worker processes."""
+
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _share(self, engine: GoEngine) -> tuple[shared_memory.SharedMemory, int]:
+        """
+        Writes the packed position of the engine into a new shared memory block.
+
+        :param engine: The engine holding the root position.
+        :return: A tuple with the shared memory block, which the caller must unlink, and the size of the position.
+        """
+
+        data = engine.to_bytes()
+
+        memory = shared_memory.SharedMemory(create=True, size=len(data))
+        memory.buf[:len(data)] = data
+
+        return memory, len(data)
+
+    def run_playouts(self, engine: GoEngine, colour: int, seconds: float, seed: int = 0) -> PlayoutStats:
+        """
+        Runs playouts from the engine's position on every worker for the given time.
+
+        :param engine: The engine holding the root position.
+        :param colour: The colour of the player to move first.
+        :param seconds: How long every worker keeps starting new playouts for.
+        :param seed: The seed of the first worker, the next ones using the following numbers.
+        :return: The PlayoutStats added up over every worker.
+        """
+
+        memory, size = self._share(engine)
+
+        try:
+            start = time.perf_counter()
+            results = self._pool.starmap(_run_playouts, [(memory.name, size, self.backend, colour, seconds, seed + i)
+                                                         for i in range(self.processes)])
+            elapsed = time.perf_counter() - start
+        finally:
+            memory.close()
+            memory.unlink()
+
+        return PlayoutStats(engine.board_size, engine.num_players, sum(playouts for playouts, _ in results),
+                            sum(moves for _, moves in results), elapsed)
+
+    def search(self, engine: GoEngine, colour: int, passes: int, search: MonteCarloTreeSearch,
+               seed: int = 0) -> Optional[int]:
+        """
+        Searches the best move from the engine's position on every worker, with the settings of the given search, and
+        picks the move with the most visits over every worker.
+
+        :param engine: The engine holding the root position.
+        :param colour: The colour of the player to move.
+        :param passes: The number of passes in a row that led to the position.
+        :param search: The MonteCarloTreeSearch whose budget and parameters are used; the playouts budget is split
+        between the workers.
+        :param seed: The seed of the first worker, the next ones using the following numbers.
+        :return: The flat index of the chosen move, or None to pass.
+        """
+
+        memory, size = self._share(engine)
+        playouts = max(search.playouts // self.processes, 1)
+
+        try:
+            results = self._pool.starmap(_run_search, [(memory.name, size, self.backend, colour, passes, playouts,
+                                                        search.time_limit, search.exploration, search.komi, seed + i)
+                                                       for i in range(self.processes)])
+        finally:
+            memory.close()
+            memory.unlink()
+
+        visits = {}
+        for result in results:
+            for move, (move_visits, _) in result.items():
+                visits[move] = visits.get(move, 0) + move_visits
+
+        return max(visits, key=visits.__getitem__)
+
+
+def benchmark(board_size: int, num_players: int, seconds: float = 5.0, processes: Optional[int] = None,
+              backend: EngineBackend = None, seed: int = 0) -> PlayoutStats:
+    """
+    Runs playouts from an empty board on every worker of a new pool for the given time and measures their throughput.
+
+    :param board_size: The number of rows/columns in the board.
+    :param num_players: The number of players in the game.
+    :param seconds: How long to keep starting new playouts for.
+    :param processes: The number of worker processes, every core of the machine if None.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :param seed: The seed of the first worker.
+    :return: The PlayoutStats measured.
+    """
+
+    with PlayoutPool(processes, backend) as pool:
+        # a short first round gets every worker started before the measured one
+        pool.run_playouts(GoEngine.create(board_size, num_players, backend=backend), 1, 0.0, seed)
+
+        return pool.run_playouts(GoEngine.create(board_size, num_players, backend=backend), 1, seconds, seed)
@@ -0,0 +1,186 @@
+import os
+import sys
+import zipfile
+from typing import Optional
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QIcon
+
+from Settings import Settings
+
+BUNDLE_PATH = os.path.join(Settings.BASE_DIRECTORY, "resources.bundle")
+RESOURCE_DIRECTORIES = ("icons",)
+
+
+class Resources:
+    """
+    Loads the images of the game once, from the resource bundle if it was built or from the icons directory otherwise.
+
+    The bundle is a single uncompressed zip file holding the whole icons directory, built with `python Resources.py`.
+    It is read into memory with one file access on first use, instead of opening every image file on its own. Resource
+    names are paths relative to the game's directory, such as "icons/pokeball.png"; a leading "./" is ignored, and
+    absolute paths (such as a board background picked by the user) are read from the disk.
+
+    Every pixmap and icon is decoded once and then shared.
+    """
+
+    _bundle: Optional[dict[str, bytes]] = None
+    _pixmaps: dict[str, QPixmap] = {}
+    _icons: dict[str, QIcon] = {}
+    _covers: dict[tuple[str, int, int], QPixmap] = {}
+
+    @staticmethod
+    def get_name(path: str) -> str:
+        """
+        Normalises a resource path into the name it has in the bundle.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        :return: The normalised name, or the normalised absolute path.
+        """
+
+        if os.path.isabs(path):
+            return os.path.normpath(path)
+
+        return os.path.normpath(path).replace(os.sep, "/")
+
+    @classmethod
+    def get_path(cls, path: str) -> str:
+        """
+        Returns the absolute path of a resource file on the disk.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        :return: The absolute path.
+        """
+
+        return os.path.join(Settings.BASE_DIRECTORY, cls.get_name(path))
+
+    @classmethod
+    def get_bundle(cls) -> dict[str, bytes]:
+        """
+        Returns the content of the resource bundle, reading it on first use.
+
+        :return: A dictionary mapping every resource name to its bytes, empty if the bundle was not built.
+        """
+
+        if cls._bundle is None:
+            cls._bundle = {}
+
+            if os.path.exists(BUNDLE_PATH):
+                with zipfile.ZipFile(BUNDLE_PATH) as bundle:
+                    cls._bundle = {name: bundle.read(name) for name in bundle.namelist()}
+
+        return cls._bundle
+
+    @classmethod
+    def get_pixmap(cls, path: str) -> QPixmap:
+        """
+        Returns the image at the given path, loading it on first use.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        :return: The shared QPixmap, null if the image does not exist.
+        """
+
+        name = cls.get_name(path)
+        pixmap = cls._pixmaps.get(name)
+
+        if pixmap is None:
+            pixmap = QPixmap()
+            data = None if os.path.isabs(name) else cls.get_bundle().get(name)
+
+            if data is not None:
+                pixmap.loadFromData(data)
+            else:
+                pixmap.load(cls.get_path(name))
+
+            cls._pixmaps[name] = pixmap
+
+        return pixmap
+
+    @classmethod
+    def get_icon(cls, path: str) -> QIcon:
+        """
+        Returns an icon of the image at the given path, loading it on first use.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        :return: The shared QIcon, null if the image does not exist.
+        """
+
+        name = cls.get_name(path)
+        icon = cls._icons.get(name)
+
+        if icon is None:
+            icon = cls._icons[name] = QIcon(cls.get_pixmap(name))
+
+        return icon
+
+    @classmethod
+    def get_cover(cls, path: str, width: int, height: int) -> QPixmap:
+        """
+        Returns the image at the given path scaled to cover a widget of the given size, keeping its aspect ratio, and
+        cropped to it from the bottom right corner, as the window backgrounds are drawn.
+
+        Only the last size asked for every image is cached.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        :param width: The width of the widget.
+        :param height: The height of the widget.
+        :return: The QPixmap of the given size.
+        """
+
+        name = cls.get_name(path)
+        key = (name, width, height)
+        cover = cls._covers.get(key)
+
+        if cover is None:
+            scaled = cls.get_pixmap(name).scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                                 Qt.TransformationMode.SmoothTransformation)
+            cover = scaled.copy(scaled.width() - width, scaled.height() - height, width, height)
+
+            for old_key in [old_key for old_key in cls._covers if old_key[0] == name]:
+                del cls._covers[old_key]
+
+            cls._covers[key] = cover
+
+        return cover
+
+    @classmethod
+    def forget(cls, path: str):
+        """
+        Drops the cached images of the given path, so that a changed file is read again.
+
+        :param path: The path of the resource, relative to the game's directory or absolute.
+        """
+
+        name = cls.get_name(path)
+
+        cls._pixmaps.pop(name, None)
+        cls._icons.pop(name, None)
+
+        for old_key in [old_key for old_key in cls._covers if old_key[0] == name]:
+            del cls._covers[old_key]
+
+
+def build_bundle(bundle_path: str = BUNDLE_PATH) -> int:
+    """
+    Writes every file of the resource directories into the resource bundle.
+
+    :param bundle_path: The path of the bundle to write.
+    :return: The number of files bundled.
+    """
+
+    count = 0
+
+    # the images are already compressed, so they are stored as they are to be read back without inflating them
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_STORED) as bundle:
+        for directory in RESOURCE_DIRECTORIES:
+            for root, _, files in os.walk(os.path.join(Settings.BASE_DIRECTORY, directory)):
+                for file_name in sorted(files):
+                    path = os.path.join(root, file_name)
+                    bundle.write(path, os.path.relpath(path, Settings.BASE_DIRECTORY).replace(os.sep, "/"))
+                    count += 1
+
+    return count
+
+
+if __name__ == '__main__':
+    print(f"Bundled {build_bundle(*sys.argv[1:2])} files into {sys.argv[1] if len(sys.argv) > 1 else BUNDLE_PATH}")
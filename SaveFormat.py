@@ -0,0 +1,348 @@
+import struct
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+
+from GoEngine import Move
+from Settings import Settings, GameMode
+
+MAGIC = b"PYGO"
+VERSION = 1
+EXTENSION = ".pygo"
+
+BITS_PER_POINT = 3
+
+_PREAMBLE = struct.Struct("<4sB")
+_HEADER = struct.Struct("<BBBBBBBI")
+_NAME_LENGTH = struct.Struct("<H")
+_SCORE = struct.Struct("<d")
+_CLOCK = struct.Struct("<I")
+_MOVE = struct.Struct("<HBH")
+_CAPTURED = struct.Struct("<HB")
+
+_GAME_MODES = (GameMode.NORMAL, GameMode.SPEED)
+
+_GAME_OVER = 1
+
+
+class SaveFormatError(Exception):
+    """Raised when a file is not a saved game or is damaged."""
+
+
+class SaveHeader(NamedTuple):
+    """
+    Everything a saved game holds apart from its board and moves, which can be read without reading the rest.
+
+    version: The version of the format the file was written with.
+    game_mode: The GameMode of the game.
+    game_over: True if the game was finished.
+    board_size: The number of rows/columns in the board.
+    current_player: The index of the player to move.
+    pass_turn_counter: The number of passes in a row before the current turn.
+    computer_players: The indexes of the players played by the computer.
+    move_count: The number of moves in the move list.
+    players_names: The names of the players.
+    players_scores: The scores of the players.
+    remaining_time: The seconds left on every player's clock, for Speed Go games, None otherwise.
+    """
+
+    version: int
+    game_mode: GameMode
+    game_over: bool
+    board_size: int
+    current_player: int
+    pass_turn_counter: int
+    computer_players: list[int]
+    move_count: int
+    players_names: list[str]
+    players_scores: list[float]
+    remaining_time: list[int] | None
+
+    @property
+    def num_players(self) -> int:
+        return len(self.players_names)
+
+
+def _read_exactly(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+
+    if len(data) != size:
+        raise SaveFormatError("The saved game ends unexpectedly")
+
+    return data
+
+
+def pack_board(board_array: list[list[int]]) -> bytes:
+    """
+    Packs a board state into BITS_PER_POINT bits per point, row by row.
+
+    :param board_array: A 2D list with the player number (0 for empty) of every intersection.
+    :return: The packed bytes.
+    """
+
+    bits = 0
+    shift = 0
+
+    for board_row in board_array:
+        for value in board_row:
+            bits |= value << shift
+            shift += BITS_PER_POINT
+
+    return bits.to_bytes((shift + 7) // 8, "little")
+
+
+def unpack_board(data: bytes, board_size: int) -> list[list[int]]:
+    """
+    Unpacks a board state packed by pack_board.
+
+    :param data: The packed bytes.
+    :param board_size: The number of rows/columns in the board.
+    :return: A 2D list with the player number (0 for empty) of every intersection.
+    """
+
+    bits = int.from_bytes(data, "little")
+    mask = (1 << BITS_PER_POINT) - 1
+
+    board_array = []
+
+    for _ in range(board_size):
+        board_row = []
+        for _ in range(board_size):
+            board_row.append(bits & mask)
+            bits >>= BITS_PER_POINT
+        board_array.append(board_row)
+
+    return board_array
+
+
+class SaveWriter:
+    """
+    Writes a saved game to a binary file, section by section: the header, then the board, then the moves.
+
+    Layout (little endian): the magic bytes and the version, the fixed size header fields, every player's name (length
+    prefixed UTF-8), score (double) and, for Speed Go, clock (seconds); then the board at BITS_PER_POINT bits per point;
+    then every move as its point, colour and captured stones.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+    def write_header(self, header: SaveHeader):
+        write = self.file.write
+
+        flags = _GAME_OVER if header.game_over else 0
+        computer_mask = sum(1 << player for player in header.computer_players)
+
+        write(_PREAMBLE.pack(MAGIC, VERSION))
+        write(_HEADER.pack(_GAME_MODES.index(header.game_mode), flags, header.board_size, header.num_players,
+                           header.current_player, header.pass_turn_counter, computer_mask, header.move_count))
+
+        for name in header.players_names:
+            encoded = name.encode("utf-8")
+            write(_NAME_LENGTH.pack(len(encoded)))
+            write(encoded)
+
+        for score in header.players_scores:
+            write(_SCORE.pack(score))
+
+        if header.game_mode == GameMode.SPEED:
+            for remaining_time in header.remaining_time:
+                write(_CLOCK.pack(remaining_time))
+
+    def write_board(self, board_array: list[list[int]]):
+        self.file.write(pack_board(board_array))
+
+    def write_moves(self, moves):
+        write = self.file.write
+
+        for move in moves:
+            write(_MOVE.pack(move.point, move.colour, len(move.captured)))
+
+            for point, colour in move.captured:
+                write(_CAPTURED.pack(point, colour))
+
+
+class SaveReader:
+    """
+    Reads a saved game from a binary file, section by section, so that a caller only interested in the header (such as
+    a file browser) stops reading after it.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.header = None
+
+    def read_header(self) -> SaveHeader:
+        magic, version = _PREAMBLE.unpack(_read_exactly(self.file, _PREAMBLE.size))
+
+        if magic != MAGIC:
+            raise SaveFormatError("The file is not a saved game")
+
+        if version not in _HEADER_READERS:
+            raise SaveFormatError(f"The saved game was written by a newer version of the game (format {version})")
+
+        self.header = _HEADER_READERS[version](self.file, version)
+
+        return self.header
+
+    def read_board(self) -> list[list[int]]:
+        board_size = self.header.board_size
+        data = _read_exactly(self.file, (board_size * board_size * BITS_PER_POINT + 7) // 8)
+
+        board_array = unpack_board(data, board_size)
+
+        if any(value > self.header.num_players for board_row in board_array for value in board_row):
+            raise SaveFormatError("The saved board holds a piece of an unknown player")
+
+        return board_array
+
+    def iter_moves(self) -> Iterator[Move]:
+        num_points = self.header.board_size * self.header.board_size
+        num_players = self.header.num_players
+
+        for _ in range(self.header.move_count):
+            point, colour, captured_count = _MOVE.unpack(_read_exactly(self.file, _MOVE.size))
+
+            captured = tuple(_CAPTURED.unpack(_read_exactly(self.file, _CAPTURED.size)) for _ in range(captured_count))
+
+            if point >= num_points or any(captured_point >= num_points for captured_point, _ in captured):
+                raise SaveFormatError("A saved move is off the board")
+
+            if not 1 <= colour <= num_players or any(not 1 <= captured_colour <= num_players
+                                                     for _, captured_colour in captured):
+                raise SaveFormatError("A saved move belongs to an unknown player")
+
+            yield Move(point, colour, captured)
+
+
+def _read_header_v1(file: BinaryIO, version: int) -> SaveHeader:
+    game_mode, flags, board_size, num_players, current_player, pass_turn_counter, computer_mask, move_count = \
+        _HEADER.unpack(_read_exactly(file, _HEADER.size))
+
+    if game_mode >= len(_GAME_MODES):
+        raise SaveFormatError("The saved game has an unknown game mode")
+
+    game_mode = _GAME_MODES[game_mode]
+
+    if not Settings.MIN_NUMBER_OF_PLAYERS <= num_players <= Settings.MAX_NUMBER_OF_PLAYERS:
+        raise SaveFormatError(f"Games of {num_players} players are not supported")
+
+    if not Settings.MIN_BOARD_SIZE <= board_size <= Settings.MAX_BOARD_SIZE:
+        raise SaveFormatError(f"Boards of {board_size}x{board_size} are not supported")
+
+    if current_player >= num_players:
+        raise SaveFormatError("The saved game is at the turn of an unknown player")
+
+    # every player passing in a row finishes the game
+    if pass_turn_counter > num_players or (pass_turn_counter == num_players and not flags & _GAME_OVER):
+        raise SaveFormatError("The saved game has more passes in a row than players")
+
+    players_names = []
+    for _ in range(num_players):
+        (length,) = _NAME_LENGTH.unpack(_read_exactly(file, _NAME_LENGTH.size))
+        players_names.append(_read_exactly(file, length).decode("utf-8"))
+
+    players_scores = [_SCORE.unpack(_read_exactly(file, _SCORE.size))[0] for _ in range(num_players)]
+
+    remaining_time = None
+    if game_mode == GameMode.SPEED:
+        remaining_time = [_CLOCK.unpack(_read_exactly(file, _CLOCK.size))[0] for _ in range(num_players)]
+
+    return SaveHeader(version, game_mode, bool(flags & _GAME_OVER), board_size, current_player, pass_turn_counter,
+                      [player for player in range(num_players) if computer_mask >> player & 1], move_count,
+                      players_names, players_scores, remaining_time)
+
+
+# the header reader of every version of the format that can be read; a new version adds its reader here, and a
+# migration below turning the games of the previous version into its own
+_HEADER_READERS: dict[int, Callable[[BinaryIO, int], SaveHeader]] = {
+    1: _read_header_v1,
+}
+
+# functions upgrading the game dictionary read from a file of the version they are keyed by to the next version
+MIGRATIONS: dict[int, Callable[[dict], dict]] = {}
+
+
+def migrate(game: dict, version: int) -> dict:
+    """
+    Upgrades a game dictionary read from a file of the given version to the current version.
+
+    :param game: The game dictionary.
+    :param version: The version of the format the game was read from.
+    :return: The upgraded game dictionary.
+    """
+
+    while version < VERSION:
+        game = MIGRATIONS[version](game)
+        version += 1
+
+    return game
+
+
+def write_game(file: BinaryIO, game: dict):
+    """
+    Writes a game dictionary, as built by Go.to_dictionary, to a binary file.
+
+    :param file: The file opened for binary writing.
+    :param game: The game dictionary.
+    """
+
+    moves = game.get("moves", [])
+
+    writer = SaveWriter(file)
+    writer.write_header(SaveHeader(VERSION, game["game_mode"], game["game_over"], game["board_size"],
+                                   game["current_player"], game["pass_turn_counter"],
+                                   game.get("computer_players", []), len(moves), game["players_names"],
+                                   game["players_scores"], game.get("remaining_time")))
+    writer.write_board(game["board_array"])
+    writer.write_moves(moves)
+
+
+def read_game(file: BinaryIO) -> dict:
+    """
+    Reads a game written by write_game, without executing anything from the file.
+
+    :param file: The file opened for binary reading.
+    :return: The game dictionary, in the format of Go.to_dictionary.
+    """
+
+    reader = SaveReader(file)
+    header = reader.read_header()
+
+    game = {
+        "game_mode": header.game_mode,
+        "game_over": header.game_over,
+        "players_names": header.players_names,
+        "players_scores": header.players_scores,
+        "current_player": header.current_player,
+        "pass_turn_counter": header.pass_turn_counter,
+        "board_size": header.board_size,
+        "board_array": reader.read_board(),
+        "computer_players": header.computer_players,
+        "moves": list(reader.iter_moves()),
+    }
+
+    if header.remaining_time is not None:
+        game["remaining_time"] = header.remaining_time
+
+    return migrate(game, header.version)
+
+
+def save_game(path: str, game: dict):
+    with open(path, "wb") as file:
+        write_game(file, game)
+
+
+def load_game(path: str) -> dict:
+    with open(path, "rb") as file:
+        return read_game(file)
+
+
+def read_header(path: str) -> SaveHeader:
+    """
+    Reads only the header of a saved game, such as to list the players and board size of many files quickly.
+
+    :param path: The path of the saved game.
+    :return: The SaveHeader of the game.
+    """
+
+    with open(path, "rb") as file:
+        return SaveReader(file).read_header()
@@ -1,7 +1,9 @@
-from PyQt6.QtGui import QPixmap, QPainter, QIcon, QFont
+from PyQt6.QtGui import QPainter, QFont, QPen, QColor
 from PyQt6.QtWidgets import QVBoxLayout, QLabel, QWidget, QHBoxLayout, QPushButton, QGroupBox
-from PyQt6.QtCore import QPoint
+from PyQt6.QtCore import QTimer, Qt
+from Resources import Resources
 from Settings import Settings
+from SpriteCache import SpriteCache
 
 
 class ScoreBoard(QWidget):
@@ -10,10 +12,18 @@ class ScoreBoard(QWidget):
     def __init__(self, go, players_names):
         super().__init__(go)
 
-        self.background = QPixmap("./icons/sb_background.png")
+        # the original background, and its copy scaled to the current size
+        self.background = Resources.get_pixmap(Settings.SCORE_BOARD_BACKGROUND)
+        self.scaled_background = None
 
         self.number_of_players = len(players_names)
 
+        # the player whose box is marked as playing, None once the game is over
+        self.active_player = 0
+
+        # the labels whose text changed since the last flush, updated together on the next event-loop iteration
+        self.pending_labels: dict[QLabel, str] = {}
+
         self.players_boxes = [PlayerBox(self, i, name) for i, name in enumerate(players_names)]
         self.players_boxes_layout = QVBoxLayout()
         [self.players_boxes_layout.addWidget(widget) for widget in self.players_boxes]
@@ -78,29 +88,68 @@ class ScoreBoard(QWidget):
 
     def reset(self):
         [player_box.reset() for player_box in self.players_boxes]
+
+        # puts the boxes back in the players' order, display_winner having sorted them by score
+        [self.players_boxes_layout.removeWidget(player_box) for player_box in self.players_boxes]
+        [self.players_boxes_layout.addWidget(player_box) for player_box in self.players_boxes]
+
         self.set_turn_player(0)
 
+    def set_players_names(self, players_names: list[str]):
+        """changes the names shown in the player boxes, when the window is reused for a new game"""
+
+        for player_box, name in zip(self.players_boxes, players_names):
+            player_box.player_name_label.setText(name)
+
     def next_turn(self):
-        last_turns_player = self.players_boxes_layout.itemAt(0).widget()
-        last_turns_player.setStyleSheet('')
-        self.players_boxes_layout.removeWidget(last_turns_player)
-        self.players_boxes_layout.addWidget(last_turns_player)
+        """marks the next player as the current player"""
+
+        self.set_turn_player((self.active_player + 1) % self.number_of_players)
+
+    def set_turn_player(self, player_number):
+        """
+        Changes the current player, moving the painted marker from the previous player's box to the new one, without
+        changing the layout or any stylesheet.
 
-        self.players_boxes_layout.itemAt(0).widget().setStyleSheet(Settings.CURRENT_PLAYER_STYLESHEET)
+        :param player_number: The index of the current player, or None to mark no player.
+        """
 
-    def set_turn_player(self, player_number: int):
-        """changes current player"""
-        self.players_boxes_layout.itemAt(0).widget().setStyleSheet("")
+        if self.active_player is not None:
+            self.players_boxes[self.active_player].set_active(False)
 
-        [self.players_boxes_layout.removeWidget(player_box) for player_box in self.players_boxes_layout.children()]
+        self.active_player = player_number
 
-        new_player_order = self.players_boxes[player_number:] + self.players_boxes[:player_number]
-        [self.players_boxes_layout.addWidget(player_box) for player_box in new_player_order]
+        if player_number is not None:
+            self.players_boxes[player_number].set_active(True)
 
-        new_player_order[0].setStyleSheet(Settings.CURRENT_PLAYER_STYLESHEET)
+    def set_label_text(self, label: QLabel, text: str):
+        """
+        Changes the text of a label on the next event-loop iteration, together with every other label changed until
+        then, so that several updates in a row cost a single repaint and unchanged texts cost none.
+
+        :param label: The label to change.
+        :param text: The new text of the label.
+        """
+
+        if not self.pending_labels:
+            QTimer.singleShot(0, self.flush_labels)
+
+        self.pending_labels[label] = text
+
+    def flush_labels(self):
+        """Applies the label texts changed since the last flush."""
+
+        pending_labels, self.pending_labels = self.pending_labels, {}
+
+        for label, text in pending_labels.items():
+            if label.text() != text:
+                label.setText(text)
 
     def display_winner(self, final_score: list[float]):
 
+        self.set_turn_player(None)
+        self.flush_labels()
+
         rank = list()
 
         for player, score in zip(self.players_boxes, final_score):
@@ -135,9 +184,12 @@ class ScoreBoard(QWidget):
 
         painter = QPainter(self)
         # painter.setOpacity(0.5)
-        # Draws the board background
-        self.background = self.background.scaled(self.width(), self.height())
-        painter.drawPixmap(QPoint(), self.background)
+        # Draws the board background, scaling it again only if the size of the score board changed
+        if self.scaled_background is None or self.scaled_background.size() != self.size():
+            self.scaled_background = self.background.scaled(self.width(), self.height())
+
+        area = event.rect()
+        painter.drawPixmap(area, self.scaled_background, area)
 
     def update_player_capture(self, player_id: int, captured_pieces_total: float):
         self.players_boxes[player_id].set_captured_pieces_label(captured_pieces_total)
@@ -157,6 +209,7 @@ class PlayerBox(QGroupBox):
         super().__init__(score_board)
 
         self.score_board = score_board
+        self.is_active = False
 
         self.player_name_label = QLabel(player_name)
         self.player_name_label.setFont(QFont("serif", 15))
@@ -164,8 +217,8 @@ class PlayerBox(QGroupBox):
         self.captured_pieces_label = QLabel("Captured Pieces: 0")
         self.timer_label = QLabel("Time: --")
         self.player_icon = QLabel()
-        self.player_icon.setPixmap(QIcon(Settings.PIECE_ICONS_PATHS[player_number + 1]).pixmap(64, 64))
-        
+        self.player_icon.setPixmap(SpriteCache.get_sprite(player_number + 1, 64))
+
         self.init_ui()
 
     def init_ui(self):
@@ -183,20 +236,47 @@ class PlayerBox(QGroupBox):
 
         main_layout.addLayout(info_layout)
 
+    def set_active(self, is_active: bool):
+        """
+        Marks this box as the current player's, or removes the mark.
+
+        :param is_active: True if this box's player is the current player.
+        """
+
+        if is_active != self.is_active:
+            self.is_active = is_active
+            self.update()
+
     def set_captured_pieces_label(self, captured_pieces: float):
-        self.captured_pieces_label.setText("Captured Pieces: " + str(captured_pieces))
+        self.score_board.set_label_text(self.captured_pieces_label, "Captured Pieces: " + str(captured_pieces))
 
     def set_timer_label(self, time: int):
         if time == 0:
-            self.timer_label.setText("Time: --")
+            self.score_board.set_label_text(self.timer_label, "Time: --")
             return
 
-        self.timer_label.setText("Time: " + str(time))
+        self.score_board.set_label_text(self.timer_label, "Time: " + str(time))
 
     def reset(self):
         self.set_captured_pieces_label(0)
         self.set_timer_label(0)
         self.setStyleSheet("")
 
+    # EVENTS ====================================================
+
+    def paintEvent(self, event):
+        """paints the box, and the marker of the current player over it if it is the current player's box"""
+
+        super().paintEvent(event)
+
+        if not self.is_active:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor(Settings.CURRENT_PLAYER_MARKER_COLOR), 2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 5, 5)
+
     def resizeEvent(self, event) -> None:
         self.setMaximumHeight(int(self.parent().height() * 0.30))
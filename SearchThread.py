@@ -0,0 +1,87 @@
+import traceback
+from typing import Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from GoEngine import GoEngine
+from MonteCarloTreeSearch import MonteCarloTreeSearch
+
+
+class SearchThread(QThread):
+    """
+    Runs the search of a computer player's move off the GUI thread, so that the window keeps repainting and the clocks
+    keep running while the computer thinks.
+
+    The search runs on a copy of the engine, and the chosen move is delivered through move_found, which is queued to
+    the thread of the window that connected it. The position the search started from is kept, so that the window can
+    tell if the game moved on (an undo, a pass or a reset) before the move arrived.
+
+    Running threads are kept in a class level set until they finish, so that a thread is never destroyed while running,
+    even if its window is deleted. A search that is no longer wanted is abandoned rather than closed, and the thread
+    closes it (along with its worker processes) once it finishes.
+
+    Attributes:
+        search: The MonteCarloTreeSearch choosing the move, which must not be used by anything else until the thread
+            finishes.
+        engine: The copy of the engine holding the position searched.
+        colour: The colour of the player to move.
+        passes: The number of passes in a row that led to the position.
+        is_abandoned: True if the search is closed once the thread finishes.
+    """
+
+    # emitted with the thread and the flat index of the chosen move, or None to pass
+    move_found = pyqtSignal(object, object)
+
+    _running: set["SearchThread"] = set()
+
+    def __init__(self, search: MonteCarloTreeSearch, engine: GoEngine, colour: int, passes: int):
+        """
+        Prepares the search of the move of the given colour from the engine's position.
+
+        :param search: The MonteCarloTreeSearch choosing the move.
+        :param engine: The engine holding the position, which is copied.
+        :param colour: The colour of the player to move.
+        :param passes: The number of passes in a row that led to the position.
+        """
+
+        super().__init__()
+
+        self.search = search
+        self.engine = engine.copy()
+        self.colour = colour
+        self.passes = passes
+        self.is_abandoned = False
+
+        self.finished.connect(self._forget)
+
+    @property
+    def position_hash(self) -> int:
+        return self.engine.hash
+
+    def abandon(self):
+        """Closes the search once the thread finishes, as its window no longer uses it."""
+
+        self.is_abandoned = True
+
+    def start(self):
+        SearchThread._running.add(self)
+        super().start()
+
+    def run(self):
+        point: Optional[int] = None
+
+        try:
+            point = self.search.search(self.engine, self.colour, self.passes)
+        except Exception:
+            # a failed search passes, rather than leaving the game waiting for a move that never comes
+            traceback.print_exc()
+
+        self.move_found.emit(self, point)
+
+    def _forget(self):
+        SearchThread._running.discard(self)
+
+        if self.is_abandoned:
+            self.search.close()
+
+        self.deleteLater()
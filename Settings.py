@@ -1,3 +1,4 @@
+import os
 from enum import Enum
 
 
@@ -6,18 +7,70 @@ class GameMode(Enum):
     SPEED = "Speed Go"
 
 
+class KoRule(Enum):
+    SIMPLE = "Simple Ko"
+    POSITIONAL_SUPERKO = "Positional Superko"
+    SITUATIONAL_SUPERKO = "Situational Superko"
+
+
+class EngineBackend(Enum):
+    ARRAY = "Array"
+    BITBOARD = "Bitboard"
+
+
 class Settings:
 
     GAME_MODES = tuple(GameMode)
     MIN_NUMBER_OF_PLAYERS = 2
     MAX_NUMBER_OF_PLAYERS = 4
+    # the SGF points are written as two lowercase letters, which cannot go past 26x26
+    MIN_BOARD_SIZE = 2
+    MAX_BOARD_SIZE = 26
+
+    KO_RULE = KoRule.SIMPLE
+    # the array backend is the fastest at checking and playing moves, which is what games and playouts do; the bitboard
+    # backend is only faster at loading whole positions, and is kept to cross-check the rules (see Benchmark)
+    ENGINE_BACKEND = EngineBackend.ARRAY
 
     TIMER_START = 10
     TIMER_SPEED = 1000
 
+    COMPUTER_PLAYOUTS = 5000
+    COMPUTER_TIME_LIMIT = 3
+    COMPUTER_EXPLORATION = 1.4
+
+    # number of processes running playouts for the computer players and the benchmarks, None for every core
+    PLAYOUT_PROCESSES = None
+
+    # per phase timers and counters of the moves played, see Instrumentation
+    INSTRUMENTATION = False
+    INSTRUMENTATION_DUMP_EVERY = 0  # moves between two dumps of the figures, 0 to never dump
+    INSTRUMENTATION_DUMP_FILE = None  # file the dumps are appended to, None for the standard error
+
+    # the directory of the game's modules, which the relative paths of the files and resources are resolved from,
+    # whatever the working directory is
+    BASE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+    # SQLite archive every saved or imported game is added to, see GameArchive; relative to the game's directory
+    GAME_ARCHIVE = True
+    GAME_ARCHIVE_PATH = "games.sqlite3"
+
+    # append-only journal of the game being played, replayed at startup if the game was interrupted, see Journal
+    JOURNAL = True
+    JOURNAL_PATH = "journal.pygj"
+    JOURNAL_SYNC_INTERVAL = 0.2  # seconds the journal waits for more moves before writing and syncing them at once
+
     BOARD_SIZES = ["16", "13", "9", "7"]
-    board_background = "./icons/board_background.jpg"
-    WELCOME_BACKGROUND = "./icons/welcome_background.png"
+    GAME_WINDOW_POOL_SIZE = 4  # idle game windows kept to start the next games without building them
+    GAME_WINDOW_WARM_UP_DELAY = 200  # milliseconds the welcome screen is left idle before building a game window
+    CURRENT_PLAYER_MARKER_COLOR = "#0000FF"  # colour of the frame painted around the current player's box
+    GHOST_STONE_OPACITY = 0.5  # opacity of the current player's stone drawn over the hovered intersection
+    # resource paths are relative to the game's directory, see Resources
+    board_background = "icons/board_background.jpg"
+    WELCOME_BACKGROUND = "icons/welcome_background.png"
+    GAME_BACKGROUND = "icons/go_background1.jpg"
+    SCORE_BOARD_BACKGROUND = "icons/sb_background.png"
+    WINDOW_ICON = "icons/pokeball.png"
 
     PIECE_COLORS = [
         "#0000",
@@ -28,7 +81,7 @@ class Settings:
     ]
 
     PIECE_ICONS_PATHS = [
-        "./icons/empty.png",
+        "icons/empty.png",
         "icons/player_1_piece.png",
         "icons/player_2_piece.png",
         "icons/player_3_piece.png",
@@ -37,14 +90,6 @@ class Settings:
 
     # stylesheets ==================================
 
-    CURRENT_PLAYER_STYLESHEET = """
-        PlayerBox{
-            border: 2px solid #0000FF;
-            border-radius: 5px;
-            box-shadow: 0 0 10px #0000FF;
-        }
-        """
-
     SCORE_BOARD_STYLESHEET = """
         QGroupBox{
             background-color: rgba(0, 0, 0, 0.7);
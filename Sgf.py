@@ -0,0 +1,437 @@
+import re
+from typing import Iterator, NamedTuple, Optional, TextIO
+
+from GoEngine import GoEngine, Move, EMPTY
+from Settings import Settings, EngineBackend, GameMode
+
+# the move and setup properties of every colour, indexed by colour; SGF only knows black and white, so the third and
+# fourth players use the custom R (red) and U (blue) properties, and their names the custom PR and PU properties
+MOVE_PROPERTIES = ("", "B", "W", "R", "U")
+SETUP_PROPERTIES = ("AE", "AB", "AW", "AR", "AU")
+NAME_PROPERTIES = ("", "PB", "PW", "PR", "PU")
+
+# custom property holding the number of players, for games of more than two players
+PLAYERS_PROPERTY = "NP"
+
+CHUNK_SIZE = 1 << 16
+
+EXTENSION = ".sgf"
+
+_TOKEN = re.compile(r"\s*(?:([();])|([A-Za-z]+)|\[((?:[^\]\\]|\\.)*)\])", re.DOTALL)
+
+
+class SgfError(Exception):
+    """Raised when an SGF file is malformed or holds a game that cannot be replayed."""
+
+
+class SgfGame(NamedTuple):
+    """
+    A game read from an SGF file, keeping only its main line.
+
+    nodes: The properties of every node of the main line, each a dictionary mapping a property name to its list of
+        values. The first node is the root node, holding the game information.
+    """
+
+    nodes: list[dict[str, list[str]]]
+
+    @property
+    def root(self) -> dict[str, list[str]]:
+        return self.nodes[0] if self.nodes else {}
+
+    def get_property(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the first value of a property of the root node.
+
+        :param name: The name of the property.
+        :param default: The value returned if the root node does not have the property.
+        :return: The value of the property.
+        """
+
+        values = self.root.get(name)
+        return values[0] if values else default
+
+    @property
+    def board_size(self) -> int:
+        # rectangular boards are given as columns:rows, which this game does not support, so the columns are used
+        return parse_number(self.get_property("SZ", "19").split(":")[0], "SZ")
+
+    @property
+    def num_players(self) -> int:
+        num_players = self.get_property(PLAYERS_PROPERTY)
+
+        if num_players is not None:
+            return parse_number(num_players, PLAYERS_PROPERTY)
+
+        used_colours = [colour for colour in range(1, len(MOVE_PROPERTIES))
+                        if any(MOVE_PROPERTIES[colour] in node or SETUP_PROPERTIES[colour] in node
+                               or NAME_PROPERTIES[colour] in node for node in self.nodes)]
+
+        return max(used_colours + [2])
+
+    @property
+    def players_names(self) -> list[str]:
+        return [self.get_property(NAME_PROPERTIES[colour], f"Player {colour}")
+                for colour in range(1, self.num_players + 1)]
+
+    def iter_moves(self) -> Iterator[tuple[int, Optional[tuple[int, int]]]]:
+        """
+        Iterates over the moves of the main line, in order.
+
+        :return: A generator of (colour, coordinates) tuples, the coordinates being a (row, column) tuple, or None for a
+        pass.
+        """
+
+        board_size = self.board_size
+
+        for node in self.nodes:
+            for colour in range(1, len(MOVE_PROPERTIES)):
+                for value in node.get(MOVE_PROPERTIES[colour], ()):
+                    yield colour, decode_point(value, board_size)
+
+    def get_setup(self) -> list[list[int]]:
+        """
+        Builds the board set up by the root node before the first move.
+
+        :return: A 2D list with the player number (0 for empty) of every intersection.
+        """
+
+        board_size = self.board_size
+        board_array = [[EMPTY] * board_size for _ in range(board_size)]
+
+        for colour, name in enumerate(SETUP_PROPERTIES):
+            for value in self.root.get(name, ()):
+                for row, column in decode_points(value, board_size):
+                    board_array[row][column] = colour
+
+        return board_array
+
+
+# COORDINATES ============================================
+
+def encode_point(row: int, column: int) -> str:
+    return chr(ord("a") + column) + chr(ord("a") + row)
+
+
+def parse_number(value: str, name: str) -> int:
+    """
+    Parses the value of a number property.
+
+    :param value: The value of the property.
+    :param name: The name of the property, for the error message.
+    :return: The number.
+    """
+
+    try:
+        return int(value)
+    except ValueError:
+        raise SgfError(f"Invalid number {name}[{value}]") from None
+
+
+def decode_point(value: str, board_size: int) -> Optional[tuple[int, int]]:
+    """
+    Decodes the coordinates of a move.
+
+    :param value: The value of the move property.
+    :param board_size: The number of rows/columns in the board.
+    :return: The (row, column) tuple of the move, or None for a pass (an empty value, or "tt" on boards up to 19x19).
+    """
+
+    if value == "" or (value == "tt" and board_size <= 19):
+        return None
+
+    if len(value) != 2:
+        raise SgfError(f"Invalid point [{value}]")
+
+    column = ord(value[0]) - ord("a")
+    row = ord(value[1]) - ord("a")
+
+    if not (0 <= row < board_size and 0 <= column < board_size):
+        raise SgfError(f"Point [{value}] is off the board")
+
+    return row, column
+
+
+def decode_points(value: str, board_size: int) -> list[tuple[int, int]]:
+    """
+    Decodes a point or a compressed rectangle of points ("aa:cc") of a setup property.
+
+    :param value: The value of the setup property.
+    :param board_size: The number of rows/columns in the board.
+    :return: The list of (row, column) tuples.
+    """
+
+    if ":" not in value:
+        return [decode_point(value, board_size)]
+
+    first, last = (decode_point(corner, board_size) for corner in value.split(":", 1))
+
+    # a pass has no place in a rectangle, and its corners are the top left and the bottom right ones
+    if first is None or last is None:
+        raise SgfError(f"Invalid rectangle [{value}]")
+
+    if first[0] > last[0] or first[1] > last[1]:
+        raise SgfError(f"Rectangle [{value}] has its corners swapped")
+
+    return [(row, column) for row in range(first[0], last[0] + 1) for column in range(first[1], last[1] + 1)]
+
+
+def escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("]", "\\]")
+
+
+def unescape(text: str) -> str:
+    # an escaped line break is a soft line break, which is removed, and any other escaped character stands for itself
+    return re.sub(r"\\(\r\n|\n\r|\n|\r|.)", lambda match: "" if match.group(1) in ("\r\n", "\n\r", "\n", "\r")
+                  else match.group(1), text, flags=re.DOTALL)
+
+
+# READING ================================================
+
+def iter_games(file: TextIO) -> Iterator[SgfGame]:
+    """
+    Parses the games of an SGF collection one at a time, reading the file in chunks, so that collections far larger
+    than the memory can be read. Only the main line (the first variation at every branch) of every game is kept.
+
+    :param file: The SGF file, opened for reading text.
+    :return: A generator of SgfGames.
+    """
+
+    buffer = ""
+    is_end_of_file = False
+
+    # for every open game tree: [is on the main line, number of child game trees seen]
+    trees: list[list] = []
+    nodes: list[dict[str, list[str]]] = []
+    node = None
+    property_name = None
+
+    while True:
+        chunk = "" if is_end_of_file else file.read(CHUNK_SIZE)
+        is_end_of_file = chunk == ""
+        buffer += chunk
+        position = 0
+
+        while True:
+            match = _TOKEN.match(buffer, position)
+
+            if match is None:
+                tail = buffer[position:].lstrip()
+
+                # a value or a blank cut by the end of the chunk is parsed once the next chunk is read
+                if not tail or tail[0] == "[":
+                    break
+
+                if trees:
+                    raise SgfError(f"Unexpected character {tail[0]!r} in a game tree")
+
+                # the text between game trees is skipped, as most SGF readers do
+                next_tree = buffer.find("(", position)
+                position = len(buffer) if next_tree == -1 else next_tree
+                continue
+
+            # a property name cut by the end of the chunk is parsed once the next chunk is read
+            if match.end() == len(buffer) and not is_end_of_file and match.group(2) is not None:
+                break
+
+            position = match.end()
+            symbol, name, value = match.groups()
+
+            if symbol == "(":
+                if trees:
+                    parent = trees[-1]
+                    trees.append([parent[0] and parent[1] == 0, 0])
+                    parent[1] += 1
+                else:
+                    trees.append([True, 0])
+                    nodes = []
+
+            elif symbol == ")":
+                if not trees:
+                    raise SgfError("Unbalanced parenthesis")
+
+                trees.pop()
+
+                if not trees:
+                    if nodes:
+                        yield SgfGame(nodes)
+                    nodes = []
+                    node = None
+
+            elif symbol == ";":
+                if not trees:
+                    raise SgfError("Node outside of a game tree")
+
+                # the nodes of the variations that are not on the main line are parsed but not kept
+                node = {}
+                if trees[-1][0]:
+                    nodes.append(node)
+
+            elif name is not None:
+                property_name = name
+
+            else:
+                if node is None or property_name is None:
+                    raise SgfError("Property value outside of a node")
+
+                node.setdefault(property_name, []).append(unescape(value))
+
+        buffer = buffer[position:]
+
+        if is_end_of_file:
+            if buffer.strip() or trees:
+                raise SgfError("The SGF file ends unexpectedly")
+            return
+
+
+def read_games(path: str) -> Iterator[SgfGame]:
+    """
+    Parses the games of an SGF file one at a time.
+
+    :param path: The path of the SGF file.
+    :return: A generator of SgfGames.
+    """
+
+    with open(path, encoding="utf-8-sig", errors="replace") as file:
+        yield from iter_games(file)
+
+
+def replay(game: SgfGame, backend: EngineBackend = None) -> tuple[GoEngine, list[Move], int, int]:
+    """
+    Replays the main line of a game through the rules engine.
+
+    :param game: The SgfGame to replay.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :return: A tuple with the engine holding the final position, the Moves played (passes are not included), the
+    colour of the player to move next and the number of passes in a row at the end of the game.
+    """
+
+    engine = GoEngine.create(game.board_size, game.num_players, backend=backend)
+    engine.load_state(game.get_setup())
+
+    moves = []
+    colour = 1
+    passes = 0
+
+    for colour_played, coordinates in game.iter_moves():
+        if colour_played > game.num_players:
+            raise SgfError(f"Move of player {colour_played} in a game of {game.num_players} players")
+
+        colour = engine.next_colour(colour_played)
+
+        if coordinates is None:
+            passes += 1
+            continue
+
+        point = engine.point(*coordinates)
+
+        if not engine.is_move_valid(point, colour_played):
+            raise SgfError(f"Illegal move [{encode_point(*coordinates)}] of player {colour_played}")
+
+        moves.append(engine.play(point, colour_played))
+        passes = 0
+
+    return engine, moves, colour, passes
+
+
+def to_dictionary(game: SgfGame, initial_scores: list[float], backend: EngineBackend = None) -> dict:
+    """
+    Replays a game and converts it to a game dictionary, in the format of Go.to_dictionary, so that it can be loaded
+    like a saved game.
+
+    :param game: The SgfGame to convert.
+    :param initial_scores: The scores of the players before the game, the captured stones being added to them.
+    :param backend: The EngineBackend to use, Settings.ENGINE_BACKEND if not given.
+    :return: The game dictionary.
+    """
+
+    if not Settings.MIN_NUMBER_OF_PLAYERS <= game.num_players <= Settings.MAX_NUMBER_OF_PLAYERS:
+        raise SgfError(f"Games of {game.num_players} players are not supported")
+
+    if not Settings.MIN_BOARD_SIZE <= game.board_size <= Settings.MAX_BOARD_SIZE:
+        raise SgfError(f"Boards of {game.board_size}x{game.board_size} are not supported")
+
+    engine, moves, colour, passes = replay(game, backend)
+
+    players_scores = list(initial_scores)
+    for move in moves:
+        players_scores[move.colour - 1] += len(move.captured)
+
+    return {
+        "game_mode": GameMode.NORMAL,
+        "game_over": False,
+        "players_names": game.players_names,
+        "players_scores": players_scores,
+        "current_player": colour - 1,
+        "pass_turn_counter": passes,
+        "board_size": game.board_size,
+        "board_array": engine.get_state(),
+        "computer_players": [],
+        "moves": moves,
+    }
+
+
+# WRITING ================================================
+
+def write_game(file: TextIO, board_size: int, players_names: list[str], moves: list[Move],
+               setup: Optional[list[list[int]]] = None, komi: Optional[float] = None, passes: int = 0):
+    """
+    Writes a game as an SGF game tree. Several games written to the same file form a collection.
+
+    The passes are not kept with the Moves, so they are written back from the turn order: a player skipped between two
+    moves passed, as did the players after the last move, given by passes. The turn order starts with the first player
+    from an empty board, and with the player of the first move from a setup (such as a handicap game, where the second
+    player plays first).
+
+    :param file: The file, opened for writing text.
+    :param board_size: The number of rows/columns in the board.
+    :param players_names: The names of the players.
+    :param moves: The Moves played, in order.
+    :param setup: The board the moves were played from, if it is not empty.
+    :param komi: The komi of the second player, for two player games.
+    :param passes: The number of passes in a row after the last move.
+    """
+
+    num_players = len(players_names)
+
+    root = [f"GM[1]FF[4]CA[UTF-8]AP[PyQt_Go]SZ[{board_size}]"]
+
+    if num_players != 2:
+        root.append(f"{PLAYERS_PROPERTY}[{num_players}]")
+    elif komi is not None:
+        root.append(f"KM[{komi:g}]")
+
+    for colour, name in enumerate(players_names, 1):
+        root.append(f"{NAME_PROPERTIES[colour]}[{escape(name)}]")
+
+    if setup is not None:
+        for colour in range(1, num_players + 1):
+            points = [encode_point(row, column) for row, board_row in enumerate(setup)
+                      for column, value in enumerate(board_row) if value == colour]
+            if points:
+                root.append(SETUP_PROPERTIES[colour] + "".join(f"[{point}]" for point in points))
+
+    file.write("(;" + "".join(root) + "\n")
+
+    nodes = []
+    colour = moves[0].colour if moves and setup is not None else 1
+
+    for move in moves:
+        while colour != move.colour:
+            nodes.append(f"{MOVE_PROPERTIES[colour]}[]")
+            colour = colour % num_players + 1
+
+        row, column = divmod(move.point, board_size)
+        nodes.append(f"{MOVE_PROPERTIES[colour]}[{encode_point(row, column)}]")
+        colour = colour % num_players + 1
+
+    for _ in range(passes):
+        nodes.append(f"{MOVE_PROPERTIES[colour]}[]")
+        colour = colour % num_players + 1
+
+    for number, node in enumerate(nodes, 1):
+        file.write(f";{node}")
+
+        if number % 10 == 0:
+            file.write("\n")
+
+    file.write(")\n")
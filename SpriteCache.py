@@ -0,0 +1,85 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPainter, QColor
+
+from Resources import Resources
+from Settings import Settings
+
+
+class SpriteCache:
+    """
+    A cache of the pre-rendered stone of every player, shared by every widget that draws stones.
+
+    Every player's image is loaded once from Settings.PIECE_ICONS_PATHS through Resources, and the stones (the player's
+    colour disc with the image over it) are rendered once per size, so that drawing a stone is a plain copy of the same
+    pixmap. Only the last MAX_SIZES sizes are kept, as the board asks for a new size every time it is resized.
+    """
+
+    MAX_SIZES = 4
+
+    _sprites: dict[int, list[QPixmap]] = {}
+
+    @classmethod
+    def get_image(cls, player: int) -> QPixmap:
+        """
+        Returns the original image of the given player's stones, loading it on first use.
+
+        :param player: The player number, 0 being the empty intersection.
+        :return: The QPixmap of the image.
+        """
+
+        return Resources.get_pixmap(Settings.PIECE_ICONS_PATHS[player])
+
+    @classmethod
+    def get_sprite(cls, player: int, size: int) -> QPixmap:
+        """
+        Returns the stone of the given player rendered at the given size, rendering the stones of every player at that
+        size on first use.
+
+        :param player: The player number, 0 being the empty intersection.
+        :param size: The side of the square the stone is rendered in, in pixels.
+        :return: The QPixmap of the stone.
+        """
+
+        sprites = cls._sprites.get(size)
+
+        if sprites is None:
+            if len(cls._sprites) >= cls.MAX_SIZES:
+                # the sizes are kept in the order they were first asked for, the oldest is dropped
+                del cls._sprites[next(iter(cls._sprites))]
+
+            sprites = cls._sprites[size] = [cls._render(player_number, size)
+                                            for player_number in range(len(Settings.PIECE_ICONS_PATHS))]
+
+        return sprites[player]
+
+    @classmethod
+    def clear(cls):
+        """Drops every cached stone, so that they are rendered again from Settings.PIECE_ICONS_PATHS."""
+
+        cls._sprites.clear()
+
+    @classmethod
+    def _render(cls, player: int, size: int) -> QPixmap:
+        """
+        Renders the stone of the given player at the given size.
+
+        :param player: The player number, 0 being the empty intersection.
+        :param size: The side of the square the stone is rendered in, in pixels.
+        :return: The new QPixmap of the stone, transparent around it.
+        """
+
+        sprite = QPixmap(max(size, 1), max(size, 1))
+        sprite.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(Settings.PIECE_COLORS[player]))
+        painter.drawEllipse(sprite.rect())
+        painter.drawPixmap(sprite.rect(), cls.get_image(player))
+
+        painter.end()
+
+        return sprite
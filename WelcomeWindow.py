@@ -1,10 +1,11 @@
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QIcon
+from PyQt6.QtGui import QFont, QPainter
 from PyQt6.QtWidgets import QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QLineEdit, QMainWindow, \
-    QRadioButton, QComboBox, QSpinBox, QButtonGroup
+    QRadioButton, QComboBox, QSpinBox, QButtonGroup, QCheckBox
 
 from Settings import Settings
 from MenuBar import MenuBar
+from Resources import Resources
 
 
 class WelcomeScreen(QMainWindow):
@@ -19,7 +20,7 @@ class WelcomeScreen(QMainWindow):
 
         super().__init__()
 
-        self.setWindowIcon(QIcon("./icons/pokeball.png"))
+        self.setWindowIcon(Resources.get_icon(Settings.WINDOW_ICON))
         main_widget = QFrame()
         # default number of players
         self.player_count = 2
@@ -28,15 +29,8 @@ class WelcomeScreen(QMainWindow):
         # Set window title
         self.setWindowTitle("Pokemon Go")
 
-        # Set background color of WelcomeScreen
+        # the background of the WelcomeScreen is painted by paintEvent
         self.setObjectName("WelcomeScreen")
-        self.setStyleSheet(f"""
-                            WelcomeScreen#WelcomeScreen{{
-                                background-image: url({Settings.WELCOME_BACKGROUND});
-                                background-size: cover;
-                                background-position: bottom right;
-                            }}
-                            """)
 
         main_widget.setStyleSheet("""background-color: rgba(0, 0, 0, 0.4);""")
 
@@ -44,6 +38,7 @@ class WelcomeScreen(QMainWindow):
         self.player_spinbox = QSpinBox()                # number of players comboBox
         self.name_input_box = QVBoxLayout()             # player name box
         self.name_input_fields = []                     # storage for QLineEdits
+        self.computer_checkboxes = []                   # storage for the computer player QCheckBoxes
         self.board_size_cbox = QComboBox()              # board size comboBox
 
         # Game mode selection button group
@@ -112,9 +107,13 @@ class WelcomeScreen(QMainWindow):
             name_input = QLineEdit()
             self.name_input_fields.append(name_input)
             name_input.setPlaceholderText("Player " + str(i + 1))
-            # add label and input area in a line
+            # computer player checkbox
+            computer_checkbox = QCheckBox("Computer")
+            self.computer_checkboxes.append(computer_checkbox)
+            # add label, input area and checkbox in a line
             name_input_line.addWidget(name_label)
             name_input_line.addWidget(name_input)
+            name_input_line.addWidget(computer_checkbox)
             # add line to name input box
             self.name_input_box.addLayout(name_input_line)
 
@@ -217,6 +216,10 @@ class WelcomeScreen(QMainWindow):
             player_layout.addWidget(player_input)
             # add input area to list
             self.name_input_fields.append(player_input)
+            # computer player checkbox
+            computer_checkbox = QCheckBox("Computer")
+            player_layout.addWidget(computer_checkbox)
+            self.computer_checkboxes.append(computer_checkbox)
             # add line layout to VBox
             self.name_input_box.addLayout(player_layout)
 
@@ -235,8 +238,9 @@ class WelcomeScreen(QMainWindow):
             # delete the item
             item.deleteLater()
 
-        # clear list
+        # clear lists
         self.name_input_fields.clear()
+        self.computer_checkboxes.clear()
 
     def change_number_of_players(self):
         """
@@ -246,3 +250,11 @@ class WelcomeScreen(QMainWindow):
         self.player_count = int(self.player_spinbox.value())
         self.add_name_input_lines()
 
+    # EVENTS =====================================
+
+    def paintEvent(self, event):
+        """Paints the window background, scaled to cover the window."""
+
+        painter = QPainter(self)
+        painter.drawPixmap(event.rect(), Resources.get_cover(Settings.WELCOME_BACKGROUND, self.width(), self.height()),
+                           event.rect())
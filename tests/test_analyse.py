@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+import Analyse
+
+
+class AnalyseFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_sgf(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+        return path
+
+    def test_valid_game(self):
+        rows = Analyse.analyse_file(self.write_sgf("valid.sgf", "(;SZ[9];B[cc];W[gg])"))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["error"], "")
+        self.assertEqual(rows[0]["moves"], 2)
+
+    def test_malformed_setup_rectangle(self):
+        rows = Analyse.analyse_file(self.write_sgf("malformed.sgf", "(;SZ[9]AB[aa:];B[cc])"))
+
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
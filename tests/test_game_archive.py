@@ -0,0 +1,29 @@
+import os
+import tempfile
+import unittest
+
+from GameArchive import GameArchive
+
+
+class AddFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.archive = GameArchive(os.path.join(self.directory.name, "games.sqlite3"))
+
+    def tearDown(self):
+        self.archive.close()
+        self.directory.cleanup()
+
+    def test_collection_with_malformed_game(self):
+        path = os.path.join(self.directory.name, "collection.sgf")
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("(;SZ[9];B[cc];W[gg])\n(;SZ[9]AB[aa:];B[cc])\n(;SZ[9];B[ee])\n")
+
+        self.assertEqual(self.archive.add_file(path), (2, 1))
+        self.assertEqual(self.archive.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import unittest
+
+import SaveFormat
+from GoEngine import GoEngine, Move
+from Settings import GameMode
+
+
+class ReadGameTest(unittest.TestCase):
+
+    def setUp(self):
+        engine = GoEngine.create(9, 2)
+        moves = [engine.play(10, 1), engine.play(11, 2)]
+
+        self.game = {
+            "game_mode": GameMode.NORMAL,
+            "game_over": False,
+            "players_names": ["Black", "White"],
+            "players_scores": [0.0, 7.5],
+            "current_player": 0,
+            "pass_turn_counter": 0,
+            "board_size": 9,
+            "board_array": engine.get_state(),
+            "computer_players": [],
+            "moves": moves,
+        }
+
+    @staticmethod
+    def round_trip(game: dict) -> dict:
+        file = io.BytesIO()
+        SaveFormat.write_game(file, game)
+        file.seek(0)
+
+        return SaveFormat.read_game(file)
+
+    def test_round_trip(self):
+        self.assertEqual(self.round_trip(self.game), self.game)
+
+    def test_finished_game(self):
+        game = dict(self.game, game_over=True, pass_turn_counter=2)
+
+        self.assertEqual(self.round_trip(game), game)
+
+    def test_out_of_range_fields(self):
+        board_array = [board_row[:] for board_row in self.game["board_array"]]
+        board_array[0][0] = 5
+
+        cases = {
+            "num_players": dict(players_names=["Player"] * 5, players_scores=[0.0] * 5),
+            "board_size": dict(board_size=30, board_array=[[0] * 30 for _ in range(30)], moves=[]),
+            "current_player": dict(current_player=3),
+            "pass_turn_counter": dict(pass_turn_counter=2),
+            "board value": dict(board_array=board_array),
+            "move point": dict(moves=[Move(81, 1, ())]),
+            "move colour": dict(moves=[Move(9, 3, ())]),
+            "captured point": dict(moves=[Move(9, 1, ((90, 2),))]),
+            "captured colour": dict(moves=[Move(9, 1, ((3, 4),))]),
+        }
+
+        for field, changes in cases.items():
+            with self.subTest(field), self.assertRaises(SaveFormat.SaveFormatError):
+                self.round_trip(dict(self.game, **changes))
+
+
+if __name__ == '__main__':
+    unittest.main()
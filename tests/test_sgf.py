@@ -0,0 +1,115 @@
+import io
+import os
+import tempfile
+import unittest
+
+import Sgf
+from GoEngine import GoEngine
+
+
+class DecodePointsTest(unittest.TestCase):
+
+    def test_rectangle(self):
+        self.assertEqual(Sgf.decode_points("aa:bb", 9), [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+    def test_rectangle_with_empty_corner(self):
+        with self.assertRaises(Sgf.SgfError):
+            Sgf.decode_points("aa:", 9)
+
+    def test_rectangle_with_pass_corner(self):
+        with self.assertRaises(Sgf.SgfError):
+            Sgf.decode_points("aa:tt", 9)
+
+    def test_rectangle_with_swapped_corners(self):
+        with self.assertRaises(Sgf.SgfError):
+            Sgf.decode_points("cc:aa", 9)
+
+
+class ReadGamesTest(unittest.TestCase):
+
+    def test_byte_order_mark(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sgf")
+
+            with open(path, "w", encoding="utf-8-sig") as file:
+                file.write("(;SZ[9];B[cc];W[gg])")
+
+            games = list(Sgf.read_games(path))
+
+        self.assertEqual(len(games), 1)
+        self.assertEqual(list(games[0].iter_moves()), [(1, (2, 2)), (2, (6, 6))])
+
+
+class CountingReader(io.StringIO):
+    """A text file counting the chunks read from it."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size: int = -1) -> str:
+        self.reads += 1
+        return super().read(size)
+
+
+class IterGamesTest(unittest.TestCase):
+
+    def test_text_between_game_trees(self):
+        games = list(Sgf.iter_games(io.StringIO("% collection 2024\n(;SZ[9];B[cc])\n100%\n(;SZ[9];W[gg])\n")))
+
+        self.assertEqual([list(game.iter_moves()) for game in games], [[(1, (2, 2))], [(2, (6, 6))]])
+
+    def test_unexpected_character_in_game_tree(self):
+        file = CountingReader("(;SZ[9]%" + " " * (Sgf.CHUNK_SIZE * 4) + ")")
+
+        with self.assertRaises(Sgf.SgfError):
+            list(Sgf.iter_games(file))
+
+        # the error is raised from the first chunk, without reading the rest of the file
+        self.assertEqual(file.reads, 1)
+
+    def test_value_cut_by_chunk(self):
+        name = "x" * Sgf.CHUNK_SIZE
+        games = list(Sgf.iter_games(io.StringIO(f"(;SZ[9]PB[{name}];B[cc])")))
+
+        self.assertEqual(games[0].players_names[0], name)
+
+
+class WriteGameTest(unittest.TestCase):
+
+    def round_trip(self, moves, passes: int = 0, setup=None) -> dict:
+        file = io.StringIO()
+        Sgf.write_game(file, 9, ["Black", "White"], moves, setup, 7.5, passes)
+        file.seek(0)
+
+        (game,) = Sgf.iter_games(file)
+
+        return Sgf.to_dictionary(game, GoEngine.get_initial_scores(2))
+
+    def test_passes(self):
+        engine = GoEngine.create(9, 2)
+        # black plays twice, white having passed in between, and white passes again at the end
+        moves = [engine.play(20, 1), engine.play(60, 1), engine.play(40, 2), engine.play(30, 1)]
+
+        game = self.round_trip(moves, passes=1)
+
+        self.assertEqual(game["moves"], moves)
+        self.assertEqual(game["board_array"], engine.get_state())
+        self.assertEqual(game["current_player"], 0)
+        self.assertEqual(game["pass_turn_counter"], 1)
+
+    def test_setup_with_second_player_first(self):
+        engine = GoEngine.create(9, 2)
+        engine.play(20, 1)
+        setup = engine.get_state()
+        moves = [engine.play(40, 2), engine.play(60, 1)]
+
+        game = self.round_trip(moves, setup=setup)
+
+        self.assertEqual(game["moves"], moves)
+        self.assertEqual(game["current_player"], 1)
+        self.assertEqual(game["pass_turn_counter"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()